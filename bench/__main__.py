@@ -0,0 +1,203 @@
+"""Benchmarks of the cooling load engine against a stored baseline.
+
+	python -m bench                     # run, compare with bench/baseline.json (written on the first run)
+	python -m bench --update            # run and make this the new baseline
+	python -m bench --baseline mine.json
+	python -m bench --threshold 0.2 -k calculate
+
+The cases start from the project shown when the application starts (`ZoneSpec.default`, Bangkok,
+20 x 10 x 3.8 m, Wall_D = IW.1, WO.6mm on wall A). Baselines are per machine and not committed,
+timings of another machine say nothing about this one: the first run writes `bench/baseline.json`, later
+runs compare against it. A regression is a metric worse than the baseline by more than the threshold, the
+exit status is then 1. The change is shown as + when better than the baseline, metrics missing from the
+baseline are added to it."""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import tracemalloc
+from statistics import median
+from time import perf_counter
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+THRESHOLD = 0.10		# fraction of the baseline
+MIN_SAMPLE = 0.05		# s, a timing sample repeats the call until it lasts this long
+
+def _default():
+	from lib._ZoneSpec import ZoneSpec
+	return ZoneSpec.default()
+
+def _glazed():
+	"""Every wall external with a WO.6mm window of 3 x 1.5 m"""
+	spec = _default()
+	a = spec.architec
+	for side in 'ABCD':
+		setattr(a, f'Wall_{side}', 0)
+		setattr(a, f'Win_{side}', 1)
+		setattr(a, f'Win{side}Width', 3.0)
+		setattr(a, f'Win{side}High', 1.5)
+		window = a.window(side)
+		setattr(a, f'UWin_{side}', window.U)
+		setattr(a, f'SCWin_{side}', window.SC)
+	return spec
+
+def _highest_floor():
+	"""The glazed zone on the highest floor, roof and floor both conduct"""
+	spec = _glazed()
+	spec.climatic.SpaceType = 1
+	return spec
+
+CASES = dict([('default', _default), ('glazed', _glazed), ('highest-floor', _highest_floor)])
+
+def _quiet():
+	# ComfortZone.Calculate reports on stdout
+	return contextlib.redirect_stdout(open(os.devnull, 'w'))
+
+def _time(fn, repeat: int) -> float:
+	"""Median seconds per call of `repeat` samples"""
+	fn()
+	number, t = 1, 0.0
+	while True:
+		start = perf_counter()
+		for _ in range(number): fn()
+		t = perf_counter() - start
+		if t >= MIN_SAMPLE: break
+		number *= 2
+	samples = [t / number]
+	for _ in range(repeat - 1):
+		start = perf_counter()
+		for _ in range(number): fn()
+		samples.append((perf_counter() - start) / number)
+	return median(samples)
+
+def _peak(fn) -> int:
+	"""Peak bytes allocated by Python and NumPy while `fn` runs"""
+	tracemalloc.start()
+	try:
+		fn()
+		return tracemalloc.get_traced_memory()[1]
+	finally:
+		tracemalloc.stop()
+
+def bench_calculate(case: str, repeat: int) -> dict:
+	spec = CASES[case]()
+	zone = spec.new_zone()
+	fast = spec.new_zone(fast=True)
+	with _quiet():
+		return {f'calculate/{case}': (_time(zone.Calculate, repeat), 's', 'lower'),
+				f'calculate-fast/{case}': (_time(fast.Calculate, repeat), 's', 'lower'),
+				f'memory/{case}': (_peak(lambda: spec.new_zone().Calculate()), 'B', 'lower')}
+
+def bench_project(case: str, repeat: int) -> dict:
+	from lib._ZoneSpec import ZoneSpec
+	spec = CASES[case]()
+	with tempfile.TemporaryDirectory() as tmp:
+		filename = os.path.join(tmp, f'{case}.rtsm')
+		spec.save(filename)
+		return {f'save/{case}': (_time(lambda: spec.save(filename), repeat), 's', 'lower'),
+				f'load/{case}': (_time(lambda: ZoneSpec.load(filename), repeat), 's', 'lower')}
+
+def bench_batch(zones: int, repeat: int) -> dict:
+	"""Throughput of `calculate_files` over `zones` projects cycling through the cases: the pyMEP default
+	every command uses, on a tenth of the projects since it is far slower, and the opt-in stacked kernel"""
+	from lib._batch import calculate_files
+	with tempfile.TemporaryDirectory() as tmp:
+		specs = [make() for make in CASES.values()]
+		files = []
+		for i in range(zones):
+			files.append(os.path.join(tmp, f'zone{i}.rtsm'))
+			specs[i % len(specs)].save(files[-1])
+		reference = files[:max(1, zones // 10)]
+		with _quiet():
+			pymep = _time(lambda: calculate_files(reference), repeat)
+		seconds = _time(lambda: calculate_files(files, fast=True), repeat)
+		return {f'batch-pymep/{len(reference)}': (len(reference) / pymep, 'zones/s', 'higher'),
+				f'batch/{zones}': (zones / seconds, 'zones/s', 'higher'),
+				f'batch-memory/{zones}': (_peak(lambda: calculate_files(files, fast=True)) / zones, 'B/zone', 'lower')}
+
+def run(pattern: str = '', repeat: int = 5, zones: int = 1000) -> dict:
+	"""{metric: (value, unit, better)} of the benchmarks whose metric names contain `pattern`, a failing
+	benchmark is reported and left out"""
+	jobs = [(f'calculate/{c}', bench_calculate, c) for c in CASES] + [(f'project/{c}', bench_project, c) for c in CASES] + \
+		   [(f'batch/{zones}', bench_batch, zones)]
+	metrics = {}
+	for name, bench, arg in jobs:
+		if pattern and pattern not in name: continue
+		try:
+			metrics.update(bench(arg, repeat))
+		except Exception as e:
+			print(f'{name}: {type(e).__name__}: {e}', file=sys.stderr)
+	return metrics
+
+def machine() -> dict:
+	import numpy
+	return dict([('platform', platform.platform()), ('processor', platform.processor() or platform.machine()),
+				 ('python', platform.python_version()), ('numpy', numpy.__version__)])
+
+def load_baseline(filename: str = BASELINE_FILE) -> dict:
+	if not os.path.exists(filename): return None
+	with open(filename, encoding='utf-8') as f:
+		return json.load(f)
+
+def save_baseline(metrics: dict, filename: str = BASELINE_FILE) -> None:
+	with open(filename, 'w', encoding='utf-8') as f:
+		json.dump(dict([('machine', machine()), ('metrics', dict([(k, list(v)) for k, v in metrics.items()]))]), f, indent=2)
+
+def compare(metrics: dict, baseline: dict, threshold: float = THRESHOLD) -> list:
+	"""(metric, value, baseline value, change, regressed) of the metrics in both, change is the
+	fraction by which the metric got worse (negative when better)"""
+	rows = []
+	for name, (value, unit, better) in metrics.items():
+		if name not in baseline['metrics']: continue
+		base = baseline['metrics'][name][0]
+		change = (value - base) / base if better == 'lower' else (base - value) / base
+		rows.append((name, value, base, change, change > threshold))
+	return rows
+
+def _format(value: float, unit: str) -> str:
+	match unit:
+		case 's':
+			return f'{value*1000:10.3f} ms'
+		case 'B' | 'B/zone':
+			return f'{value/1024:10.1f} KiB' + ('/zone' if unit == 'B/zone' else '')
+	return f'{value:10.1f} {unit}'
+
+def main(argv: list = None) -> int:
+	p = argparse.ArgumentParser(prog='python -m bench', description='Benchmarks of the RTSM cooling load engine')
+	p.add_argument('-k', dest='pattern', default='', help='only the benchmarks whose name contains this')
+	p.add_argument('--repeat', type=int, default=5, help='timing samples per metric, the median is kept')
+	p.add_argument('--zones', type=int, default=1000, help='projects in the batch benchmark')
+	p.add_argument('--threshold', type=float, default=THRESHOLD, help='regression threshold, fraction of the baseline')
+	p.add_argument('--baseline', default=BASELINE_FILE)
+	p.add_argument('--update', action='store_true', help='store this run as the baseline')
+	args = p.parse_args(argv)
+
+	metrics = run(args.pattern, args.repeat, args.zones)
+	baseline = None if args.update else load_baseline(args.baseline)
+	if baseline is None:
+		for name, (value, unit, _) in metrics.items():
+			print(f'{name:<32}{_format(value, unit)}')
+		if metrics:
+			save_baseline(metrics, args.baseline)
+			print(f'baseline written to {args.baseline}')
+		return 0
+	if baseline['machine'] != machine():
+		print(f'baseline of another machine or environment: {baseline["machine"]}', file=sys.stderr)
+	units = dict([(k, v[1]) for k, v in metrics.items()])
+	regressed = False
+	for name, value, base, change, worse in compare(metrics, baseline, args.threshold):
+		print(f'{name:<32}{_format(value, units[name])}  baseline {_format(base, units[name]).strip():>14}  '
+			  f'{-change:+7.1%}{"  REGRESSION" if worse else ""}')
+		regressed |= worse
+	new = [name for name in metrics if name not in baseline['metrics']]
+	for name in new:
+		print(f'{name:<32}{_format(*metrics[name][:2])}  (added to the baseline)')
+	if new:
+		save_baseline(dict([(k, tuple(v)) for k, v in baseline['metrics'].items()] + [(k, metrics[k]) for k in new]), args.baseline)
+	return int(regressed)
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,188 @@
+"""Golden results of a fixed scenario matrix, to check faster engines against the pyMEP reference.
+
+	python -m bench.golden capture                 # write bench/golden/ with the reference engine
+	python -m bench.golden check                   # every other engine against the golden arrays
+	python -m bench.golden check fast --rtol 1e-4
+
+The scenarios cover every roof, wall, floor and window of `lib._resource`, the four `space_types`
+and eight orientations, they are kept as `.rtsm` files next to the golden arrays so that later changes
+of the defaults do not move them. Each scenario keeps the 24-hour `FRAMES` below, an engine passes
+when every value is within `atol + rtol * peak` of the golden one, peak being the scenario's largest
+total cooling load. The speedup is against the time the captured engine took, capture on the machine
+that checks. No golden set is committed yet: tests/test_golden.py runs `check` for every fast engine only
+where `bench/golden/` has been captured, it skips otherwise and the fast engines stay unvalidated."""
+import argparse
+import contextlib
+import json
+import os
+import sys
+from datetime import datetime
+from time import perf_counter
+import numpy as np
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+FRAMES = ('cooling_load_df', 'wall_load_df', 'window_load_df')
+ORIENTATIONS = (0, 45, 90, 135, 180, -135, -90, -45)
+RTOL, ATOL = 1e-3, 1.0		# fraction of the peak, W
+REFERENCE = 'pymep'
+
+def scenarios() -> list:
+	"""[(name, ZoneSpec)] of the matrix, scenario i takes the i-th item (cyclically) of every list so
+	that each construction, window, space type and orientation appears at least once"""
+	from lib import _resource
+	from lib._ZoneSpec import ZoneSpec
+	from lib._constructions import ROOFS, WALLS, FLOORS
+	roofs, walls, floors, windows = len(_resource.roofs), len(_resource.walls), len(_resource.floors), len(_resource.windows)
+	external = [i for i, c in enumerate(_resource.walls.values()) if c.isExternal]
+	n = 2 * max(roofs, walls, floors, windows, len(_resource.space_types), len(ORIENTATIONS))
+	matrix = [('default', ZoneSpec.default())]
+	for i in range(n):
+		spec = ZoneSpec.default()
+		c, a = spec.climatic, spec.architec
+		c.SpaceType = i % len(_resource.space_types)
+		a.Compass = ORIENTATIONS[i * 3 % len(ORIENTATIONS)]
+		a.RoofType, a.FloorType = i % roofs, i % floors
+		a.URoof, a.UFloor = ROOFS.at(a.RoofType).U, FLOORS.at(a.FloorType).U
+		# wall A stays external so that its window always counts, B, C & D run through every wall
+		for k, side in enumerate('ABCD'):
+			wall = external[i % len(external)] if side == 'A' else (i + k) % walls
+			window = (i + k) % windows
+			setattr(a, f'Wall_{side}', wall)
+			setattr(a, f'UWall_{side}', WALLS.at(wall).U)
+			setattr(a, f'Win_{side}', window)
+			record = a.window(side)
+			size = (0.0, 0.0) if record.id == 'None' else (1.0 + k, 1.2 + 0.2 * (i % 4))
+			setattr(a, f'Win{side}Width', size[0])
+			setattr(a, f'Win{side}High', size[1])
+			setattr(a, f'UWin_{side}', record.U)
+			setattr(a, f'SCWin_{side}', record.SC)
+		c.Name = f'S{i:03d}'
+		matrix.append((c.Name, spec))
+	return matrix
+
+# region Engines, each calculates a list of `ZoneSpec`s into `ZoneResults`
+def _pymep(specs: list) -> list:
+	results = []
+	for spec in specs:
+		zone = spec.new_zone()
+		zone.Calculate()
+		results.append(zone.results)
+	return results
+
+def _fast(specs: list) -> list:
+	results = []
+	for spec in specs:
+		zone = spec.new_zone(fast=True)
+		zone.Calculate()
+		results.append(zone.results)
+	return results
+
+def _kernel(specs: list) -> list:
+	from lib._kernel import compile_zone, cooling_loads
+	from lib._results import ZoneResults
+	return [ZoneResults.from_loads(cooling_loads(compile_zone(spec))) for spec in specs]
+
+def _stacked(specs: list) -> list:
+	from lib._kernel import compile_zone, cooling_loads, stack
+	from lib._results import ZoneResults
+	return [ZoneResults.from_loads(loads) for loads in cooling_loads(stack([compile_zone(spec) for spec in specs]))]
+
+ENGINES = dict([('pymep', _pymep), ('fast', _fast), ('kernel', _kernel), ('stacked', _stacked)])
+# endregion
+
+def frames(results) -> dict:
+	"""{frame: 24 x columns array} of a `ZoneResults`, the columns of `lib._results.FRAMES`"""
+	from lib._results import FRAMES as COLUMNS, INDEX, _FRAME_TOTAL
+	return dict([(f, results.data[:, [INDEX[_FRAME_TOTAL[f] if c == 'TOTAL_CL' else c] for c in COLUMNS[f]]]) for f in FRAMES])
+
+def run(engine: str, specs: list, repeat: int = 1) -> tuple:
+	"""(results, best seconds of `repeat` runs) of an engine over the specs"""
+	best = None
+	with contextlib.redirect_stdout(open(os.devnull, 'w')):	# ComfortZone.Calculate reports on stdout
+		for _ in range(repeat):
+			start = perf_counter()
+			results = ENGINES[engine](specs)
+			seconds = perf_counter() - start
+			best = seconds if best is None else min(best, seconds)
+	return results, best
+
+def load_scenarios(directory: str = GOLDEN_DIR) -> list:
+	from lib._ZoneSpec import ZoneSpec
+	folder = os.path.join(directory, 'scenarios')
+	return [(f[:-5], ZoneSpec.load(os.path.join(folder, f))) for f in sorted(os.listdir(folder)) if f.endswith('.rtsm')]
+
+def capture(engine: str = REFERENCE, directory: str = GOLDEN_DIR, repeat: int = 1) -> None:
+	"""Writes the scenario files and the golden arrays of `engine`, replacing earlier ones"""
+	import platform
+	matrix = scenarios()
+	folder = os.path.join(directory, 'scenarios')
+	os.makedirs(folder, exist_ok=True)
+	for f in os.listdir(folder):
+		if f.endswith('.rtsm'): os.remove(os.path.join(folder, f))
+	for name, spec in matrix:
+		spec.save(os.path.join(folder, f'{name}.rtsm'))
+	results, seconds = run(engine, [spec for _, spec in matrix], repeat)
+	arrays = dict([(f'{name}:{f}', a) for (name, _), r in zip(matrix, results) for f, a in frames(r).items()])
+	meta = dict([('engine', engine), ('seconds', seconds), ('scenarios', len(matrix)), ('created', datetime.now().isoformat(timespec='seconds')),
+				 ('python', platform.python_version()), ('numpy', np.__version__)])
+	np.savez_compressed(os.path.join(directory, 'golden.npz'), meta=np.array(json.dumps(meta)), **arrays)
+	print(f'{len(matrix)} scenarios of {engine} in {seconds:.3f} s written to {directory}')
+
+def load_golden(directory: str = GOLDEN_DIR) -> tuple:
+	"""(meta, {scenario:frame: array})"""
+	with np.load(os.path.join(directory, 'golden.npz'), allow_pickle=False) as data:
+		return json.loads(str(data['meta'])), dict([(k, data[k]) for k in data.files if k != 'meta'])
+
+def check(engine: str, matrix: list, golden: dict, rtol: float = RTOL, atol: float = ATOL, repeat: int = 1) -> dict:
+	"""Accuracy and time of an engine over the scenarios: seconds, the largest absolute error (W),
+	the largest error relative to the scenario peak and the failing (scenario, frame, error)s"""
+	results, seconds = run(engine, [spec for _, spec in matrix], repeat)
+	max_abs, max_rel, failures = 0.0, 0.0, []
+	for (name, _), r in zip(matrix, results):
+		expected = dict([(f, golden[f'{name}:{f}']) for f in FRAMES])
+		peak = max(float(np.abs(expected['cooling_load_df'][:, -1]).max()), 1.0)
+		for f, a in frames(r).items():
+			error = float(np.abs(a - expected[f]).max())
+			max_abs, max_rel = max(max_abs, error), max(max_rel, error / peak)
+			if error > atol + rtol * peak:
+				failures.append((name, f, error))
+	return dict([('seconds', seconds), ('max_abs', max_abs), ('max_rel', max_rel), ('failures', failures)])
+
+def main(argv: list = None) -> int:
+	p = argparse.ArgumentParser(prog='python -m bench.golden', description='Golden results of the RTSM engines')
+	p.add_argument('--dir', default=GOLDEN_DIR)
+	p.add_argument('--repeat', type=int, default=1, help='timed runs per engine, the best is kept')
+	sub = p.add_subparsers(dest='command', required=True)
+	c = sub.add_parser('capture', help='calculate the scenarios with the reference engine and store the results')
+	c.add_argument('--engine', choices=tuple(ENGINES), default=REFERENCE)
+	k = sub.add_parser('check', help='compare engines with the golden results')
+	k.add_argument('engines', nargs='*', choices=tuple(ENGINES), help='every engine but the captured one by default')
+	k.add_argument('--rtol', type=float, default=RTOL, help='tolerance, fraction of the scenario peak')
+	k.add_argument('--atol', type=float, default=ATOL, help='tolerance, W')
+	args = p.parse_args(argv)
+
+	if args.command == 'capture':
+		capture(args.engine, args.dir, args.repeat)
+		return 0
+	meta, golden = load_golden(args.dir)
+	matrix = load_scenarios(args.dir)
+	engines = args.engines or [e for e in ENGINES if e != meta['engine']]
+	print(f'{len(matrix)} scenarios, golden of {meta["engine"]} ({meta["seconds"]:.3f} s, {meta["created"]})')
+	print(f'{"engine":<10}{"time":>12}{"speedup":>10}{"max error":>14}{"of peak":>10}  result')
+	status = 0
+	for engine in engines:
+		try:
+			r = check(engine, matrix, golden, args.rtol, args.atol, args.repeat)
+		except Exception as e:
+			print(f'{engine:<10}{type(e).__name__}: {e}')
+			status = 1
+			continue
+		print(f'{engine:<10}{r["seconds"]*1000:>9.1f} ms{meta["seconds"]/r["seconds"]:>9.1f}x{r["max_abs"]:>12.3f} W{r["max_rel"]:>10.2e}  '
+			  f'{"FAIL " + str(len(r["failures"])) if r["failures"] else "ok"}')
+		for name, f, error in r['failures'][:10]:
+			print(f'  {name} {f}: {error:.3f} W')
+		status |= bool(r['failures'])
+	return status
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1 @@
+# Lets pytest import `lib` and `bench` from the repository root
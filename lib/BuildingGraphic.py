@@ -1,16 +1,79 @@
-from PyQt6.QtCore import Qt, QPoint, QLine
+from contextlib import contextmanager
+from PyQt6.QtCore import Qt, QPoint, QLine, QTimer
 from PyQt6.QtGui import QPixmap, QPainter, QColor, QBrush, QPolygon
 from PyQt6.QtWidgets import QLabel
 
-class SideView(QLabel):
-    def __init__(self, w, h, background= Qt.GlobalColor.gray ,parent=None):
+class _LayeredView(QLabel):
+    """Canvas composed of cached layer pixmaps, bottom to top in `layers`. A setter invalidates only the
+    layers it changes, and however many setters run, the canvas is composed once on the next turn of
+    the event loop. Each layer is painted by `_paint<Layer>(painter)`, the first one fills the background."""
+    layers = ()
+
+    def __init__(self, w, h, background, parent=None):
         super().__init__(parent)
 
         self.canvas = QPixmap(w, h)
         self.setPixmap(self.canvas)
         self.background = background
+        self._cache = {}
+        self._deferred = 0
+        self._pending = False
+        self._scheduled = False
+        self.draw()
+
+    @contextmanager
+    def deferDraw(self):
+        """The setters inside the block only mark the view, it is drawn once when the block ends"""
+        self._deferred += 1
+        try:
+            yield self
+        finally:
+            self._deferred -= 1
+            if not self._deferred and self._pending: self.draw()
+
+    def invalidate(self, *layers):
+        """Repaints `layers`, every layer when none is given, with the next draw"""
+        for layer in layers or self.layers:
+            self._cache.pop(layer, None)
+        self.draw()
+
+    def draw(self):
+        """Schedules one composition on the next event loop turn"""
+        if self._deferred:
+            self._pending = True
+            return
+        self._pending = False
+        if not self._scheduled:
+            self._scheduled = True
+            QTimer.singleShot(0, self.flush)
+
+    def flush(self):
+        """Composes the canvas now if a draw is scheduled"""
+        if not self._scheduled: return
+        self._scheduled = False
+        painter = QPainter(self.canvas)
+        for layer in self.layers:
+            pixmap = self._cache.get(layer)
+            if pixmap is None: pixmap = self._cache[layer] = self._layer(layer)
+            painter.drawPixmap(0, 0, pixmap)
+        painter.end()
+        self.setPixmap(self.canvas)
+
+    def _layer(self, layer: str) -> QPixmap:
+        pixmap = QPixmap(self.canvas.size())
+        pixmap.fill(self.background if layer == self.layers[0] else Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        getattr(self, f'_paint{layer.capitalize()}')(painter)
+        painter.end()
+        return pixmap
+
+class SideView(_LayeredView):
+    layers = ('static', 'building')
+
+    def __init__(self, w, h, background= Qt.GlobalColor.gray ,parent=None):
         self.by0, self.by1 = 60, 80
         self.ry0, self.ry1 = 83, 105
+        super().__init__(w, h, background, parent)
 
     def setFloor(self, floorType:int):
         match floorType:
@@ -26,13 +89,21 @@ class SideView(QLabel):
             case 3:
                 self.by0, self.by1 = 15, 30
                 self.ry0, self.ry1 = 83, 105
-        self.draw()
+        self.invalidate('building')
 
-    def draw(self):
-        self.canvas.fill(self.background)
-        painter = QPainter(self.canvas)
+    def _paintStatic(self, painter: QPainter):
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        # Draw Sun
+        painter.setPen(Qt.GlobalColor.red)
+        painter.setBrush(Qt.GlobalColor.red)
+        painter.drawEllipse(20, 20, 20, 20)
+        painter.drawLines([QLine(30, 15, 30, 45),
+                           QLine(15, 30, 45, 30),
+                           QLine(15, 15, 45, 45),
+                           QLine(15, 45, 45, 15)])
 
+    def _paintBuilding(self, painter: QPainter):
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         # Draw Building
         points = QPolygon([QPoint( 85, self.by0),
                            QPoint( 65, self.by1),
@@ -49,24 +120,11 @@ class SideView(QLabel):
                            QPoint(105, self.ry0)])
         painter.drawPolygon(points)
 
-        # Draw Sun
-        painter.setPen(Qt.GlobalColor.red)
-        painter.setBrush(Qt.GlobalColor.red)
-        painter.drawEllipse(20, 20, 20, 20)
-        painter.drawLines([QLine(30, 15, 30, 45),
-                           QLine(15, 30, 45, 30),
-                           QLine(15, 15, 45, 45),
-                           QLine(15, 45, 45, 15)])
-        painter.end()
-        self.setPixmap(self.canvas)
+class TopView(_LayeredView):
+    # the compass and the dimensions change alone, rotating only repaints the compass
+    layers = ('static', 'envelope', 'compass', 'dimensions')
 
-class TopView(QLabel):
     def __init__(self, w, h, background= Qt.GlobalColor.gray ,parent=None):
-        super().__init__(parent)
-
-        self.canvas = QPixmap(w, h)
-        self.setPixmap(self.canvas)
-        self.background = background
         self.internalColor = Qt.GlobalColor.black
         self.windowBrush = QBrush(QColor('#5000ffff'))
         self.compassColor = QColor('#55aa00')
@@ -81,6 +139,7 @@ class TopView(QLabel):
         self._length = 0
         self._width = 0
         self._rotate = 0
+        super().__init__(w, h, background, parent)
 
     def setWallType(self, wall:str, isExternal:bool):
         brush = QBrush(self.background if isExternal else self.internalColor)
@@ -93,7 +152,7 @@ class TopView(QLabel):
                 self.brushWall_C = brush
             case 'Wall_D':
                 self.brushWall_D = brush
-        self.draw()
+        self.invalidate('envelope')
 
     def setWallWindow(self, wall:str, isHasWindow:bool):
         match wall:
@@ -105,26 +164,37 @@ class TopView(QLabel):
                 self.windowWall_C = isHasWindow
             case 'Wall_D':
                 self.windowWall_D = isHasWindow
-        self.draw()
+        self.invalidate('envelope')
 
     def setLength(self, length: float):
         self._length = length
-        self.draw()
+        self.invalidate('dimensions')
 
     def setWidth(self, width: float):
         self._width = width
-        self.draw()
+        self.invalidate('dimensions')
 
     def setRotate(self, angle: int):
         self._rotate = angle
-        self.draw()
+        self.invalidate('compass')
 
-    def draw(self):
-        self.canvas.fill(self.background)
-        painter = QPainter(self.canvas)
-        # painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        # painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+    def _paintStatic(self, painter: QPainter):
+        # Draw Labels
+        painter.drawText(100, 13, 50, 15, Qt.AlignmentFlag.AlignHCenter, 'A')
+        painter.drawText(38, 75, 'B')
+        painter.drawText(100, 110, 50, 15, Qt.AlignmentFlag.AlignHCenter, 'C')
+        painter.drawText(205, 75, 'D')
+        painter.setPen(QColor('red'))
+        painter.drawLines([QLine(50, 115, 50, 135),
+                           QLine(50, 130, 95, 130),
+                           QLine(155, 130, 200, 130),
+                           QLine(200, 115, 200, 135)])
+        painter.drawLines([QLine(205, 30, 240, 30),
+                           QLine(235, 30, 235, 60),
+                           QLine(235, 80, 235, 110),
+                           QLine(205, 110, 240, 110)])
 
+    def _paintEnvelope(self, painter: QPainter):
         # Draw Walls
         painter.setBrush(self.brushWall_A)
         painter.drawRect(50, 30, 150, 5)
@@ -146,8 +216,8 @@ class TopView(QLabel):
         if self.windowWall_D:
             painter.drawRect(195, 55, 5, 30)
 
+    def _paintCompass(self, painter: QPainter):
         # Darw Compass
-        painter.save()
         painter.setBrush(Qt.BrushStyle.NoBrush)
         painter.drawEllipse(113, 58, 24, 24)
         compass = QPolygon([QPoint(12, 20), QPoint(0, 6), QPoint(-12, 20), QPoint(0, -20)])
@@ -155,24 +225,8 @@ class TopView(QLabel):
         painter.rotate(self._rotate)
         painter.setBrush(self.compassColor)
         painter.drawPolygon(compass)
-        painter.restore()
 
-        # Draw Labels
-        painter.drawText(100, 13, 50, 15, Qt.AlignmentFlag.AlignHCenter, 'A')
-        painter.drawText(38, 75, 'B')
-        painter.drawText(100, 110, 50, 15, Qt.AlignmentFlag.AlignHCenter, 'C')
-        painter.drawText(205, 75, 'D')
+    def _paintDimensions(self, painter: QPainter):
         painter.setPen(QColor('red'))
-        painter.drawLines([QLine(50, 115, 50, 135),
-                           QLine(50, 130, 95, 130),
-                           QLine(155, 130, 200, 130),
-                           QLine(200, 115, 200, 135)])
-        painter.drawLines([QLine(205, 30, 240, 30),
-                           QLine(235, 30, 235, 60),
-                           QLine(235, 80, 235, 110),
-                           QLine(205, 110, 240, 110)])
         painter.drawText(100, 123, 50, 15, Qt.AlignmentFlag.AlignHCenter, f'({self._length:.2f} m)')
         painter.drawText(220, 75, f'({self._width:.2f} m)')
-
-        painter.end()
-        self.setPixmap(self.canvas)
\ No newline at end of file
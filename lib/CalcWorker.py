@@ -0,0 +1,73 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+class CalcSignals(QObject):
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+class CalcWorker(QRunnable):
+    """Runs `function()` on a pool thread and reports its result with the generation it was started for"""
+    def __init__(self, generation, function, is_current):
+        super(CalcWorker, self).__init__()
+        self.generation = generation
+        self.function = function
+        self.is_current = is_current
+        self.signals = CalcSignals()
+
+    def run(self):
+        # a newer request superseded this one while it was queued
+        if not self.is_current(self.generation): return
+        try:
+            result = self.function()
+        except Exception as e:
+            self.signals.failed.emit(self.generation, f'{type(e).__name__}: {e}')
+        else:
+            self.signals.finished.emit(self.generation, result)
+
+class CalcScheduler(QObject):
+    """Debounces calculation requests and runs only the latest one off the GUI thread.
+
+    `request(function)` restarts the debounce timer, when it fires the last requested function
+    is started on a single thread pool. Every request bumps the generation, a result arriving
+    for an older generation is dropped, so stale runs never overwrite newer output."""
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, debounce_ms=200, parent=None):
+        super(CalcScheduler, self).__init__(parent)
+        self.generation = 0
+        self.function = None
+        # one thread, the engine keeps pyMEP `Setting` as global state
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(debounce_ms)
+        self.timer.timeout.connect(self.start)
+
+    def is_current(self, generation):
+        return generation == self.generation
+
+    def request(self, function):
+        self.generation += 1
+        self.function = function
+        self.timer.start()
+
+    def cancel(self):
+        self.generation += 1
+        self.timer.stop()
+        self.pool.clear()
+
+    def start(self):
+        if self.function is None: return
+        self.pool.clear()
+        worker = CalcWorker(self.generation, self.function, self.is_current)
+        worker.signals.finished.connect(self.on_finished)
+        worker.signals.failed.connect(self.on_failed)
+        self.function = None
+        self.pool.start(worker)
+
+    def on_finished(self, generation, result):
+        if self.is_current(generation): self.finished.emit(result)
+
+    def on_failed(self, generation, message):
+        if self.is_current(generation): self.failed.emit(message)
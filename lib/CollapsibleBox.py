@@ -13,6 +13,7 @@ class CollapsibleBox(QWidget):
         self.toggle_button.pressed.connect(self.on_pressed)
 
         self.toggle_animation = QParallelAnimationGroup(self)
+        self.content_factory = None
 
         self.content_area = QScrollArea(maximumHeight=0, minimumHeight=0)
         self.content_area.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
@@ -31,6 +32,7 @@ class CollapsibleBox(QWidget):
     @pyqtSlot()
     def on_pressed(self):
         checked = self.toggle_button.isChecked()
+        if not checked: self.ensureContent()
         self.toggle_button.setArrowType(Qt.ArrowType.DownArrow if not checked else Qt.ArrowType.RightArrow)
         self.toggle_animation.setDirection(QAbstractAnimation.Direction.Forward if not checked else QAbstractAnimation.Direction.Backward)
         self.toggle_animation.start()
@@ -49,4 +51,13 @@ class CollapsibleBox(QWidget):
         content_animation = self.toggle_animation.animationAt(self.toggle_animation.animationCount() - 1)
         content_animation.setDuration(500)
         content_animation.setStartValue(0)
-        content_animation.setEndValue(content_height)
\ No newline at end of file
+        content_animation.setEndValue(content_height)
+
+    def setContentFactory(self, factory):
+        """Defers the content, `factory()` returns the layout and runs on the first expand or `ensureContent`"""
+        self.content_factory = factory
+
+    def ensureContent(self):
+        if self.content_factory is None: return
+        factory, self.content_factory = self.content_factory, None
+        self.setContentLayout(factory())
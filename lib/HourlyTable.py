@@ -1,10 +1,11 @@
-from os.path import basename
-from PyQt6.QtCore import Qt, QRegularExpression
-from PyQt6.QtGui import QRegularExpressionValidator, QColor, QPen
-from PyQt6.QtWidgets import QTableWidget, QTableWidgetItem, QLineEdit, QStyledItemDelegate
+import numpy as np
+from PyQt6.QtCore import Qt, QRegularExpression, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QRegularExpressionValidator, QColor
+from PyQt6.QtWidgets import QTableView, QLineEdit, QStyledItemDelegate
 
-_module_name = f'\033[31;1m{basename(__file__):25}:: \033[{0}m'
-hourlyHeader = ['0','1','2','3','4','5','6','7','8','9','10','11','12','13','14','15','16','17','18','19','20','21','22','23']
+# row labels of a multi-day schedule
+dayTypes = ['Weekday', 'Weekend', 'Holiday']
+_RED, _GRAY = QColor('red'), QColor('gray')
 
 class NumericDelegate(QStyledItemDelegate):
 
@@ -16,57 +17,112 @@ class NumericDelegate(QStyledItemDelegate):
             editor.setValidator(validator)
         return editor
 
-    def paint(self,painter,option,index):
-        painter.setPen(QPen(QColor('red' if int(index.data()) > 0 else 'gray')))
-        painter.drawText(option.rect, Qt.AlignmentFlag.AlignCenter, index.data())
+class HourlyModel(QAbstractTableModel):
+    """Schedule of rows (days or day types) x hours held in one NumPy array, no item per cell.
+    `setValues` replaces everything with a single `dataChanged`, a numeric model shows values > 0 in red,
+    a checkable one shows every cell as a check box of 0/1."""
 
-class numericHourlyTable(QTableWidget):
-    def __init__(self, columns, columnWidth=20):
-        super().__init__(1, columns)
-        self.columnWidth = columnWidth
-        self.setItemDelegate(NumericDelegate(self))
-        self.horizontalHeader().setMinimumSectionSize(10)
-        self.verticalHeader().setVisible(False)
-        self.setValue([0,0,0,0,0,0,0,0,10,10,10,10,0,10,10,10,10,0,0,0,0,0,0,0])
-        self.setHorizontalHeaderLabels(hourlyHeader)
+    def __init__(self, rows=1, columns=24, checkable=False, rowLabels=None, parent=None):
+        super(HourlyModel, self).__init__(parent)
+        self.checkable = checkable
+        self.rowLabels = rowLabels
+        self.values = np.zeros((rows, columns))
 
-    def setValue(self, v:list):
-        for column in range(self.columnCount()):
-            item = QTableWidgetItem(str(v[column]))
-            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.setItem(0, column, item)
-            self.setColumnWidth(column, self.columnWidth)
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.values.shape[0]
 
-    def value(self)->list:
-        try:
-            return [int(self.item(0, i).text()) for i in range(self.columnCount())]
-        except Exception as e:
-            print(_module_name, 'Error:', e)
-            return []
-        # rawlist = [self.item(0, i).text() for i in range(self.columnCount())]
-        # returnlist = []
-        # for i in rawlist:
-        #     if i == '': returnlist.append(0)
-        #     else: returnlist.append(int(i))
-        # return returnlist
-
-class checkBoxHourlyTable(QTableWidget):
-    def __init__(self, columns, columnWidth=20):
-        super().__init__(1, columns)
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.values.shape[1]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid(): return None
+        v = self.values[index.row(), index.column()]
+        match role:
+            case Qt.ItemDataRole.DisplayRole | Qt.ItemDataRole.EditRole:
+                return None if self.checkable else f'{v:g}'
+            case Qt.ItemDataRole.CheckStateRole:
+                return (Qt.CheckState.Checked if v else Qt.CheckState.Unchecked) if self.checkable else None
+            case Qt.ItemDataRole.TextAlignmentRole:
+                return Qt.AlignmentFlag.AlignCenter
+            case Qt.ItemDataRole.ForegroundRole:
+                return None if self.checkable else (_RED if v > 0 else _GRAY)
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid(): return False
+        if role == Qt.ItemDataRole.CheckStateRole and self.checkable:
+            v = 1 if Qt.CheckState(value) == Qt.CheckState.Checked else 0
+        elif role == Qt.ItemDataRole.EditRole and not self.checkable:
+            try:
+                v = float(value)
+            except ValueError:
+                return False
+        else:
+            return False
+        self.values[index.row(), index.column()] = v
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def flags(self, index):
+        if self.checkable:
+            return Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled
+        return Qt.ItemFlag.ItemIsEditable | Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole: return None
+        if orientation == Qt.Orientation.Horizontal:
+            return str(section % 24)
+        return self.rowLabels[section] if self.rowLabels is not None and section < len(self.rowLabels) else str(section + 1)
+
+    def setValues(self, v):
+        """Replaces the whole schedule, a new shape resets the model, otherwise one `dataChanged` covers every cell"""
+        v = np.array(v, dtype=float, ndmin=2)
+        if v.shape != self.values.shape:
+            self.beginResetModel()
+            self.values = v
+            self.endResetModel()
+        else:
+            self.values[...] = v
+            self.dataChanged.emit(self.index(0, 0), self.index(v.shape[0] - 1, v.shape[1] - 1))
+
+def _plain(v: np.ndarray) -> list:
+    """ints where every value is whole, as the `.rtsm` files hold them"""
+    return v.astype(int).tolist() if np.all(v == np.round(v)) else v.tolist()
+
+class _HourlyTable(QTableView):
+    """One row of 24 hours by default. With `rows` > 1 the table holds a multi-day schedule, e.g. the
+    `dayTypes` or 365 days of an 8760-hour year, the view only paints the visible cells."""
+    checkable = False
+
+    def __init__(self, columns, columnWidth=20, rows=1, rowLabels=None, default=None):
+        super().__init__()
         self.columnWidth = columnWidth
+        self.hourly = HourlyModel(rows, columns, self.checkable, rowLabels, self)
+        self.setModel(self.hourly)
         self.horizontalHeader().setMinimumSectionSize(10)
-        self.verticalHeader().setVisible(False)
-        self.setValue([0,0,0,0,0,0,0,0,1,1,1,1,0,1,1,1,1,0,0,0,0,0,0,0])
-        self.setHorizontalHeaderLabels(hourlyHeader)
-
-    def setValue(self, v:list):
-        for column in range(self.columnCount()):
-            item = QTableWidgetItem()
-            item.setFlags(Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled)
-            item.setCheckState(Qt.CheckState.Checked if v[column] == 1 else Qt.CheckState.Unchecked)
-            self.setItem(0, column, item)
-            self.setColumnWidth(column, self.columnWidth)
+        self.horizontalHeader().setDefaultSectionSize(columnWidth)
+        self.verticalHeader().setVisible(rows > 1)
+        if default is not None: self.setValue(np.resize(default, (rows, columns)))
+
+    def setValue(self, v):
+        """A list of one row or a rows x columns array"""
+        self.hourly.setValues(v)
 
     def value(self)->list:
-        return [1 if self.item(0, i).checkState() == Qt.CheckState.Checked else 0 for i in range(self.columnCount())]
-        # return [self.item(0, i).checkState() == Qt.CheckState.Checked for i in range(self.columnCount())]
+        """The row as a list for a single-row table, a list of rows otherwise"""
+        v = self.hourly.values
+        return _plain(v[0]) if v.shape[0] == 1 else [_plain(row) for row in v]
+
+    def values(self) -> np.ndarray:
+        return self.hourly.values.copy()
+
+class numericHourlyTable(_HourlyTable):
+    def __init__(self, columns, columnWidth=20, rows=1, rowLabels=None):
+        super().__init__(columns, columnWidth, rows, rowLabels, [0,0,0,0,0,0,0,0,10,10,10,10,0,10,10,10,10,0,0,0,0,0,0,0])
+        self.setItemDelegate(NumericDelegate(self))
+
+class checkBoxHourlyTable(_HourlyTable):
+    checkable = True
+
+    def __init__(self, columns, columnWidth=20, rows=1, rowLabels=None):
+        super().__init__(columns, columnWidth, rows, rowLabels, [0,0,0,0,0,0,0,0,1,1,1,1,0,1,1,1,1,0,0,0,0,0,0,0])
@@ -1,5 +1,4 @@
-﻿from psychrolib import SetUnitSystem, SI, CalcPsychrometricsFromTWetBulb, CalcPsychrometricsFromRelHum
-from pyMEP import Quantity
+﻿from pyMEP import Quantity
 from pyMEP.hvac.internal_heat_gains import *
 from pyMEP.hvac.external_heat_gains import *
 from pyMEP.hvac.coolingload import *
@@ -7,6 +6,11 @@ from pyMEP.hvac.lighting import *
 from pyMEP.hvac.people import *
 from pyMEP.hvac.equipment import *
 from lib._resource import *
+from lib._cache import rts_values, update_weather
+from lib._results import ZoneResults
+from lib._profile import profiler
+from lib._psychro import air_constants, humidity_ratio_from_rel_hum, outdoor_humidity_ratio, pressure
+from lib._kernel import COLUMNS, compile_zone, cooling_loads, wall_azimuths
 
 Q_ = Quantity
 
@@ -15,15 +19,23 @@ class ComfortZone:
 	_oreintation : Quantity
 	_ventilation : Quantity
 
-	def __init__(self, id: str, weather: WeatherData) -> None:
+	def __init__(self, id: str, weather: WeatherData, dtype=np.float64, fast: bool = False) -> None:
+		"""With `fast` the zone holds plain SI floats (m, fraction) instead of pint quantities and
+		`Calculate` runs the NumPy kernel on its `ZoneSpec`, no pyMEP surfaces are created."""
 		self.ID = id
 		self.weather_data = weather
-		self.Width : Quantity = Q_(0, 'm')
-		self.Length : Quantity = Q_(0, 'm')
-		self.Height : Quantity = Q_(0, 'm')
+		self.fast = fast
+		self.Width : Quantity = 0.0 if fast else Q_(0, 'm')
+		self.Length : Quantity = 0.0 if fast else Q_(0, 'm')
+		self.Height : Quantity = 0.0 if fast else Q_(0, 'm')
 		self.SpaceType : int
 		self.safety : Quantity
 		self.max_hr : list
+		self.spec = None
+		self.T_wb_rng = 0.0
+		self.results = ZoneResults(dtype)
+		self.recalculated : tuple = ()
+		if fast: return
 
 		self.Roof : Roof = Roof(id='Roof')
 		self.Ceiling : Ceiling = Ceiling(id='Ceiling')
@@ -39,18 +51,17 @@ class ComfortZone:
 		self.Equipment_HeatGain = EquipmentHeatGain('Equipment_0')
 		self.Equipment_HeatGain.add_equipment(GenericAppliance.create(ID='eqp0', schedule=self.Equipment_HeatGain.usage_schedule))
 
-		self.external_load_df = pd.DataFrame([i for i in range(24)], columns=['Hr'])
-		self.external_load_df.set_index('Hr', inplace=True)
-		self.internal_load_df = self.external_load_df.copy()
-		self.ventilation_load_df = self.external_load_df.copy()
-		self.wall_load_df = self.external_load_df.copy()
-		self.window_load_df = self.external_load_df.copy()
-		self.cooling_load_df = self.external_load_df.copy()
-
-	def Calculate(self) -> None:
+	def Calculate(self, rows=None) -> None:
+		"""Fills `results`. With `rows`, indices of `lib._kernel.COLUMNS` as `lib._graph.IncrementalZone`
+		tracks them, only those rows are recalculated and the others keep their last values, unless the
+		zone RTS changed. `recalculated` names the rows this run produced."""
+		if self.fast:
+			self.CalculateVectorized()
+			self.recalculated = COLUMNS
+			return
 		# UPDATE WEATHER DATA
-		self.weather_data.update_sun_position()
-		self.weather_data.synthetic_daily_db_profiles()
+		with profiler.stage('weather'):
+			update_weather(self.weather_data)
 		match self.SpaceType:
 			case 0:		# Single Floor
 				self.Roof.IsEnabled = True
@@ -65,111 +76,145 @@ class ComfortZone:
 				self.Roof.IsEnabled = False
 				self.Floor.IsEnabled = False
 		self.Ceiling.IsEnabled = not self.Roof.IsEnabled
-		Setting.NRTS_zones = 'Exterior' if self.Wall_A.wall_type.value or self.Wall_B.wall_type.value or self.Wall_C.wall_type.value or self.Wall_D.wall_type.value else 'Interior'
-		self.ns_rts_zone = RTS.rts_values(nrts=True, zones = Setting.NRTS_zones ,
-													 room_construction = Setting.NRTS_Room_construction,
-													 carpet = Setting.NRTS_Carpet,
-													 glass = Setting.NRTS_Glass)
-		self.s_rts_zone = RTS.rts_values(nrts=False, room_construction = Setting.NRTS_Room_construction,
-													 carpet = Setting.NRTS_Carpet,
-													 glass = Setting.NRTS_Glass)
-		# ROOF
-		if not self.Roof.IsEnabled:
-			self.Roof.cooling_load_df = None
-			self.external_load_df['Roof'] = 0.0
-		else:
-			self.Roof.Update_ns_rts(self.ns_rts_zone)
-			self.external_load_df['Roof'] = self.Roof.cooling_load_df['TOTAL_CL']
-		# FLOOR
-		self.Floor.Update_ns_rts(self.ns_rts_zone)
-		self.Ceiling.cooling_load_df = self.Floor.cooling_load_df.copy()
-		if not self.Floor.IsEnabled:
-			self.Floor.cooling_load_df = None
-			self.external_load_df['Floor'] = 0.0
-		else:
-			self.external_load_df['Floor'] = self.Floor.cooling_load_df['TOTAL_CL']
-		# CEILING
-		if not self.Ceiling.IsEnabled:
-			self.Ceiling.cooling_load_df = None
-			self.external_load_df['Ceiling'] = 0.0
-		else:
-			self.external_load_df['Ceiling'] = self.Ceiling.cooling_load_df['TOTAL_CL']
-		# WALL
-		self.Wall_A.Update_ns_rts(self.ns_rts_zone)
-		self.wall_load_df['Wall-A'] = self.Wall_A.cooling_load_df['TOTAL_CL']
-		self.Wall_B.Update_ns_rts(self.ns_rts_zone)
-		self.wall_load_df['Wall-B'] = self.Wall_B.cooling_load_df['TOTAL_CL']
-		self.Wall_C.Update_ns_rts(self.ns_rts_zone)
-		self.wall_load_df['Wall-C'] = self.Wall_C.cooling_load_df['TOTAL_CL']
-		self.Wall_D.Update_ns_rts(self.ns_rts_zone)
-		self.wall_load_df['Wall-D'] = self.Wall_D.cooling_load_df['TOTAL_CL']
-		# WINDOW
-		if not self.Wall_A.windows:
-			self.window_load_df['Win-A'] = 0.0
-		else:
-			window = self.Wall_A.windows.get('Win-A')
-			window.S_RTS = self.s_rts_zone
-			window.update_cooling_load()
-			self.window_load_df['Win-A'] = window.cooling_load_df['TOTAL_CL']
-		if not self.Wall_B.windows:
-			self.window_load_df['Win-B'] = 0.0
-		else:
-			window = self.Wall_B.windows.get('Win-B')
-			window.S_RTS = self.s_rts_zone
-			window.update_cooling_load()
-			self.window_load_df['Win-B'] = window.cooling_load_df['TOTAL_CL']
-		if not self.Wall_C.windows:
-			self.window_load_df['Win-C'] = 0.0
-		else:
-			window = self.Wall_C.windows.get('Win-C')
-			window.S_RTS = self.s_rts_zone
-			window.update_cooling_load()
-			self.window_load_df['Win-C'] = window.cooling_load_df['TOTAL_CL']
-		if not self.Wall_D.windows:
-			self.window_load_df['Win-D'] = 0.0
-		else:
-			window = self.Wall_D.windows.get('Win-D')
-			window.S_RTS = self.s_rts_zone
-			window.update_cooling_load()
-			self.window_load_df['Win-D'] = window.cooling_load_df['TOTAL_CL']
-		# LIGHTING
-		self.Light_HeatGain.Update_ns_rts(self.ns_rts_zone)
-		self.internal_load_df['Lighting'] = self.Light_HeatGain.cooling_load_df['TOTAL_CL']
-		# PEOPLE
-		self.People_HeatGain.Update_ns_rts(self.ns_rts_zone)
-		self.internal_load_df['People'] = self.People_HeatGain.cooling_load_df['TOTAL_CL']
-		# EQUIPMENT
-		self.Equipment_HeatGain.Update_ns_rts(self.ns_rts_zone)
-		self.internal_load_df['Equipment'] = self.Equipment_HeatGain.cooling_load_df['TOTAL_CL']
+		with profiler.stage('rts'):
+			previous = getattr(self, 'ns_rts_zone', None), getattr(self, 's_rts_zone', None)
+			Setting.NRTS_zones = 'Exterior' if self.Wall_A.wall_type.value or self.Wall_B.wall_type.value or self.Wall_C.wall_type.value or self.Wall_D.wall_type.value else 'Interior'
+			# pyMEP keeps these on its surfaces, the cached arrays are read-only
+			self.ns_rts_zone = rts_values(nrts=True, zones = Setting.NRTS_zones).copy()
+			self.s_rts_zone = rts_values(nrts=False).copy()
+			if rows is not None and any(old is None or not np.array_equal(old, new) for old, new in zip(previous, (self.ns_rts_zone, self.s_rts_zone))):
+				rows = None
+		todo = set(COLUMNS) if rows is None else set(COLUMNS[i] for i in rows)
+		with profiler.stage('roof'):
+			# ROOF
+			if 'Roof' not in todo:
+				pass
+			elif not self.Roof.IsEnabled:
+				self.Roof.cooling_load_df = None
+				self.results['Roof'] = 0.0
+			else:
+				self.Roof.Update_ns_rts(self.ns_rts_zone)
+				self.results['Roof'] = self.Roof.cooling_load_df['TOTAL_CL']
+		with profiler.stage('floor'):
+			if todo & {'Floor', 'Ceiling'}:
+				# FLOOR
+				self.Floor.Update_ns_rts(self.ns_rts_zone)
+				self.Ceiling.cooling_load_df = self.Floor.cooling_load_df.copy()
+				if not self.Floor.IsEnabled:
+					self.Floor.cooling_load_df = None
+					self.results['Floor'] = 0.0
+				else:
+					self.results['Floor'] = self.Floor.cooling_load_df['TOTAL_CL']
+				# CEILING
+				if not self.Ceiling.IsEnabled:
+					self.Ceiling.cooling_load_df = None
+					self.results['Ceiling'] = 0.0
+				else:
+					self.results['Ceiling'] = self.Ceiling.cooling_load_df['TOTAL_CL']
+		with profiler.stage('walls'):
+			# WALL
+			for side in 'ABCD':
+				if f'Wall-{side}' in todo:
+					wall = getattr(self, f'Wall_{side}')
+					wall.Update_ns_rts(self.ns_rts_zone)
+					self.results[f'Wall-{side}'] = wall.cooling_load_df['TOTAL_CL']
+		with profiler.stage('windows'):
+			# WINDOW
+			for side in 'ABCD':
+				if f'Win-{side}' not in todo:
+					continue
+				wall = getattr(self, f'Wall_{side}')
+				if not wall.windows:
+					self.results[f'Win-{side}'] = 0.0
+				else:
+					window = wall.windows.get(f'Win-{side}')
+					window.S_RTS = self.s_rts_zone
+					window.update_cooling_load()
+					self.results[f'Win-{side}'] = window.cooling_load_df['TOTAL_CL']
+		with profiler.stage('internal'):
+			# LIGHTING
+			if 'Lighting' in todo:
+				self.Light_HeatGain.Update_ns_rts(self.ns_rts_zone)
+				self.results['Lighting'] = self.Light_HeatGain.cooling_load_df['TOTAL_CL']
+			# PEOPLE
+			if 'People' in todo:
+				self.People_HeatGain.Update_ns_rts(self.ns_rts_zone)
+				self.results['People'] = self.People_HeatGain.cooling_load_df['TOTAL_CL']
+			# EQUIPMENT
+			if 'Equipment' in todo:
+				self.Equipment_HeatGain.Update_ns_rts(self.ns_rts_zone)
+				self.results['Equipment'] = self.Equipment_HeatGain.cooling_load_df['TOTAL_CL']
 		# VENTILATION
-		qs = np.round(self._cs * self._ventilation * (np.array([i.m for i in self.weather_data.T_db_prof]) - Setting.Inside_DB.m), 0)
-		self.ventilation_load_df['SHG'] =  qs * np.array(self.Light_HeatGain.usage_profile)
-		SetUnitSystem(SI)
-		hum_ratio_o = CalcPsychrometricsFromTWetBulb(self.weather_data.T_db_des.m, self.weather_data.T_wb_mc.m, 101325)[0] * 1000
-		hum_ratio_i = CalcPsychrometricsFromRelHum(Setting.Inside_DB.m, Setting.Inside_RH, 101325)[0] * 1000
-		ql = np.round(self._cl * self._ventilation * (hum_ratio_o - hum_ratio_i), 0)
-		self.ventilation_load_df['LHG'] =  ql * np.array(self.Light_HeatGain.usage_profile)
-		self.ventilation_load_df['TOTAL_CL'] = self.ventilation_load_df['SHG'] + self.ventilation_load_df['LHG']
-		# SUMMARY
-		self.wall_load_df['TOTAL_CL'] = 0.0
-		self.wall_load_df['TOTAL_CL'] = self.wall_load_df.sum(axis=1)
-		self.external_load_df['Wall'] = self.wall_load_df['TOTAL_CL']
-		self.window_load_df['TOTAL_CL'] = 0.0
-		self.window_load_df['TOTAL_CL'] = self.window_load_df.sum(axis=1)
-		self.external_load_df['Window'] = self.window_load_df['TOTAL_CL']
-		self.external_load_df['TOTAL_CL'] = 0.0
-		self.external_load_df['TOTAL_CL'] = self.external_load_df.sum(axis=1)
-		self.internal_load_df['TOTAL_CL'] = 0.0
-		self.internal_load_df['TOTAL_CL'] = self.internal_load_df.sum(axis=1)
-		self.cooling_load_df['external'] = self.external_load_df['TOTAL_CL']
-		self.cooling_load_df['internal'] = self.internal_load_df['TOTAL_CL']
-		self.cooling_load_df['ventilation'] = self.ventilation_load_df['TOTAL_CL']
-		self.cooling_load_df['TOTAL_CL'] = 0.0
-		self.cooling_load_df['TOTAL_CL'] = self.cooling_load_df.sum(axis=1)
-		total_cl = self.cooling_load_df['TOTAL_CL']
-		self.max_hr = total_cl[total_cl == total_cl.max()].index.tolist()
+		if todo & {'SHG', 'LHG'}:
+			weather = self.weather_data
+			T_db = np.array([i.m for i in weather.T_db_prof])
+			with profiler.stage('psychrometrics'):
+				P = pressure(weather.altitude.m)
+				hum_ratio_o = outdoor_humidity_ratio(T_db, weather.T_db_des.m, weather.T_db_rng.m, weather.T_wb_mc.m, self.T_wb_rng, P) * 1000
+				hum_ratio_i = humidity_ratio_from_rel_hum(Setting.Inside_DB.m, Setting.Inside_RH, P) * 1000
+			with profiler.stage('ventilation'):
+				qs = np.round(self._cs * self._ventilation * (T_db - Setting.Inside_DB.m), 0)
+				self.results['SHG'] = qs.m * np.array(self.Light_HeatGain.usage_profile)
+				ql = np.round(self._cl * self._ventilation * (hum_ratio_o - hum_ratio_i), 0)
+				self.results['LHG'] = ql.m * np.array(self.Light_HeatGain.usage_profile)
+		with profiler.stage('summary'):
+			self.results.summarize()
+			self.max_hr = self.results.max_hr
+		self.recalculated = tuple(c for c in COLUMNS if c in todo)
 		print('---------- CALCULATED ------------')
 
+	def CalculateVectorized(self) -> None:
+		"""Fills the same results as `Calculate` from the NumPy kernel in `lib._kernel`, all surfaces
+		in one matrix product. Needs the `ZoneSpec` attached by `ZoneSpec.configure`, the per surface pyMEP
+		frames (`solar_irradiance_df`, surface `cooling_load_df`) are left untouched."""
+		with profiler.stage('compile'):
+			z = compile_zone(self.spec)
+		with profiler.stage('kernel'):
+			self.results.data[:, :len(COLUMNS)] = cooling_loads(z).T
+		with profiler.stage('summary'):
+			self.results.summarize()
+			self.max_hr = self.results.max_hr
+
+	def CalculateAnnual(self, **days) -> np.ndarray:
+		"""8760-hour loads of this zone from its `ZoneSpec`, see `lib._sweep.annual_loads` for the per-day `days` arrays.
+		Every zone, `fast` or not, runs the year on the NumPy kernel."""
+		from lib._sweep import annual_loads
+		return annual_loads(compile_zone(self.spec), dtype=self.results.data.dtype, **days)
+
+	def PeakMonth(self, reference: bool = False, **months):
+		"""Overall peak over the twelve monthly design days, see `lib._sweep.peak_month`. Without `months`
+		the monthly taub & taud of the zone's station are used where the station cache has them. The months
+		run together on the NumPy kernel, `reference` calculates them one by one with pyMEP instead."""
+		from lib._sweep import peak_month
+		from lib._stations import stations
+		return peak_month(self.spec, reference, **(months or stations().monthly(self.spec.climatic.Location)))
+
+	# region Report DataFrames, built from `results` on first access
+	@property
+	def external_load_df(self) -> pd.DataFrame:
+		return self.results.frame('external_load_df')
+
+	@property
+	def internal_load_df(self) -> pd.DataFrame:
+		return self.results.frame('internal_load_df')
+
+	@property
+	def ventilation_load_df(self) -> pd.DataFrame:
+		return self.results.frame('ventilation_load_df')
+
+	@property
+	def wall_load_df(self) -> pd.DataFrame:
+		return self.results.frame('wall_load_df')
+
+	@property
+	def window_load_df(self) -> pd.DataFrame:
+		return self.results.frame('window_load_df')
+
+	@property
+	def cooling_load_df(self) -> pd.DataFrame:
+		return self.results.frame('cooling_load_df')
+	#endregion
+
 	# region
 	@property
 	def Oreintation(self) -> Quantity:
@@ -178,15 +223,16 @@ class ComfortZone:
 	def Oreintation(self, v: int) -> None:
 		# ASHRAE Fundamentals 2021, Chapter 14, §14.11 surface azimuth
 		v = -180 if v==180 else v;
+		psi = wall_azimuths(v)
+		if self.fast:
+			self._oreintation = v
+			self.psi = psi
+			return
 		self._oreintation = Q_(v, 'deg')
-		A = 180 - v if v>=0 else -(180+v)
-		self.Wall_A.psi = Q_(A, 'deg')
-		B = 90 - v if v>=-90 else -(270+v)
-		self.Wall_B.psi = Q_(B, 'deg')
-		C = -v
-		self.Wall_C.psi = Q_(C, 'deg')
-		D = -(90 + v) if -180<=v<90 else 270 - v
-		self.Wall_D.psi = Q_(D, 'deg')
+		self.Wall_A.psi = Q_(psi[0], 'deg')
+		self.Wall_B.psi = Q_(psi[1], 'deg')
+		self.Wall_C.psi = Q_(psi[2], 'deg')
+		self.Wall_D.psi = Q_(psi[3], 'deg')
 
 	@property
 	def Ventilation(self) -> Quantity:
@@ -196,8 +242,7 @@ class ComfortZone:
 		# ASHRAE Fundamentals 2021, p18.15 Elevation Correction Examples
 		self._ventilation = v.to('m ** 3/second')
 		h = self.weather_data.altitude.m
-		self._cs = 1230*(1-(h*2.25577*1e-5)) ** 5.2559
-		self._cl = 3010*(1-(h*2.25577*1e-5)) ** 5.2559
+		self._cs, self._cl = air_constants(h)
 
 	@property
 	def Area(self) -> Quantity:
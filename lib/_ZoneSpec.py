@@ -0,0 +1,370 @@
+import json
+import math
+from threading import RLock
+from lib._resource import *
+from lib._stations import stations
+from lib._constructions import ROOFS, WALLS, FLOORS
+
+_HOURLY_USAGE = [0,0,0,0,0,0,0,0,1,1,1,1,0,1,1,1,1,0,0,0,0,0,0,0]
+_HOURLY_PEOPLE = [0,0,0,0,0,0,0,0,10,10,10,10,0,10,10,10,10,0,0,0,0,0,0,0]
+M2_FT2 = 1/0.09290304
+M3_FT3 = 1/0.028316846592
+# pyMEP `Setting` is process-wide, hold this to write it or to configure and calculate a zone from it
+SETTING_LOCK = RLock()
+
+def room_types() -> list:
+	"""Application list of `cmbRTSMRoomType`, sorted so that the index stored in `.rtsm` is stable"""
+	from pyMEP.hvac.lighting import lpd_df
+	return sorted(set(lpd_df['Space Types']))
+
+class _SpecSection:
+	"""A `.rtsm` section, one slot per JSON key. Missing keys keep their default.
+	Numeric keys are stored as plain floats in the unit of `_units`, a pint `Quantity`
+	assigned to one is converted once here so the engine never handles units."""
+	__slots__ = ()
+	_defaults : dict = {}
+	# numeric key -> pint unit of the stored value, None for a plain number
+	_units : dict = {}
+	# keys of 24 hourly values
+	_hourly : tuple = ()
+
+	def __setattr__(self, k: str, v) -> None:
+		if k in self._units and hasattr(v, 'to'):
+			v = float(v.to(self._units[k] or '').m)
+		object.__setattr__(self, k, v)
+
+	def __init__(self, **kwargs) -> None:
+		for k, v in self._defaults.items():
+			setattr(self, k, v.copy() if isinstance(v, list) else v)
+		for k, v in kwargs.items():
+			setattr(self, k, v)
+
+	@classmethod
+	def from_dict(cls, data: dict):
+		section = cls()
+		for k in cls.__slots__:
+			if k in data:
+				v = data[k]
+				setattr(section, k, v.copy() if isinstance(v, list) else v)
+		return section
+
+	def to_dict(self) -> dict:
+		return dict([(k, getattr(self, k)) for k in self.__slots__])
+
+	def validate(self) -> None:
+		"""Raises `ValueError` naming every key that is not a finite number or a 24 hour profile"""
+		errors = []
+		for k in self._units:
+			v = getattr(self, k)
+			if v is None and k.startswith('Option'): continue
+			if isinstance(v, bool) or not isinstance(v, (int, float)) or not math.isfinite(v):
+				errors.append(f'{k} = {v!r}')
+		for k in self._hourly:
+			v = getattr(self, k)
+			if len(v) != 24 or not all(isinstance(x, (int, float)) and math.isfinite(x) for x in v):
+				errors.append(f'{k} is not 24 hourly values')
+		if errors:
+			raise ValueError(f'{type(self).__name__}: ' + ', '.join(errors))
+
+	def __eq__(self, other) -> bool:
+		return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+	def __repr__(self) -> str:
+		return f'{type(self).__name__}({self.to_dict()})'
+
+class ClimaticData(_SpecSection):
+	# WBRange is the mean coincident wet-bulb range, 0 (the default of files without it) keeps the outdoor
+	# humidity ratio constant. The form fills in the station's on a location change, see `StationTable.wb_range`
+	_defaults = dict([('Location', 0), ('Latitude', 13.7264), ('Longtitude', 100.56), ('Altitude', 4),
+					  ('OutsideDB', 36.2), ('DBRange', 7.1), ('OutsideWB', 26.9), ('WBRange', 0.0), ('taub', 0.576), ('taud', 1.984),
+					  ('tz', '+7'), ('Month', 'apr'), ('Name', 'Room1'), ('InsideDB', 25), ('InsideRH', 55), ('SpaceType', 0)])
+	__slots__ = tuple(_defaults)
+	_units = dict([('Latitude', 'deg'), ('Longtitude', 'deg'), ('Altitude', 'm'), ('OutsideDB', 'degC'),
+				   ('DBRange', 'delta_degC'), ('OutsideWB', 'degC'), ('WBRange', 'delta_degC'), ('taub', None), ('taud', None),
+				   ('InsideDB', 'degC'), ('InsideRH', 'percent')])
+
+class ArchitecData(_SpecSection):
+	# Option of a wall is the solar absorptance (external) or the temperature difference (internal),
+	# None takes the pyMEP default `Setting.surface_absorptance` / `Setting.delta_T`
+	_defaults = dict([('Compass', 120), ('ZoneHeight', 3.8), ('ZoneLength', 20.0), ('ZoneWidth', 10.0),
+					  ('RoofType', 0), ('URoof', 1.381), ('FloorType', 0), ('UFloor', 2.562), ('OptionFloor', 6.7),
+					  ('Wall_A', 0), ('UWall_A', 3.647), ('OptionWall_A', None),
+					  ('Wall_B', 0), ('UWall_B', 3.647), ('OptionWall_B', None),
+					  ('Wall_C', 0), ('UWall_C', 3.647), ('OptionWall_C', None),
+					  ('Wall_D', 4), ('UWall_D', 3.647), ('OptionWall_D', None),
+					  ('WinAHigh', 1.5), ('Win_A', 1), ('WinAWidth', 1.0), ('UWin_A', 6.23), ('SCWin_A', 0.96), ('InShaderWin_A', 0), ('ExShaderWin_A', 0),
+					  ('WinBHigh', 0.0), ('Win_B', 0), ('WinBWidth', 0.0), ('UWin_B', 0.0), ('SCWin_B', 0.0), ('InShaderWin_B', 0), ('ExShaderWin_B', 0),
+					  ('WinCHigh', 0.0), ('Win_C', 0), ('WinCWidth', 0.0), ('UWin_C', 0.0), ('SCWin_C', 0.0), ('InShaderWin_C', 0), ('ExShaderWin_C', 0),
+					  ('WinDHigh', 0.0), ('Win_D', 0), ('WinDWidth', 0.0), ('UWin_D', 0.0), ('SCWin_D', 0.0), ('InShaderWin_D', 0), ('ExShaderWin_D', 0)])
+	__slots__ = tuple(_defaults)
+	_units = dict([('Compass', 'deg'), ('ZoneHeight', 'm'), ('ZoneLength', 'm'), ('ZoneWidth', 'm'),
+				   ('URoof', 'W / m ** 2 / delta_degC'), ('UFloor', 'W / m ** 2 / delta_degC'), ('OptionFloor', 'delta_degC')] +
+				  [(f'UWall_{side}', 'W / m ** 2 / delta_degC') for side in 'ABCD'] +
+				  [(f'OptionWall_{side}', None) for side in 'ABCD'] +
+				  [(f'Win{side}{k}', 'm') for side in 'ABCD' for k in ('High', 'Width')] +
+				  [(f'UWin_{side}', 'W / m ** 2 / delta_degC') for side in 'ABCD'] +
+				  [(f'SCWin_{side}', None) for side in 'ABCD'])
+
+	def wall(self, side: str):
+		return WALLS.at(getattr(self, f'Wall_{side}'))
+
+	def window(self, side: str):
+		return windows.get(_window_keys[getattr(self, f'Win_{side}')])
+
+	def window_size(self, side: str) -> tuple:
+		"""(width, height) in m, (0, 0) when the wall carries no window"""
+		w, h = getattr(self, f'Win{side}Width'), getattr(self, f'Win{side}High')
+		if not self.wall(side).isExternal or self.window(side).id == 'None' or w <= 0 or h <= 0:
+			return 0.0, 0.0
+		return w, h
+
+class ApplicationData(_SpecSection):
+	# Values looked up from the pyMEP tables (LPD, people heat rate, Rp/Ra, equipment) are filled by `ZoneSpec.default`
+	_defaults = dict([('RoomType', 0), ('LPD', 0.0), ('LightF_SPACE', 0.0), ('LightF_RAD', 0.0), ('LightingGrid', _HOURLY_USAGE),
+					  ('Activity', 0), ('PeopleSH', 0), ('PeopleLH', 0), ('PeopleF_RAD', 0), ('PeopleGrid', _HOURLY_PEOPLE),
+					  ('Ventilation', 0), ('tbVentilation', 0.0), ('Rp', 0.0), ('Ra', 0.0), ('Ez', 1.0),
+					  ('Equipment', tuple(equipments).index(default_eqp)), ('EquipmentSH', 0.0), ('EquipmentLH', 0.0), ('EquipmentNo', 1)])
+	__slots__ = tuple(_defaults)
+	# Equipment heat rates are W or W/m² depending on `Equipment`, ventilation rates on `Ventilation`
+	_units = dict([('LPD', 'W / m ** 2'), ('LightF_SPACE', None), ('LightF_RAD', None), ('PeopleSH', 'W'), ('PeopleLH', 'W'),
+				   ('PeopleF_RAD', 'percent'), ('tbVentilation', None), ('Rp', None), ('Ra', None), ('Ez', None),
+				   ('EquipmentSH', None), ('EquipmentLH', None), ('EquipmentNo', None)])
+	_hourly = ('LightingGrid', 'PeopleGrid')
+
+_window_keys = tuple(windows)
+_ventilation_keys = tuple(ventilations)
+_equipment_keys = tuple(equipments)
+
+class ZoneSpec:
+	"""Qt-free model of one `.rtsm` project (climate, architecture, application, safety).
+	The GUI is a binding over it; scripts and process pools build zones from it directly."""
+	__slots__ = ('climatic', 'architec', 'application', 'safety', 'out_unit')
+
+	def __init__(self, climatic: ClimaticData = None, architec: ArchitecData = None,
+				 application: ApplicationData = None, safety: int = 5, out_unit: int = 0) -> None:
+		self.climatic = climatic or ClimaticData()
+		self.architec = architec or ArchitecData()
+		self.application = application or ApplicationData()
+		self.safety = safety
+		self.out_unit = out_unit
+
+	# region .rtsm
+	@classmethod
+	def from_dict(cls, data: dict) -> 'ZoneSpec':
+		return cls(ClimaticData.from_dict(data.get('Climatic', {})),
+				   ArchitecData.from_dict(data.get('Architec', {})),
+				   ApplicationData.from_dict(data.get('Application', {})),
+				   data.get('Safety', 5), data.get('OutUnit', 0))
+
+	def to_dict(self) -> dict:
+		return dict([('Climatic', self.climatic.to_dict()),
+					 ('Architec', self.architec.to_dict()),
+					 ('Application', self.application.to_dict()),
+					 ('Safety', self.safety),
+					 ('OutUnit', self.out_unit)])
+
+	@classmethod
+	def load(cls, filename: str) -> 'ZoneSpec':
+		with open(filename, 'r') as file:
+			spec = cls.from_dict(json.load(file))
+		spec.validate()
+		return spec
+
+	def save(self, filename: str) -> None:
+		with open(filename, 'w') as file:
+			file.write(json.dumps(self.to_dict(), indent=4))
+
+	@classmethod
+	def default(cls) -> 'ZoneSpec':
+		"""The project shown when the application starts (Bangkok, 20x10x3.8 m office)"""
+		from pyMEP.hvac.coolingload import Setting
+		from pyMEP.hvac.lighting import LightingPowerDensities
+		from pyMEP.hvac.equipment import EquipmentPowerDensities
+		from pyMEP.hvac.people import human_vrp_df, human_hr_df, HumanHeatRate
+		spec = cls()
+		app = spec.application
+		types = room_types()
+		app.RoomType = types.index('Office')
+		app.LPD = LightingPowerDensities(space_type='Office')
+		app.LightF_SPACE = Setting.Lighting_F_space
+		app.LightF_RAD = Setting.Lighting_F_rad
+		app.PeopleSH, app.PeopleLH, app.PeopleF_RAD = HumanHeatRate(activity=human_hr_df['Degree of Activity'].tolist()[0])[:3]
+		vrp = human_vrp_df[human_vrp_df['Space Types'].str.match('Office')]
+		app.Rp, app.Ra = vrp['Rp'].values[0], vrp['Ra'].values[0]
+		app.EquipmentSH = EquipmentPowerDensities(space_type='Office')
+		return spec
+	# endregion
+
+	def validate(self) -> None:
+		"""Checks every value entering the engine once, raises `ValueError`"""
+		for section in (self.climatic, self.architec, self.application):
+			section.validate()
+		architec = self.architec
+		errors = [f'{k} = {getattr(architec, k)!r} must be > 0' for k in ('ZoneHeight', 'ZoneLength', 'ZoneWidth') if getattr(architec, k) <= 0]
+		if not -90 <= self.climatic.Latitude <= 90:
+			errors.append(f'Latitude = {self.climatic.Latitude!r} out of -90..90')
+		if not 0 <= self.climatic.Location < len(stations()):
+			errors.append(f'Location = {self.climatic.Location!r} is not a station')
+		if not 0 <= self.climatic.InsideRH <= 100:
+			errors.append(f'InsideRH = {self.climatic.InsideRH!r} out of 0..100')
+		if isinstance(self.safety, bool) or not isinstance(self.safety, (int, float)):
+			errors.append(f'Safety = {self.safety!r}')
+		if errors:
+			raise ValueError('ZoneSpec: ' + ', '.join(errors))
+
+	def __eq__(self, other) -> bool:
+		return isinstance(other, ZoneSpec) and self.to_dict() == other.to_dict()
+
+	def copy(self) -> 'ZoneSpec':
+		return ZoneSpec.from_dict(self.to_dict())
+
+	# region Derived inputs
+	@property
+	def location(self):
+		return stations()[self.climatic.Location]
+
+	@property
+	def Area(self) -> float:
+		"""Floor area, m²"""
+		return self.architec.ZoneWidth * self.architec.ZoneLength
+
+	@property
+	def ventilation_mode(self) -> str:
+		return _ventilation_keys[self.application.Ventilation]
+
+	@property
+	def is_generic_equipment(self) -> bool:
+		return _equipment_keys[self.application.Equipment] == default_eqp
+
+	def ventilation_cfm(self) -> float:
+		"""Outdoor air flow (cfm) according to the selected ventilation method"""
+		app = self.application
+		value = app.tbVentilation
+		match self.ventilation_mode:
+			case 'ASHRAE 62.1':
+				return (app.Rp * max(app.PeopleGrid) + app.Ra * self.Area * M2_FT2)/app.Ez
+			case 'cfm/Person':
+				return max(app.PeopleGrid) * value
+			case 'cfm/ft²':
+				return self.Area * M2_FT2 * value
+			case 'Air Change':
+				return self.Area * self.architec.ZoneHeight * M3_FT3 * value/60
+		return value
+	# endregion
+
+	def configure(self, zone) -> None:
+		"""Applies the whole spec to a `ComfortZone` and its `weather_data`, ready for `Calculate`.
+		A `fast` zone only takes its geometry as plain floats, the kernel reads the rest from the spec.
+		The zone's `Calculate` reads the `Setting` written here, hold `SETTING_LOCK` over both."""
+		self.validate()
+		climatic, architec, app = self.climatic, self.architec, self.application
+		zone.spec = self
+		if zone.fast:
+			zone.ID = climatic.Name
+			zone.SpaceType = climatic.SpaceType
+			zone.Oreintation = architec.Compass
+			zone.Width, zone.Length, zone.Height = architec.ZoneWidth, architec.ZoneLength, architec.ZoneHeight
+			zone.safety = self.safety/100
+			return
+		from pyMEP import Quantity as Q_
+		from pyMEP.hvac.climatic import ReferenceDates
+		from pyMEP.hvac.coolingload import Setting
+		from pyMEP.hvac.external_heat_gains import Wall
+
+		weather = zone.weather_data
+		weather.ID = self.location.Location
+		weather.fi = Q_(climatic.Latitude, 'deg')
+		weather.L_loc = Q_(climatic.Longtitude, 'deg')
+		weather.altitude = Q_(climatic.Altitude, 'm')
+		weather.T_db_des = Q_(climatic.OutsideDB, 'degC')
+		weather.T_db_rng = Q_(climatic.DBRange, 'delta_degC')
+		weather.T_wb_mc = Q_(climatic.OutsideWB, 'degC')
+		weather.taub = climatic.taub
+		weather.taud = climatic.taud
+		weather.tz = int(climatic.tz)
+		weather.date = ReferenceDates.get_date_for(climatic.Month)
+
+		zone.ID = climatic.Name
+		Setting.Inside_DB = Q_(climatic.InsideDB, 'degC')
+		Setting.Inside_RH = climatic.InsideRH/100
+		zone.T_wb_rng = climatic.WBRange
+		zone.SpaceType = climatic.SpaceType
+		zone.Oreintation = architec.Compass
+		zone.Width = Q_(architec.ZoneWidth, 'm')
+		zone.Length = Q_(architec.ZoneLength, 'm')
+		zone.Height = Q_(architec.ZoneHeight, 'm')
+
+		# region Roof & Floor
+		zone.Roof.weather_data = weather
+		zone.Roof.net_area = zone.Area
+		zone.Roof.U = architec.URoof
+		zone.Roof.CTS = ROOFS.at(architec.RoofType).CTS.copy()
+
+		zone.Floor.weather_data = weather
+		zone.Floor.net_area = zone.Area
+		zone.Floor.U = architec.UFloor
+		zone.Floor.CTS = FLOORS.at(architec.FloorType).CTS.copy()
+		zone.Floor.delta_T = Q_(architec.OptionFloor, 'delta_degC')
+		# endregion
+
+		# region Walls
+		for side, length in (('A', zone.Length), ('B', zone.Width), ('C', zone.Length), ('D', zone.Width)):
+			wall = getattr(zone, f'Wall_{side}')
+			construction = architec.wall(side)
+			option = getattr(architec, f'OptionWall_{side}')
+			wall.weather_data = weather
+			wall.net_area = zone.Height * length
+			wall.U = getattr(architec, f'UWall_{side}')
+			wall.CTS = construction.CTS.copy()
+			wall.wall_type = Wall.WallType.External if construction.isExternal else Wall.WallType.Internal
+			wall.clear_window()
+			if construction.isExternal:
+				wall.surface_absorptance = Setting.surface_absorptance if option is None else option
+				win_w, win_h = architec.window_size(side)
+				if win_w>0 and win_h>0:
+					window = architec.window(side)
+					wall.add_window(id=f'Win-{side}', width=Q_(win_w, 'm'), height=Q_(win_h, 'm'),
+									U=getattr(architec, f'UWin_{side}'), SC=getattr(architec, f'SCWin_{side}'))
+					win = wall.windows.get(f'Win-{side}')
+					win.SHGCd = [window.SHGCd0, window.SHGCd4, window.SHGCd5, window.SHGCd6, window.SHGCd7, window.SHGCd8, 0]
+					win.SHGCh = window.SHGCh
+			else:
+				wall.delta_T = Setting.delta_T if option is None else Q_(option, 'delta_degC')
+		# endregion
+
+		zone_light = zone.Light_HeatGain.get_lighting('ls0')
+		zone_light.power_density = Q_(app.LPD, 'W / m ** 2')
+		zone_light.A_floor = zone.Area
+		zone_light.F_space = Q_(app.LightF_SPACE,'').to('%')
+		zone_light.F_rad = Q_(app.LightF_RAD,'').to('%')
+		zone.Light_HeatGain.UpdateUsageProfile(app.LightingGrid)
+
+		zone.People_HeatGain.occupants.Q_dot_sen_person = Q_(app.PeopleSH, 'W')
+		zone.People_HeatGain.occupants.Q_dot_lat_person = Q_(app.PeopleLH, 'W')
+		zone.People_HeatGain.occupants.F_rad = Q_(app.PeopleF_RAD, '%')
+		zone.People_HeatGain.UpdateUsageProfile(app.PeopleGrid)
+
+		zone.Ventilation = Q_(self.ventilation_cfm(), 'cubic_foot/minute')
+
+		zone_equipment = zone.Equipment_HeatGain.get_equipment('eqp0')
+		eqp_sen, eqp_lat = app.EquipmentSH, app.EquipmentLH
+		if self.is_generic_equipment:
+			eqp_sen, eqp_lat = self.Area * eqp_sen, self.Area * eqp_lat
+		zone_equipment.F_rad = Q_(Setting.Equipment_Generic_F_rad * 100, '%')
+		zone_equipment.Q_dot_sen_pcs = Q_(eqp_sen, 'W') * app.EquipmentNo
+		zone_equipment.Q_dot_lat_pcs = Q_(eqp_lat, 'W') * app.EquipmentNo
+		zone.Equipment_HeatGain.UpdateUsageProfile(app.LightingGrid)
+		zone.safety = Q_(self.safety,'%')
+
+	def new_zone(self, fast: bool = False):
+		"""A fresh `ComfortZone` with its own `WeatherData`, configured from this spec.
+		A `fast` zone skips the pyMEP objects and pint quantities, see `ComfortZone`."""
+		from lib._ThermalComfort import ComfortZone
+		if fast:
+			zone = ComfortZone(self.climatic.Name, weather=None, fast=True)
+			self.configure(zone)
+			return zone
+		from pyMEP.hvac.climatic import WeatherData
+		zone = ComfortZone(self.climatic.Name, weather=WeatherData())
+		self.configure(zone)
+		return zone
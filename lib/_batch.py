@@ -0,0 +1,102 @@
+import sys
+from os import cpu_count, devnull
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from lib._ZoneSpec import ZoneSpec, SETTING_LOCK
+from lib._results import ZoneResults
+from lib._profile import profiler
+
+# Load components reported at the zone peak hour, all in Watt
+COMPONENTS = ('Roof', 'Ceiling', 'Floor', 'Wall-A', 'Wall-B', 'Wall-C', 'Wall-D', 'Win-A', 'Win-B', 'Win-C', 'Win-D',
+			  'Lighting', 'People', 'Equipment', 'Ventilation')
+ZoneResult = namedtuple('ZoneResult', ['File', 'ID', 'Peak_Hr', 'Components', 'Cooling_Load', 'Safety', 'Total', 'Error'])
+
+def _result(filename: str, ID: str, results: ZoneResults, safety: float) -> ZoneResult:
+	i = results.max_hr[0]
+	components = dict([(c, float(results[c][i])) for c in COMPONENTS[:-1]])
+	components['Ventilation'] = float(results['ventilation'][i])
+	cooling_load = float(results['TOTAL_CL'][i])
+	safety = cooling_load * safety
+	return ZoneResult(filename, ID, i, components, cooling_load, safety, cooling_load + safety, None)
+
+def summarize(zone: 'ComfortZone', filename: str = '') -> ZoneResult:
+	"""Peak hour, component breakdown and total load (Watt) of a calculated zone"""
+	return _result(filename, zone.ID, zone.results, zone.safety if zone.fast else zone.safety.to('').m)
+
+def calculate_file(filename: str, fast: bool = False) -> ZoneResult:
+	try:
+		spec = ZoneSpec.load(filename)
+		with SETTING_LOCK:
+			zone = spec.new_zone(fast)
+			zone.Calculate()
+		return summarize(zone, filename)
+	except Exception as e:
+		return ZoneResult(filename, None, None, {}, None, None, None, f'{type(e).__name__}: {e}')
+
+def calculate_files(filenames: list, fast: bool = False) -> list:
+	"""Same as `calculate_file` for a list of files. With `fast` the zones are stacked and calculated
+	together by the NumPy kernel (`lib._kernel`) in one matrix product, until the kernel is checked
+	against the pyMEP golden results (`bench.golden`) that is opt-in."""
+	if not fast:
+		return [calculate_file(f) for f in filenames]
+	from lib._kernel import compile_zone, cooling_loads, stack
+	results, compiled = [], []
+	for filename in filenames:
+		try:
+			with profiler.stage('load'):
+				spec = ZoneSpec.load(filename)
+			with profiler.stage('compile'):
+				compiled.append((len(results), compile_zone(spec)))
+			results.append((filename, spec))
+		except Exception as e:
+			results.append(ZoneResult(filename, None, None, {}, None, None, None, f'{type(e).__name__}: {e}'))
+	if compiled:
+		with profiler.stage('kernel'):
+			loads = cooling_loads(stack([z for _, z in compiled]))
+		with profiler.stage('summary'):
+			for (k, _), load in zip(compiled, loads):
+				filename, spec = results[k]
+				results[k] = _result(filename, spec.climatic.Name, ZoneResults.from_loads(load), spec.safety/100)
+	return results
+
+def _init_worker(quiet: bool, profile: bool = False) -> None:
+	# ComfortZone.Calculate reports on stdout, thousands of zones are not worth the console I/O
+	if quiet: sys.stdout = open(devnull, 'w')
+	profiler.enable(profile)
+
+def _profiled(calculate, arg) -> tuple:
+	"""Result of a worker with the stage timings it took, merged into the parent's `profiler`"""
+	return calculate(arg), profiler.take()
+
+def _map(executor, calculate, args, chunksize: int = 1) -> list:
+	if not profiler.enabled:
+		return list(executor.map(calculate, args, chunksize=chunksize))
+	results = []
+	for result, stats in executor.map(partial(_profiled, calculate), args, chunksize=chunksize):
+		profiler.merge(stats)
+		results.append(result)
+	return results
+
+def run_batch(filenames: list, max_workers: int = None, chunksize: int = None, quiet: bool = True, vectorized: bool = False) -> list:
+	"""Calculates every `.rtsm` file across a process pool, results keep the input order.
+	A file which fails to load or calculate returns a `ZoneResult` carrying the `Error`
+	instead of stopping the whole batch. With `vectorized` each chunk of zones goes through
+	`calculate_files(fast=True)` as one stacked kernel call instead of the per surface pyMEP `Calculate`.
+	While `lib._profile.profiler` is enabled the stage timings of the workers are merged into it."""
+	filenames = list(filenames)
+	if not filenames: return []
+	max_workers = min(max_workers or cpu_count() or 1, len(filenames))
+	# a few chunks per worker keeps the pool busy without paying IPC per zone
+	chunksize = chunksize or max(1, len(filenames) // (max_workers * 4))
+	if vectorized:
+		chunks = [filenames[i:i + chunksize] for i in range(0, len(filenames), chunksize)]
+		stacked = partial(calculate_files, fast=True)
+		if max_workers == 1:
+			return [r for chunk in chunks for r in stacked(chunk)]
+		with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(quiet, profiler.enabled)) as executor:
+			return [r for results in _map(executor, stacked, chunks) for r in results]
+	if max_workers == 1:
+		return [calculate_file(f) for f in filenames]
+	with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(quiet, profiler.enabled)) as executor:
+		return _map(executor, calculate_file, filenames, chunksize)
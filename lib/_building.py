@@ -0,0 +1,132 @@
+import numpy as np
+from collections import namedtuple
+from itertools import islice
+from lib._kernel import COLUMNS as LOADS, compile_zone, cooling_loads, stack
+from lib._results import COLUMNS, INDEX, ZoneResults, summarize
+from lib._ZoneSpec import ClimaticData, SETTING_LOCK
+
+# Peak of one zone within the block, Watt
+ZonePeak = namedtuple('ZonePeak', ['ID', 'Peak_Hr', 'Peak'])
+# Block load of a building, Watt. `Hourly` is the 24 x len(COLUMNS) sum over all zones,
+# `Diversity` the coincident peak over the sum of the individual zone peaks
+BlockLoad = namedtuple('BlockLoad', ['Peak_Hr', 'Block', 'Sum_of_Peaks', 'Diversity', 'Hourly', 'Zones'])
+
+_TOTAL = INDEX['TOTAL_CL']
+# ClimaticData keys of the site and design day, the same for every zone of a building
+SITE = ('Location', 'Latitude', 'Longtitude', 'Altitude', 'tz', 'Month', 'OutsideDB', 'DBRange', 'OutsideWB', 'WBRange', 'taub', 'taud')
+
+def _chunks(iterable, size: int):
+	iterator = iter(iterable)
+	while chunk := list(islice(iterator, size)):
+		yield chunk
+
+def _hourly(zones: list, dtype) -> np.ndarray:
+	"""zones x 24 x len(COLUMNS) loads of a chunk. The `fast` zones are stacked into one kernel call,
+	the others run their own `Calculate`"""
+	hourly = np.zeros((len(zones), 24, len(COLUMNS)), dtype=dtype)
+	compiled = [(i, compile_zone(zone.spec)) for i, zone in enumerate(zones) if zone.fast]
+	if compiled:
+		index = [i for i, _ in compiled]
+		hourly[index, :, :len(LOADS)] = np.swapaxes(cooling_loads(stack([z for _, z in compiled])), -1, -2)
+		hourly[index] = summarize(hourly[index])
+	for i, zone in enumerate(zones):
+		if not zone.fast:
+			# the pyMEP `Setting` holds the inside conditions of the zone configured last
+			with SETTING_LOCK:
+				if zone.spec is not None:
+					zone.spec.configure(zone)
+				zone.Calculate()
+			hourly[i] = zone.results.data
+	return hourly
+
+def block_load(zones, chunksize: int = 256, keep: bool = False, dtype=np.float64) -> BlockLoad:
+	"""Coincident block load of `ComfortZone`s, ASHRAE Fundamentals 2021, Chapter 18, §18.2 block load.
+	`zones` may be any iterable, a generator included, it is consumed `chunksize` zones at a time and only
+	the running 24-hour sum and each zone's peak are kept, so memory does not grow with the building.
+	With `keep` the `results` of the fast zones are filled as well, as their own `Calculate` would."""
+	total = np.zeros((24, len(COLUMNS)), dtype=dtype)
+	peaks = []
+	for chunk in _chunks(zones, chunksize):
+		hourly = _hourly(chunk, dtype)
+		total += hourly.sum(axis=0)
+		total_cl = hourly[..., _TOTAL]
+		for i, (zone, hr, peak) in enumerate(zip(chunk, total_cl.argmax(axis=1).tolist(), total_cl.max(axis=1).tolist())):
+			peaks.append(ZonePeak(zone.ID, hr, peak))
+			if keep and zone.fast:
+				zone.results.data[:] = hourly[i]
+				zone.results.summarize()
+				zone.max_hr = zone.results.max_hr
+	hr = int(total[:, _TOTAL].argmax())
+	block = float(total[hr, _TOTAL])
+	sum_of_peaks = float(sum(p.Peak for p in peaks))
+	return BlockLoad(hr, block, sum_of_peaks, block / sum_of_peaks if sum_of_peaks else 1.0, total, peaks)
+
+class Building:
+	"""Many `ComfortZone`s of one building on one site and design day. The building's `ClimaticData`
+	replaces the `SITE` keys of every zone's spec, so fast and pyMEP zones see the same climate, and
+	the pyMEP zones share one `WeatherData`. `Calculate` reports the block load, the peak of the summed
+	zone profiles against the sum of each zone's own peak."""
+
+	def __init__(self, climatic: ClimaticData, chunksize: int = 256, dtype=np.float64) -> None:
+		self.climatic = climatic
+		self.weather_data = None
+		self.chunksize = chunksize
+		self.dtype = dtype
+		self.zones : list = []
+		self.block : BlockLoad = None
+
+	def __len__(self) -> int:
+		return len(self.zones)
+
+	def __iter__(self):
+		return iter(self.zones)
+
+	def on_site(self, spec):
+		"""A copy of a `ZoneSpec` at the building's site and design day"""
+		spec = spec.copy()
+		for k in SITE:
+			setattr(spec.climatic, k, getattr(self.climatic, k))
+		return spec
+
+	def _weather(self):
+		# created with the first pyMEP zone, fast zones have no weather object. Fast zones still need pyMEP,
+		# `ComfortZone` and `compile_zone` read its `Setting`, RTS tables and reference dates
+		if self.weather_data is None:
+			from pyMEP.hvac.climatic import WeatherData
+			self.weather_data = WeatherData()
+		return self.weather_data
+
+	def add_zone(self, zone) -> None:
+		"""Adds a `ComfortZone`, a configured one is moved onto the building's site"""
+		if zone.spec is not None:
+			zone.spec = self.on_site(zone.spec)
+		if not zone.fast:
+			zone.weather_data = self._weather()
+			if zone.spec is not None:
+				with SETTING_LOCK:
+					zone.spec.configure(zone)
+		self.zones.append(zone)
+
+	def add_spec(self, spec, fast: bool = False):
+		"""A zone configured from `spec` at the building's site, `fast` zones run the NumPy kernel"""
+		from lib._ThermalComfort import ComfortZone
+		zone = ComfortZone(spec.climatic.Name, weather=None if fast else self._weather(), dtype=self.dtype, fast=fast)
+		with SETTING_LOCK:
+			self.on_site(spec).configure(zone)
+		self.zones.append(zone)
+		return zone
+
+	def Calculate(self, keep: bool = False) -> BlockLoad:
+		self.block = block_load(self.zones, self.chunksize, keep, self.dtype)
+		return self.block
+
+	@property
+	def max_hr(self) -> int:
+		return self.block.Peak_Hr
+
+	@property
+	def results(self) -> ZoneResults:
+		"""Summed hourly loads of all zones as `ZoneResults`, for the zone reports"""
+		results = ZoneResults(self.dtype)
+		results.data[:] = self.block.Hourly
+		return results
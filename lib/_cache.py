@@ -0,0 +1,94 @@
+import copy
+import numpy as np
+from collections import OrderedDict
+from itertools import product
+from threading import Lock
+from types import MappingProxyType
+
+_rts_table : dict = None
+# Weather snapshots kept by `update_weather`, least recently used is dropped first
+WEATHER_CACHE_SIZE = 64
+_weather_cache = OrderedDict()
+# the calculation worker thread and the GUI thread both update weather
+_weather_lock = Lock()
+
+def _readonly(values) -> np.ndarray:
+	a = np.array(values, dtype=float)
+	a.flags.writeable = False
+	return a
+
+def _rts_key(nrts: bool, zones: str, room_construction: str, carpet: str, glass: str) -> tuple:
+	return (bool(nrts), zones if nrts else '', str(room_construction), str(carpet), str(glass))
+
+def build_rts_table() -> dict:
+	"""Every RTS of the pyMEP tables, ASHRAE Fundamentals 2021, Chapter 18, Tables 19 & 20"""
+	from pyMEP.hvac.coolingload import RTS
+	table = {}
+	for room, carpet, glass in product(RTS.Room_construction, RTS.Carpet, RTS.Glass):
+		for zones in ('Exterior', 'Interior'):
+			table[_rts_key(True, zones, room, carpet, glass)] = _readonly(
+				RTS.rts_values(nrts=True, zones=zones, room_construction=room, carpet=carpet, glass=glass))
+		table[_rts_key(False, '', room, carpet, glass)] = _readonly(
+			RTS.rts_values(nrts=False, room_construction=room, carpet=carpet, glass=glass))
+	return table
+
+def rts_table() -> dict:
+	"""Process-wide RTS table, built once from pyMEP"""
+	global _rts_table
+	if _rts_table is None:
+		_rts_table = build_rts_table()
+	return _rts_table
+
+def rts_values(nrts: bool, zones: str = 'Exterior', room_construction: str = None, carpet: str = None, glass: str = None) -> np.ndarray:
+	"""Cached `RTS.rts_values` as a read-only array of 24 factors in %, the arguments default to `Setting.NRTS_*`.
+	The array is shared by every caller, hand pyMEP objects which keep or modify it a `.copy()`."""
+	if room_construction is None or carpet is None or glass is None:
+		from pyMEP.hvac.coolingload import Setting
+		room_construction = Setting.NRTS_Room_construction if room_construction is None else room_construction
+		carpet = Setting.NRTS_Carpet if carpet is None else carpet
+		glass = Setting.NRTS_Glass if glass is None else glass
+	key = _rts_key(nrts, zones, room_construction, carpet, glass)
+	table = rts_table()
+	values = table.get(key)
+	if values is None:
+		# a combination outside the pyMEP lists, looked up once and kept
+		from pyMEP.hvac.coolingload import RTS
+		if nrts:
+			values = RTS.rts_values(nrts=True, zones=zones, room_construction=room_construction, carpet=carpet, glass=glass)
+		else:
+			values = RTS.rts_values(nrts=False, room_construction=room_construction, carpet=carpet, glass=glass)
+		values = table[key] = _readonly(values)
+	return values
+
+def _magnitude(v) -> float:
+	return float(getattr(v, 'm', v))
+
+def weather_key(weather) -> tuple:
+	"""(fi, L_loc, tz, date, taub, taud, T_db_des, T_db_rng, altitude) of a `WeatherData`, the site and design day"""
+	return (_magnitude(weather.fi), _magnitude(weather.L_loc), _magnitude(weather.tz), weather.date,
+			_magnitude(weather.taub), _magnitude(weather.taud), _magnitude(weather.T_db_des),
+			_magnitude(weather.T_db_rng), _magnitude(weather.altitude))
+
+def update_weather(weather) -> None:
+	"""`update_sun_position` and `synthetic_daily_db_profiles` of a `WeatherData`. The attributes they
+	set (`position_df`, `T_db_prof`, `declination`, ...) are kept as a snapshot per `weather_key`, so
+	zones at the same site and design day share one calculation. The snapshot is a deep copy and every
+	`WeatherData` gets its own copy of it, the DataFrames and lists are never shared between instances."""
+	key = weather_key(weather)
+	with _weather_lock:
+		snapshot = _weather_cache.get(key)
+		if snapshot is None:
+			before = dict(vars(weather))
+			weather.update_sun_position()
+			weather.synthetic_daily_db_profiles()
+			snapshot = MappingProxyType(copy.deepcopy(dict([(k, v) for k, v in vars(weather).items() if k not in before or before[k] is not v])))
+			_weather_cache[key] = snapshot
+			if len(_weather_cache) > WEATHER_CACHE_SIZE:
+				_weather_cache.popitem(last=False)
+		else:
+			_weather_cache.move_to_end(key)
+			vars(weather).update(copy.deepcopy(dict(snapshot)))
+
+def clear_weather_cache() -> None:
+	with _weather_lock:
+		_weather_cache.clear()
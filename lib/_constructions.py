@@ -0,0 +1,88 @@
+import json
+import numpy as np
+from collections import namedtuple
+from collections.abc import Mapping
+from os import listdir, path
+from lib import _resource
+
+CONSTRUCTIONS_DIR = path.join(path.dirname(path.dirname(path.abspath(__file__))), 'res', 'constructions')
+CTS_TOLERANCE = 0.1		# %, the published CTS are rounded to 2 decimals
+_LAG = (np.arange(24)[:, None] - np.arange(24)[None, :]) % 24
+# `_CTS` of lib._resource with the CTS as a read-only array and its read-only 24 x 24 circulant, both shared,
+# hand pyMEP objects a `.copy()` of the CTS
+Construction = namedtuple('Construction', ['id', 'U', 'CTS', 'isExternal', 'Description', 'matrix'])
+
+def _readonly(a: np.ndarray) -> np.ndarray:
+	a.flags.writeable = False
+	return a
+
+def validate_cts(id: str, cts) -> np.ndarray:
+	"""The 24 conduction time series factors (%) as an array, ValueError unless they are
+	non-negative and sum to 100%, ASHRAE Fundamentals 2021, Chapter 18, §18.37"""
+	a = np.asarray(cts, float)
+	if a.shape != (24,):
+		raise ValueError(f'{id}: CTS needs 24 factors, got {a.shape}')
+	if (a < 0).any():
+		raise ValueError(f'{id}: negative CTS factor')
+	if abs(a.sum() - 100) > CTS_TOLERANCE:
+		raise ValueError(f'{id}: CTS sums to {a.sum():.2f}%, not 100%')
+	return a
+
+def compile_construction(c) -> Construction:
+	"""Validated `Construction` of a `_CTS`, conduction of a 24-hour heat input q is `matrix @ q`"""
+	cts = _readonly(validate_cts(c.id, c.CTS))
+	return Construction(c.id, float(c.U), cts, bool(c.isExternal), c.Description, _readonly(cts[_LAG] / 100))
+
+class ConstructionLibrary(Mapping):
+	"""Constructions of one kind by id, the built-in ones of lib._resource first, then the user files
+	`<directory>/<id>.json` holding the `_CTS` fields. Files are only listed until an id is looked up,
+	each construction is validated and compiled once on first use."""
+
+	def __init__(self, builtin: dict, directory: str) -> None:
+		self.builtin = builtin
+		self.directory = directory
+		self._ids = None
+		self._compiled = {}
+
+	def ids(self) -> tuple:
+		if self._ids is None:
+			files = sorted(f[:-5] for f in listdir(self.directory) if f.endswith('.json')) if path.isdir(self.directory) else []
+			self._ids = tuple(self.builtin) + tuple(f for f in files if f not in self.builtin)
+		return self._ids
+
+	def _load(self, id: str) -> Construction:
+		if id in self.builtin:
+			return compile_construction(self.builtin[id])
+		with open(path.join(self.directory, f'{id}.json'), encoding='utf-8') as f:
+			data = json.load(f)
+		return compile_construction(_resource._CTS(id, data['U'], data['CTS'], data['isExternal'], data.get('Description', id)))
+
+	def __getitem__(self, id: str) -> Construction:
+		c = self._compiled.get(id)
+		if c is None:
+			if id not in self.builtin and id not in self.ids():
+				raise KeyError(id)
+			c = self._compiled[id] = self._load(id)
+		return c
+
+	def __iter__(self):
+		return iter(self.ids())
+
+	def __len__(self) -> int:
+		return len(self.ids())
+
+	def __contains__(self, id) -> bool:
+		return id in self.builtin or id in self.ids()
+
+	def at(self, index: int) -> Construction:
+		"""Construction by its position, the `.rtsm` files store the combo box index"""
+		return self[self.ids()[index]]
+
+	def refresh(self) -> None:
+		"""Forgets the listed files and compiled constructions, after the user files changed"""
+		self._ids = None
+		self._compiled.clear()
+
+ROOFS = ConstructionLibrary(_resource.roofs, path.join(CONSTRUCTIONS_DIR, 'roofs'))
+WALLS = ConstructionLibrary(_resource.walls, path.join(CONSTRUCTIONS_DIR, 'walls'))
+FLOORS = ConstructionLibrary(_resource.floors, path.join(CONSTRUCTIONS_DIR, 'floors'))
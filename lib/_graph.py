@@ -0,0 +1,154 @@
+from lib._kernel import COLUMNS
+from lib._results import ZoneResults
+from lib._ZoneSpec import SETTING_LOCK
+
+# Calculation stages and the stages each one feeds
+EDGES = {'weather'		: ('gains',),
+		 'solar'		: ('gains',),
+		 'gains'		: ('rts',),
+		 'rts'			: ('summary',),
+		 'summary'		: ('presentation',),
+		 'presentation'	: ()}
+STAGES = tuple(EDGES)
+
+_INDEX = dict([(c, i) for i, c in enumerate(COLUMNS)])
+ALL = frozenset(range(len(COLUMNS)))
+VENTILATION = frozenset([_INDEX['SHG'], _INDEX['LHG']])
+INTERNALS = frozenset([_INDEX['Lighting'], _INDEX['People'], _INDEX['Equipment']]) | VENTILATION
+ROOF = frozenset([_INDEX['Roof']])
+FLOOR = frozenset([_INDEX['Floor'], _INDEX['Ceiling']])
+WALLS = frozenset([_INDEX[f'{k}-{side}'] for k in ('Wall', 'Win') for side in 'ABCD'])
+_SITE = ('Location', 'Latitude', 'Longtitude', 'tz', 'Month', 'taub', 'taud')
+_OUTDOOR = ('OutsideDB', 'DBRange', 'InsideDB')
+_PSYCHRO = ('OutsideWB', 'WBRange', 'InsideRH', 'Altitude')
+
+def _side(key: str) -> frozenset:
+	"""Wall-X and Win-X rows of a per-side Architec key (Wall_A, UWin_B, WinCHigh, ...)"""
+	side = key[-1] if key[-2] == '_' else key[3]
+	return frozenset([_INDEX[f'Wall-{side}'], _INDEX[f'Win-{side}']])
+
+def affected(section: str, key: str) -> tuple:
+	"""(first dirty stage, dirty rows of `COLUMNS`) when `key` of a `.rtsm` section changes"""
+	match section:
+		case 'Safety' | 'OutUnit':
+			return 'presentation', frozenset()
+		case 'Climatic':
+			if key in _SITE: return 'solar', ALL
+			if key in _OUTDOOR: return 'weather', ALL
+			if key in _PSYCHRO: return 'gains', VENTILATION
+			if key == 'SpaceType': return 'gains', ROOF | FLOOR
+			if key == 'Name': return 'presentation', frozenset()
+		case 'Architec':
+			if key == 'Compass': return 'solar', WALLS
+			if key in ('RoofType', 'URoof'): return 'gains', ROOF
+			if key in ('FloorType', 'UFloor', 'OptionFloor'): return 'gains', FLOOR
+			# Air Change ventilation scales with the zone volume
+			if key == 'ZoneHeight': return 'gains', WALLS | VENTILATION
+			if key.startswith(('Wall_', 'UWall_', 'OptionWall_', 'Win', 'UWin_', 'SCWin_', 'InShaderWin_', 'ExShaderWin_')):
+				return 'gains', _side(key)
+		case 'Application':
+			return 'gains', INTERNALS
+		case 'Setting':
+			return 'gains', ALL
+	return 'weather', ALL
+
+def settings() -> dict:
+	"""pyMEP `Setting` values the calculation reads besides the `.rtsm` project"""
+	from pyMEP.hvac.coolingload import Setting
+	with SETTING_LOCK:
+		return dict([(k, str(getattr(Setting, k))) for k in ('NRTS_Room_construction', 'NRTS_Carpet', 'NRTS_Glass',
+					 'surface_absorptance', 'delta_T', 'Equipment_Generic_F_rad')])
+
+def state(spec) -> dict:
+	"""Flat {(section, key): value} of everything a zone calculation depends on"""
+	data = spec.to_dict()
+	data['Setting'] = settings()
+	flat = {}
+	for section, values in data.items():
+		if isinstance(values, dict):
+			flat.update([((section, k), v) for k, v in values.items()])
+		else:
+			flat[(section, None)] = values
+	return flat
+
+class DependencyGraph:
+	"""Dirty flags over `EDGES`. Invalidating a stage dirties everything downstream of it,
+	the gains and RTS stages also track which rows of `COLUMNS` need recomputing."""
+
+	def __init__(self, edges: dict = EDGES) -> None:
+		self.edges = edges
+		self.dirty = set(edges)
+		self.rows = set(ALL)
+
+	def invalidate(self, stage: str, rows=ALL) -> None:
+		self.rows.update(rows)
+		pending = [stage]
+		while pending:
+			stage = pending.pop()
+			self.dirty.add(stage)
+			pending.extend(self.edges[stage])
+
+	def update(self, old: dict, new: dict) -> None:
+		"""Invalidates the stages of every key that differs between two `state` dicts"""
+		for k in old.keys() | new.keys():
+			if old.get(k) != new.get(k):
+				self.invalidate(*affected(*k))
+
+	def clean(self, *stages: str) -> None:
+		self.dirty.difference_update(stages)
+		if 'rts' not in self.dirty:
+			self.rows.clear()
+
+def dirty_stages(old: dict, new: dict) -> set:
+	"""Stages a change from one `state` to another makes dirty"""
+	graph = DependencyGraph()
+	graph.clean(*STAGES)
+	graph.update(old, new)
+	return graph.dirty
+
+class IncrementalZone:
+	"""One pyMEP `ComfortZone` kept between calculations. After `update` with an edited spec, `calculate`
+	reruns only the dirty rows of `ComfortZone.Calculate`: a wall edit redoes that wall's and window's
+	rows and the totals, a safety or unit change recalculates nothing."""
+
+	def __init__(self) -> None:
+		self.graph = DependencyGraph()
+		self.zone = None
+		self.spec = None
+		# the per surface pyMEP frames of the rows the last runs skipped are out of date
+		self.partial = False
+		self._state = None
+
+	def update(self, spec, zone_state: dict = None) -> None:
+		"""Takes an edited spec, `zone_state` is its `state` when the caller already has it"""
+		new = state(spec) if zone_state is None else zone_state
+		if self._state is None:
+			self.graph.invalidate('weather')
+		else:
+			self.graph.update(self._state, new)
+		self._state = new
+		self.spec = spec.copy()
+
+	@property
+	def results(self) -> ZoneResults:
+		return self.zone.results
+
+	@property
+	def max_hr(self) -> list:
+		return self.zone.max_hr
+
+	def calculate(self, full: bool = False) -> ZoneResults:
+		"""Recalculates the dirty rows, all of them with `full` so that every pyMEP surface frame is current"""
+		g = self.graph
+		if full:
+			g.invalidate('weather')
+		if g.dirty & {'weather', 'solar', 'gains', 'rts'}:
+			with SETTING_LOCK:
+				if self.zone is None:
+					self.zone = self.spec.new_zone()
+				else:
+					self.spec.configure(self.zone)
+				self.zone.Calculate(None if g.rows >= ALL else sorted(g.rows))
+			self.partial = len(self.zone.recalculated) < len(COLUMNS)
+		g.clean('weather', 'solar', 'gains', 'rts', 'summary')
+		return self.zone.results
@@ -0,0 +1,207 @@
+import numpy as np
+from collections import namedtuple
+from lib._solar import HOURS, day_of_year, db_profile, clear_sky, incidence, surface_irradiance
+from lib._resource import *
+from lib._ZoneSpec import M3_FT3, SETTING_LOCK
+from lib._cache import rts_values
+from lib._psychro import air_constants, humidity_ratio_from_rel_hum, outdoor_humidity_ratio, pressure
+from lib._constructions import ROOFS, FLOORS
+
+# Rows of the zone heat gain matrix, one 24-hour vector each
+SURFACES = ('Roof', 'Floor', 'Ceiling', 'Wall-A', 'Wall-B', 'Wall-C', 'Wall-D')
+WINDOWS = ('Win-A', 'Win-B', 'Win-C', 'Win-D')
+INTERNALS = ('Lighting', 'People', 'Equipment')
+ROWS = SURFACES + WINDOWS + INTERNALS
+# cooling load rows returned by `cooling_loads`, ventilation is an instantaneous load
+COLUMNS = ROWS + ('SHG', 'LHG')
+_WALLS = slice(3, 7)
+_WINDOWS = slice(len(SURFACES), len(SURFACES) + len(WINDOWS))
+_INTERNALS = slice(len(SURFACES) + len(WINDOWS), len(ROWS))
+# Incidence angles (deg) of the angular SHGC columns SHGCd0, SHGCd4 ... SHGCd8, 90°
+_SHGC_ANGLES = np.array([0., 40., 50., 60., 70., 80., 90.])
+# ASHRAE Fundamentals 2021, Chapter 18, Table 14 recommended radiant fractions of conduction heat gain
+F_RAD_ROOF = 0.60
+F_RAD_WALL = 0.46
+F_RAD_WIN = (0.33, 0.46)	# SHGC > 0.5, SHGC <= 0.5
+# ASHRAE Fundamentals 2021, Chapter 18, §18.25 long-wave correction εΔR/ho, °C
+LW_ROOF = 3.9
+_LAG = (HOURS[:, None] - HOURS[None, :]) % 24
+
+# Everything a design-day calculation needs as plain floats, arrays carry a leading zone axis after `stack`
+ZoneInputs = namedtuple('ZoneInputs', [
+	'fi', 'L_loc', 'tz', 'n', 'taub', 'taud', 'T_db_des', 'T_db_rng', 'Ti',
+	'psi', 'sigma', 'UA', 'external', 'sol', 'lw', 'dT', 'on', 'rad', 'ctm',	# SURFACES, ctm the CTS circulants
+	'w_area', 'w_UA', 'w_SC', 'w_shgc', 'w_shgch', 'w_rad',						# WINDOWS
+	'i_sen', 'i_lat', 'i_rad',													# INTERNALS
+	'v_cs', 'v_cl', 'P', 'W_i', 'T_wb_mc', 'T_wb_rng',						# VENTILATION, pressure Pa, humidity ratio W in g/kg
+	'schedule', 'nrts', 'srts'])
+
+def circulant(factors) -> np.ndarray:
+	"""24 x 24 matrix M[h, k] = f[(h - k) % 24] of CTS/RTS factors in %, so that `M @ q` is the
+	periodic convolution q'(h) = Σ f(j)·q(h - j) of a design-day heat gain. Leading axes are kept."""
+	return np.asarray(factors, float)[..., _LAG] / 100
+
+def wall_azimuths(compass: float) -> tuple:
+	"""Surface azimuth ψ (deg, from south, west positive) of Wall A-D for the zone `compass`,
+	ASHRAE Fundamentals 2021, Chapter 14, §14.11"""
+	v = -180 if compass == 180 else compass
+	return tuple(180 - ((180 - (a - v)) % 360) for a in (180, 90, 0, -90))
+
+def _angular_shgc(cos_theta, table) -> np.ndarray:
+	"""Angle-dependent SHGC, linear in the incidence angle between the `table` columns"""
+	theta = np.degrees(np.arccos(np.clip(cos_theta, 0, 1)))
+	i = np.clip(np.searchsorted(_SHGC_ANGLES, theta, side='right') - 1, 0, len(_SHGC_ANGLES) - 2)
+	t = (theta - _SHGC_ANGLES[i])/(_SHGC_ANGLES[i + 1] - _SHGC_ANGLES[i])
+	table = np.broadcast_to(table, i.shape[:-1] + table.shape[-1:])
+	lo = np.take_along_axis(table, i, axis=-1)
+	hi = np.take_along_axis(table, i + 1, axis=-1)
+	return lo + t*(hi - lo)
+
+def _concatenate(rows: list) -> np.ndarray:
+	"""Joins (..., n, 24) blocks along the rows after broadcasting their leading axes,
+	e.g. surfaces varying per day with internal gains that do not"""
+	lead = np.broadcast_shapes(*[r.shape[:-2] for r in rows])
+	return np.concatenate([np.broadcast_to(r, lead + r.shape[-2:]) for r in rows], axis=-2)
+
+def compile_zone(spec) -> ZoneInputs:
+	"""Reduces a `ZoneSpec` to the float arrays of `ZoneInputs`, the pyMEP settings are read once here"""
+	from pyMEP.hvac.coolingload import Setting
+	with SETTING_LOCK:
+		absorptance, delta_T, eqp_rad = Setting.surface_absorptance, Setting.delta_T.m, Setting.Equipment_Generic_F_rad
+	climatic, architec, app = spec.climatic, spec.architec, spec.application
+	H, W, L = architec.ZoneHeight, architec.ZoneWidth, architec.ZoneLength
+	Ti = climatic.InsideDB
+
+	# Roof, Floor & Ceiling, the ceiling carries the floor construction
+	roof = ROOFS.at(architec.RoofType)
+	floor = FLOORS.at(architec.FloorType)
+	psi = [0, 0, 0] + list(wall_azimuths(architec.Compass))
+	sigma = [0, 180, 180, 90, 90, 90, 90]
+	area = [W*L, W*L, W*L]
+	U = [architec.URoof, architec.UFloor, architec.UFloor]
+	external = [True, False, False]
+	sol = [absorptance, 0, 0]
+	lw = [LW_ROOF, 0, 0]
+	dT = [0, architec.OptionFloor, architec.OptionFloor]
+	roof_on = climatic.SpaceType in (0, 1)
+	on = [roof_on, climatic.SpaceType in (1, 2), not roof_on]
+	rad = [F_RAD_ROOF, F_RAD_WALL, F_RAD_WALL]
+	ctm = [roof.matrix, floor.matrix, floor.matrix]
+
+	# Walls & windows
+	w_area, w_UA, w_SC, w_shgc, w_shgch, w_rad = [], [], [], [], [], []
+	exterior = False
+	for side, length in (('A', L), ('B', W), ('C', L), ('D', W)):
+		construction = architec.wall(side)
+		option = getattr(architec, f'OptionWall_{side}')
+		window = architec.window(side)
+		win_w, win_h = architec.window_size(side)
+		exterior |= construction.isExternal
+		area.append(H*length - win_w*win_h)
+		U.append(getattr(architec, f'UWall_{side}'))
+		external.append(construction.isExternal)
+		sol.append((absorptance if option is None else option) if construction.isExternal else 0)
+		lw.append(0)
+		dT.append(0 if construction.isExternal else delta_T if option is None else option)
+		on.append(True)
+		rad.append(F_RAD_WALL)
+		ctm.append(construction.matrix)
+		w_area.append(win_w*win_h)
+		w_UA.append(win_w*win_h*getattr(architec, f'UWin_{side}'))
+		w_SC.append(getattr(architec, f'SCWin_{side}'))
+		w_shgc.append([window.SHGCd0, window.SHGCd4, window.SHGCd5, window.SHGCd6, window.SHGCd7, window.SHGCd8, 0])
+		w_shgch.append(window.SHGCh)
+		w_rad.append(F_RAD_WIN[0] if window.SHGCd0 > 0.5 else F_RAD_WIN[1])
+
+	# Lighting, People & Equipment
+	lighting = np.asarray(app.LightingGrid, float)
+	people = np.asarray(app.PeopleGrid, float)
+	eqp_sen, eqp_lat = app.EquipmentSH, app.EquipmentLH
+	if spec.is_generic_equipment:
+		eqp_sen, eqp_lat = spec.Area * eqp_sen, spec.Area * eqp_lat
+	i_sen = [app.LPD*spec.Area*app.LightF_SPACE*lighting, app.PeopleSH*people, eqp_sen*app.EquipmentNo*lighting]
+	i_lat = [0*lighting, app.PeopleLH*people, eqp_lat*app.EquipmentNo*lighting]
+	i_rad = [app.LightF_RAD, app.PeopleF_RAD/100, eqp_rad]
+
+	# Ventilation, ASHRAE Fundamentals 2021, p18.15 Elevation Correction Examples
+	V = spec.ventilation_cfm()/M3_FT3/60
+	cs, cl = air_constants(climatic.Altitude)
+	P = pressure(climatic.Altitude)
+	hum_ratio_i = humidity_ratio_from_rel_hum(Ti, climatic.InsideRH/100, P) * 1000
+
+	nrts = rts_values(nrts=True, zones='Exterior' if exterior else 'Interior')
+	srts = rts_values(nrts=False)
+	f = lambda x: np.asarray(x, float)
+	return ZoneInputs(f(climatic.Latitude), f(climatic.Longtitude), f(int(climatic.tz)), f(day_of_year(climatic.Month)),
+					  f(climatic.taub), f(climatic.taud), f(climatic.OutsideDB), f(climatic.DBRange), f(Ti),
+					  f(psi), f(sigma), f(area)*f(U), np.array(external), f(sol), f(lw), f(dT), np.array(on), f(rad), f(ctm),
+					  f(w_area), f(w_UA), f(w_SC), f(w_shgc), f(w_shgch), f(w_rad),
+					  f(i_sen), f(i_lat), f(i_rad),
+					  f(cs*V), f(cl*V), f(P), f(hum_ratio_i), f(climatic.OutsideWB), f(climatic.WBRange), lighting, f(nrts), f(srts))
+
+def stack(zones: list) -> ZoneInputs:
+	"""Joins compiled zones along a new leading axis so that `cooling_loads` runs them as one batch"""
+	return ZoneInputs(*[np.stack(field) for field in zip(*zones)])
+
+def outdoor(z: ZoneInputs) -> np.ndarray:
+	"""Design day dry-bulb (°C) shaped (..., 1, 24)"""
+	return db_profile(z.T_db_des, z.T_db_rng)[..., None, :]
+
+def solar(z: ZoneInputs) -> tuple:
+	"""cos θ, beam and diffuse + reflected irradiance (W/m²) of every surface, each (..., len(SURFACES), 24)"""
+	sky = clear_sky(z.fi, z.L_loc, z.tz, z.n, z.taub, z.taud)
+	cos_theta = incidence(sky, z.psi, z.sigma)
+	return (cos_theta,) + surface_irradiance(sky, cos_theta, z.sigma)
+
+def heat_gains(z: ZoneInputs, T_o, irradiance: tuple) -> tuple:
+	"""Convective part (..., len(ROWS), 24) and the non-solar & solar radiant parts (..., 2, len(ROWS), 24)
+	of every heat gain, conduction already through the CTS circulants"""
+	cos_theta, Et_b, Et_d = irradiance
+	Ti = z.Ti[..., None, None]
+	# Conduction, sol-air temperature of external surfaces, fixed temperature difference for internal ones
+	T_e = T_o + z.sol[..., None]*(Et_b + Et_d) - z.lw[..., None]
+	q = z.UA[..., None]*np.where(z.external[..., None], T_e - Ti, z.dT[..., None])
+	q = np.einsum('...hk,...k->...h', z.ctm, q) * z.on[..., None]
+
+	# Fenestration, beam solar goes through the solar RTS, diffuse through the non-solar RTS
+	SC = (z.w_area*z.w_SC)[..., None]
+	beam = SC*_angular_shgc(cos_theta[..., _WALLS, :], z.w_shgc)*Et_b[..., _WALLS, :]
+	diffuse = SC*z.w_shgch[..., None]*Et_d[..., _WALLS, :]
+	q_win = z.w_UA[..., None]*(T_o - Ti)
+
+	sensible = _concatenate([q, q_win, z.i_sen])
+	rad = np.concatenate([z.rad, z.w_rad, z.i_rad], axis=-1)[..., None]
+	G = np.zeros(sensible.shape[:-2] + (2, len(ROWS), 24))
+	G[..., 0, :, :] = rad*sensible
+	G[..., 0, _WINDOWS, :] += diffuse
+	G[..., 1, _WINDOWS, :] = beam
+	conv = (1 - rad)*sensible
+	conv[..., _INTERNALS, :] += z.i_lat	# latent gains are instantaneous loads
+	return conv, G
+
+def rts(z: ZoneInputs) -> np.ndarray:
+	"""Transposed [NRTS, SRTS] circulants (..., 2, 24, 24), heat gain rows times it gives the loads"""
+	return np.swapaxes(np.stack([circulant(z.nrts), circulant(z.srts)], axis=-3), -1, -2)
+
+def radiant_loads(G, R) -> np.ndarray:
+	return (G @ R).sum(axis=-3)
+
+def ventilation(z: ZoneInputs, T_o) -> np.ndarray:
+	"""SHG and LHG rows (..., 2, 24), ventilation loads are instantaneous. The outdoor humidity ratio
+	follows the wet-bulb profile of the zone's wet-bulb range at the site pressure."""
+	shg = np.round(z.v_cs[..., None]*(T_o[..., 0, :] - z.Ti[..., None]), 0)*z.schedule
+	W_o = outdoor_humidity_ratio(T_o[..., 0, :], z.T_db_des, z.T_db_rng, z.T_wb_mc, z.T_wb_rng, z.P[..., None]) * 1000
+	lhg = np.round(z.v_cl[..., None]*(W_o - z.W_i[..., None]), 0)*z.schedule
+	return _concatenate([shg[..., None, :], lhg[..., None, :]])
+
+def cooling_loads(z: ZoneInputs) -> np.ndarray:
+	"""Hourly cooling load (W) of every row in `COLUMNS`, shaped (..., len(COLUMNS), 24).
+
+	The heat gains of all surfaces are stacked into one matrix per zone. Conduction through the
+	constructions is a single product with their CTS circulants, then the non-solar and solar
+	radiant parts go through one product with the zone's [NRTS, SRTS] circulants,
+	ASHRAE Fundamentals 2021, Chapter 18, §18.20-18.25."""
+	T_o = outdoor(z)
+	conv, G = heat_gains(z, T_o, solar(z))
+	load = conv + radiant_loads(G, rts(z))
+	return _concatenate([load, ventilation(z, T_o)])
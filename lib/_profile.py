@@ -0,0 +1,84 @@
+import json
+import os
+from contextlib import nullcontext
+from threading import Lock
+from time import perf_counter
+
+_OFF = nullcontext()
+
+class _Stage:
+	__slots__ = ('profiler', 'name', 'start')
+
+	def __init__(self, profiler: 'Profiler', name: str) -> None:
+		self.profiler, self.name = profiler, name
+
+	def __enter__(self):
+		self.start = perf_counter()
+		return self
+
+	def __exit__(self, *exc):
+		self.profiler.add(self.name, perf_counter() - self.start)
+		return False
+
+class Profiler:
+	"""Wall time of the calculation stages aggregated across runs, enabled by the environment variable
+	`RTSM_PROFILE` or `enable()`. Disabled, `stage` hands back one shared no-op context and records nothing,
+	so the hooks stay in the production code.
+
+		with profiler.stage('walls'):
+			...
+	"""
+
+	def __init__(self, enabled: bool = None) -> None:
+		self.enabled = bool(os.environ.get('RTSM_PROFILE')) if enabled is None else enabled
+		self.stats = {}		# stage: [calls, total s, max s], in the order first seen
+		self._lock = Lock()
+
+	def enable(self, enabled: bool = True) -> None:
+		self.enabled = enabled
+
+	def stage(self, name: str):
+		return _Stage(self, name) if self.enabled else _OFF
+
+	def add(self, name: str, seconds: float, calls: int = 1) -> None:
+		with self._lock:
+			s = self.stats.get(name)
+			if s is None:
+				self.stats[name] = [calls, seconds, seconds / calls]
+			else:
+				s[0] += calls
+				s[1] += seconds
+				s[2] = max(s[2], seconds / calls)
+
+	def merge(self, stats: dict) -> None:
+		"""Adds the `take()` of another process, the batch workers profile on their own"""
+		for name, (calls, total, longest) in stats.items():
+			self.add(name, total, calls)
+			self.stats[name][2] = max(self.stats[name][2], longest)
+
+	def take(self) -> dict:
+		"""The raw stats so far, then starts over"""
+		with self._lock:
+			stats, self.stats = self.stats, {}
+		return stats
+
+	def reset(self) -> None:
+		self.take()
+
+	def breakdown(self) -> dict:
+		"""{stage: {'calls', 'total_ms', 'mean_ms', 'max_ms', 'share'}}, share of the time of all stages"""
+		with self._lock:
+			stats = [(name, list(s)) for name, s in self.stats.items()]
+		total = sum(s[1] for _, s in stats) or 1.0
+		return dict([(name, {'calls': calls, 'total_ms': seconds*1000, 'mean_ms': seconds*1000/calls,
+							 'max_ms': longest*1000, 'share': seconds/total}) for name, (calls, seconds, longest) in stats])
+
+	def summary(self) -> str:
+		"""One line of the mean time per stage, for a status bar"""
+		return '  '.join(f'{name} {s["mean_ms"]:.1f} ms' for name, s in self.breakdown().items())
+
+	def dump(self, filename: str) -> None:
+		with open(filename, 'w', encoding='utf-8') as f:
+			json.dump(self.breakdown(), f, indent=2)
+
+profiler = Profiler()
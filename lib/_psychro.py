@@ -0,0 +1,60 @@
+import numpy as np
+from functools import lru_cache
+
+# ASHRAE Fundamentals 2021, Chapter 1 psychrometrics in SI, the equations psychrolib implements for one
+# point at a time here over arrays: a whole design day, 8760 hours or a batch of zones in one call
+STANDARD_PRESSURE = 101325.0	# Pa
+MIN_HUM_RATIO = 1e-7			# kg/kg
+TRIPLE_POINT_WATER = 0.01		# °C
+FREEZING_POINT_WATER = 0.0		# °C
+
+@lru_cache(maxsize=None)
+def pressure(altitude: float) -> float:
+	"""Standard atmospheric pressure (Pa) at `altitude` m, Chapter 1, Eq. 3"""
+	return STANDARD_PRESSURE * (1 - 2.25577e-5 * altitude) ** 5.2559
+
+@lru_cache(maxsize=None)
+def air_constants(altitude: float) -> tuple:
+	"""(Cs W/(m³/s·K), Cl W/(m³/s·g/kg)) of the sensible & latent air heat gains at `altitude` m,
+	ASHRAE Fundamentals 2021, p18.15 Elevation Correction Examples"""
+	ratio = pressure(altitude) / STANDARD_PRESSURE
+	return 1230 * ratio, 3010 * ratio
+
+def saturation_pressure(T) -> np.ndarray:
+	"""Saturation vapor pressure (Pa) over ice below the triple point and over liquid water above,
+	Chapter 1, Eq. 5 & 6"""
+	T = np.asarray(T, float)
+	K = T + 273.15
+	ice = -5.6745359e3/K + 6.3925247 + K*(-9.677843e-3 + K*(6.2215701e-7 + K*(2.0747825e-9 - 9.484024e-13*K))) + 4.1635019*np.log(K)
+	water = -5.8002206e3/K + 1.3914993 + K*(-4.8640239e-2 + K*(4.1764768e-5 - 1.4452093e-8*K)) + 6.5459673*np.log(K)
+	return np.exp(np.where(T <= TRIPLE_POINT_WATER, ice, water))
+
+def humidity_ratio_from_vapor_pressure(p_w, P=STANDARD_PRESSURE) -> np.ndarray:
+	"""Humidity ratio (kg/kg) of a vapor partial pressure (Pa), Chapter 1, Eq. 20"""
+	p_w = np.asarray(p_w, float)
+	return np.maximum(0.621945 * p_w / (P - p_w), MIN_HUM_RATIO)
+
+def humidity_ratio_from_rel_hum(T_db, RH, P=STANDARD_PRESSURE) -> np.ndarray:
+	"""Humidity ratio (kg/kg) at dry-bulb `T_db` °C and relative humidity `RH` (0-1)"""
+	return humidity_ratio_from_vapor_pressure(np.asarray(RH, float) * saturation_pressure(T_db), P)
+
+def humidity_ratio_from_wet_bulb(T_db, T_wb, P=STANDARD_PRESSURE) -> np.ndarray:
+	"""Humidity ratio (kg/kg) at dry-bulb `T_db` and wet-bulb `T_wb` °C, Chapter 1, Eq. 33 & 35"""
+	T_db, T_wb = np.asarray(T_db, float), np.asarray(T_wb, float)
+	Ws = humidity_ratio_from_vapor_pressure(saturation_pressure(T_wb), P)
+	water = ((2501. - 2.326*T_wb)*Ws - 1.006*(T_db - T_wb)) / (2501. + 1.86*T_db - 4.186*T_wb)
+	ice = ((2830. - 0.24*T_wb)*Ws - 1.006*(T_db - T_wb)) / (2830. + 1.86*T_db - 2.1*T_wb)
+	return np.maximum(np.where(T_wb >= FREEZING_POINT_WATER, water, ice), MIN_HUM_RATIO)
+
+def outdoor_humidity_ratio(T_db, T_db_des, T_db_rng, T_wb_mc, T_wb_rng, P=STANDARD_PRESSURE) -> np.ndarray:
+	"""Hourly outdoor humidity ratio (kg/kg) of the design day from its hourly dry-bulb `T_db` (..., hours).
+	The wet-bulb falls below `T_wb_mc` by the same fraction of the mean coincident wet-bulb range `T_wb_rng`
+	as the dry-bulb of `T_db_rng`, ASHRAE Fundamentals 2021, Chapter 14, §14.13, and stays at or below the
+	dry-bulb. A wet-bulb range of 0 (unknown) keeps the humidity ratio of the design hour all day."""
+	T_db = np.asarray(T_db, float)
+	T_db_des, T_db_rng, T_wb_mc, T_wb_rng = [np.asarray(x, float)[..., None] for x in (T_db_des, T_db_rng, T_wb_mc, T_wb_rng)]
+	fraction = np.divide(T_db_des - T_db, T_db_rng, out=np.zeros(np.broadcast_shapes(T_db.shape, T_db_rng.shape)), where=T_db_rng > 0)
+	T_wb = np.minimum(T_wb_mc - fraction*T_wb_rng, T_db)
+	hourly = humidity_ratio_from_wet_bulb(T_db, T_wb, P)
+	design = humidity_ratio_from_wet_bulb(T_db_des, T_wb_mc, P)
+	return np.where(T_wb_rng > 0, hourly, design)
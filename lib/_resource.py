@@ -115,7 +115,6 @@ locations = {'Bangkok'			: _Location('Bangkok'			, 13.7264,   100.56,   4, 'apr'
 			 'UBON RATCHATHANI AGROMET'	: _Location('UBON RATCHATHANI AGROMET', 15.233, 105.033, 130, 'apr', 37.5, 10.3, 25.9, 0.61, 1.854, 7),
 			 'UDON THANI'				: _Location('UDON THANI'		,  17.377,  102.809, 178, 'apr', 38.4, 10.8, 24.5, 0.636, 1.778, 7),
 			 'UMPHANG'					: _Location('UMPHANG'			, 16.0253,    98.86, 460, 'apr', 35.6, 13.5, 21.7, 0.585, 1.902, 7),
-			 'UMPHANG'					: _Location('UMPHANG'			, 16.0253,    98.86, 460, 'apr', 35.6, 13.5, 21.7, 0.585, 1.902, 7),
 			 'UTTARADIT'				: _Location('UTTARADIT'			, 17.6244, 100.0969,  64, 'apr', 38.7, 11.4, 26.1, 0.638, 1.787, 7),
 			 'WICHIAN BURI'				: _Location('WICHIAN BURI'		, 15.6569, 101.1053,  70, 'apr', 38.4, 10.7, 26.1, 0.608, 1.864, 7),
 			 'YALA AGROMET'				: _Location('YALA AGROMET'		,  6.5154,  101.274,  36, 'apr', 35.9,   10, 25.7, 0.454, 2.292, 7),
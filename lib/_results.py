@@ -0,0 +1,82 @@
+import numpy as np
+from lib._kernel import COLUMNS as LOADS
+
+# Hourly load components followed by the subtotals, one column each of the 24 x len(COLUMNS) array
+SUBTOTALS = ('Wall', 'Window', 'external', 'internal', 'ventilation', 'TOTAL_CL')
+COLUMNS = LOADS + SUBTOTALS
+INDEX = dict([(c, i) for i, c in enumerate(COLUMNS)])
+_WALLS = [INDEX[c] for c in ('Wall-A', 'Wall-B', 'Wall-C', 'Wall-D')]
+_WINDOWS = [INDEX[c] for c in ('Win-A', 'Win-B', 'Win-C', 'Win-D')]
+_EXTERNAL = [INDEX[c] for c in ('Roof', 'Floor', 'Ceiling', 'Wall', 'Window')]
+_INTERNAL = [INDEX[c] for c in ('Lighting', 'People', 'Equipment')]
+_VENTILATION = [INDEX[c] for c in ('SHG', 'LHG')]
+_ZONE = [INDEX[c] for c in ('external', 'internal', 'ventilation')]
+# Columns of the report DataFrames, the same as the frames `ComfortZone` used to grow column by column
+FRAMES = {'external_load_df'	: ('Roof', 'Floor', 'Ceiling', 'Wall', 'Window', 'TOTAL_CL'),
+		  'internal_load_df'	: ('Lighting', 'People', 'Equipment', 'TOTAL_CL'),
+		  'ventilation_load_df'	: ('SHG', 'LHG', 'TOTAL_CL'),
+		  'wall_load_df'		: ('Wall-A', 'Wall-B', 'Wall-C', 'Wall-D', 'TOTAL_CL'),
+		  'window_load_df'		: ('Win-A', 'Win-B', 'Win-C', 'Win-D', 'TOTAL_CL'),
+		  'cooling_load_df'		: ('external', 'internal', 'ventilation', 'TOTAL_CL')}
+# TOTAL_CL of each frame
+_FRAME_TOTAL = {'external_load_df': 'external', 'internal_load_df': 'internal', 'ventilation_load_df': 'ventilation',
+				'wall_load_df': 'Wall', 'window_load_df': 'Window', 'cooling_load_df': 'TOTAL_CL'}
+
+def summarize(d: np.ndarray) -> np.ndarray:
+	"""Fills the `SUBTOTALS` columns of an (hours, len(COLUMNS)) array in place from its load columns"""
+	d[..., INDEX['Wall']] = d[..., _WALLS].sum(axis=-1)
+	d[..., INDEX['Window']] = d[..., _WINDOWS].sum(axis=-1)
+	d[..., INDEX['external']] = d[..., _EXTERNAL].sum(axis=-1)
+	d[..., INDEX['internal']] = d[..., _INTERNAL].sum(axis=-1)
+	d[..., INDEX['ventilation']] = d[..., _VENTILATION].sum(axis=-1)
+	d[..., INDEX['TOTAL_CL']] = d[..., _ZONE].sum(axis=-1)
+	return d
+
+class ZoneResults:
+	"""Hourly cooling loads (W) of a zone in one preallocated 24 x len(COLUMNS) array.
+	Report DataFrames are built on first access and dropped by the next `summarize`."""
+	__slots__ = ('data', '_frames')
+
+	def __init__(self, dtype=np.float64) -> None:
+		self.data = np.zeros((24, len(COLUMNS)), dtype=dtype)
+		self._frames = {}
+
+	@classmethod
+	def from_loads(cls, loads, dtype=np.float64) -> 'ZoneResults':
+		"""From the (len(LOADS), 24) output of `lib._kernel.cooling_loads`"""
+		results = cls(dtype)
+		results.data[:, :len(LOADS)] = np.transpose(loads)
+		results.summarize()
+		return results
+
+	def __getitem__(self, column: str) -> np.ndarray:
+		return self.data[:, INDEX[column]]
+
+	def __setitem__(self, column: str, values) -> None:
+		self.data[:, INDEX[column]] = values
+
+	def copy(self) -> 'ZoneResults':
+		results = ZoneResults(self.data.dtype)
+		results.data[:] = self.data
+		return results
+
+	def summarize(self) -> None:
+		summarize(self.data)
+		self._frames.clear()
+
+	@property
+	def max_hr(self) -> list:
+		"""Hours of the peak total cooling load"""
+		total_cl = self['TOTAL_CL']
+		return np.flatnonzero(total_cl == total_cl.max()).tolist()
+
+	def frame(self, name: str) -> 'pd.DataFrame':
+		"""One of the `FRAMES` as a DataFrame indexed by Hr, for reports"""
+		df = self._frames.get(name)
+		if df is None:
+			import pandas as pd
+			columns = FRAMES[name]
+			index = [INDEX[_FRAME_TOTAL[name] if c == 'TOTAL_CL' else c] for c in columns]
+			df = pd.DataFrame(self.data[:, index], columns=columns, index=pd.RangeIndex(24, name='Hr'))
+			self._frames[name] = df
+		return df
@@ -0,0 +1,68 @@
+import numpy as np
+from collections import namedtuple
+
+HOURS = np.arange(24)
+# ASHRAE Fundamentals 2021, Chapter 14, Table 6 Fraction of Daily Temperature Range, indexed by clock hour 0-23
+DB_FRACTION = np.array([0.82, 0.88, 0.92, 0.95, 0.98, 1.00, 0.98, 0.91, 0.74, 0.55, 0.38, 0.23,
+						0.13, 0.05, 0.00, 0.00, 0.06, 0.14, 0.24, 0.39, 0.50, 0.59, 0.68, 0.75])
+# ASHRAE Fundamentals 2021, Chapter 14, §14.5 ground reflectance of typical surroundings
+RHO_G = 0.2
+
+# Hourly solar geometry and clear-sky irradiance, every field shaped (..., 24)
+Sky = namedtuple('Sky', ['sin_beta', 'cos_beta', 'phi', 'Eb', 'Ed'])
+
+def day_of_year(month: str) -> int:
+	from pyMEP.hvac.climatic import ReferenceDates
+	return ReferenceDates.get_date_for(month).timetuple().tm_yday
+
+def db_profile(T_db_des, T_db_rng) -> np.ndarray:
+	"""Design day dry-bulb (°C) for clock hours 0-23, broadcast over leading axes of the inputs"""
+	return np.asarray(T_db_des, float)[..., None] - DB_FRACTION * np.asarray(T_db_rng, float)[..., None]
+
+def clear_sky(fi, L_loc, tz, n, taub, taud, hours=HOURS) -> Sky:
+	"""ASHRAE Fundamentals 2021, Chapter 14, §14.3-14.8 solar position and clear-sky irradiance.
+
+	fi, L_loc : latitude (+N) and longitude (+E), deg
+	tz : time zone, h from UTC
+	n : day of year
+	taub, taud : beam and diffuse optical depths
+	Every argument may be an array (one design day per element), they broadcast together."""
+	fi, L_loc, tz, n, taub, taud = [np.asarray(x, float)[..., None] for x in (fi, L_loc, tz, n, taub, taud)]
+	G = np.radians(360*(n - 1)/365)
+	ET = 2.2918*(0.0075 + 0.1868*np.cos(G) - 3.2077*np.sin(G) - 1.4615*np.cos(2*G) - 4.089*np.sin(2*G))
+	delta = np.radians(23.45*np.sin(np.radians(360*(n + 284)/365)))
+	AST = hours + ET/60 + (L_loc - 15*tz)/15
+	H = np.radians(15*(AST - 12))
+	L = np.radians(fi)
+	sin_beta = np.cos(L)*np.cos(delta)*np.cos(H) + np.sin(L)*np.sin(delta)
+	beta = np.arcsin(np.clip(sin_beta, -1, 1))
+	cos_beta = np.cos(beta)
+	# solar azimuth from south, west positive
+	phi = np.arctan2(np.sin(H)*np.cos(delta), np.cos(H)*np.cos(delta)*np.sin(L) - np.sin(delta)*np.cos(L))
+
+	E0 = 1367*(1 + 0.033*np.cos(np.radians(360*(n - 3)/365)))
+	ab = 1.454 - 0.406*taub - 0.268*taud + 0.021*taub*taud
+	ad = 0.507 + 0.205*taub - 0.080*taud - 0.190*taub*taud
+	up = sin_beta > 0
+	m = np.where(up, 1/(np.maximum(sin_beta, 1e-9) + 0.50572*(6.07995 + np.degrees(np.maximum(beta, 0)))**-1.6364), 0)
+	Eb = np.where(up, E0*np.exp(-taub*m**ab), 0)
+	Ed = np.where(up, E0*np.exp(-taud*m**ad), 0)
+	return Sky(sin_beta, cos_beta, phi, Eb, Ed)
+
+def incidence(sky: Sky, psi, sigma) -> np.ndarray:
+	"""cos θ of surfaces with azimuth `psi` (from south, west positive) and tilt `sigma`, deg.
+	Surfaces form the axis before the hours: (..., surfaces) x sky (..., 24) -> (..., surfaces, 24)"""
+	psi = np.radians(np.asarray(psi, float))[..., None]
+	sigma = np.radians(np.asarray(sigma, float))[..., None]
+	gamma = sky.phi[..., None, :] - psi
+	return sky.cos_beta[..., None, :]*np.cos(gamma)*np.sin(sigma) + sky.sin_beta[..., None, :]*np.cos(sigma)
+
+def surface_irradiance(sky: Sky, cos_theta, sigma) -> tuple:
+	"""Beam and diffuse + ground reflected irradiance (W/m²) on tilted surfaces, ASHRAE Fundamentals 2021 §14.9"""
+	sigma = np.radians(np.asarray(sigma, float))[..., None]
+	Eb, Ed, sin_beta = sky.Eb[..., None, :], sky.Ed[..., None, :], sky.sin_beta[..., None, :]
+	Et_b = Eb*np.maximum(cos_theta, 0)
+	Y = np.maximum(0.45, 0.55 + 0.437*cos_theta + 0.313*cos_theta**2)
+	Et_d = np.where(sigma <= np.pi/2, Ed*(Y*np.sin(sigma) + np.cos(sigma)), Ed*Y*np.sin(sigma))
+	Et_r = (Eb*np.maximum(sin_beta, 0) + Ed)*RHO_G*(1 - np.cos(sigma))/2
+	return Et_b, Et_d + Et_r
@@ -0,0 +1,24 @@
+import os
+from time import perf_counter
+
+class StartupProbe:
+	"""Wall time of each startup phase since the probe was created, printed by `report` when the
+	environment variable `RTSM_STARTUP` is set. Creating it is the first thing `main.py` does."""
+
+	def __init__(self) -> None:
+		self.enabled = bool(os.environ.get('RTSM_STARTUP'))
+		self.start = self.last = perf_counter()
+		self.phases = []
+
+	def mark(self, phase: str) -> None:
+		now = perf_counter()
+		self.phases.append((phase, now - self.last))
+		self.last = now
+
+	def report(self) -> None:
+		if not self.enabled: return
+		for phase, seconds in self.phases:
+			print(f'{phase:<24}{seconds*1000:>8.1f} ms')
+		print(f'{"time to first window":<24}{(self.last - self.start)*1000:>8.1f} ms')
+
+probe = StartupProbe()
@@ -0,0 +1,241 @@
+import numpy as np
+import warnings
+from math import asin, cos, degrees, floor, radians, sin
+from os import path
+from lib._resource import _Location, locations
+
+# Bumped whenever `_STATION_DTYPE` changes, a cache of another version is ignored
+STATIONS_VERSION = 3
+STATIONS_FILE = path.join(path.dirname(path.dirname(path.abspath(__file__))), 'res', f'stations_v{STATIONS_VERSION}.npy')
+# Mean coincident wet-bulb range as a fraction of the dry-bulb range, for a station without a recorded one.
+# An assumption, not an ASHRAE value: holding the design humidity ratio through the day swings the wet-bulb
+# by 0.23-0.30 of the dry-bulb range at the built-in stations, this lets the humidity ratio fall slightly
+# overnight. Only the form's location change applies it, a `.rtsm` without WBRange keeps 0.
+WB_RANGE_RATIO = 0.35
+MONTHS = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+# One record per station, the fields of `_Location`, the mean coincident wet-bulb range and the clear-sky
+# optical depths of every month (NaN where unknown). The `.rtsm` Location is a row number, the built-in `locations` come first and keep their order
+_STATION_DTYPE = np.dtype([('Location', 'U40'), ('Lat', 'f8'), ('Long', 'f8'), ('Elev', 'i4'), ('ReferenceDates', 'U3'),
+						   ('T_db_des', 'f8'), ('T_db_rng', 'f8'), ('T_wb_mc', 'f8'), ('taub', 'f8'), ('taud', 'f8'), ('tz', 'f8'), ('T_wb_rng', 'f8'),
+						   ('taub_monthly', 'f8', (12,)), ('taud_monthly', 'f8', (12,))])
+# Headers of an ASHRAE climatic design conditions CSV export, `{}` is the month (Jan ... Dec)
+CSV_COLUMNS = {'Location': 'Station', 'Lat': 'Lat', 'Long': 'Long', 'Elev': 'Elev', 'tz': 'Time zone',
+			   'ReferenceDates': 'Hottest month', 'T_db_des': 'Cooling DB 0.4%', 'T_db_rng': 'Hottest month DB range',
+			   'T_wb_mc': 'Cooling MCWB 0.4%', 'T_wb_rng': 'Hottest month MCWB range', 'taub_monthly': 'taub {}', 'taud_monthly': 'taud {}'}
+EARTH_RADIUS = 6371.0088	# km, mean radius
+_CELL = 1.0					# grid index cell, degree
+_stations = None
+
+def _haversine(lat, long, lats, longs) -> np.ndarray:
+	"""Great circle distance (km) from one point to arrays of points"""
+	fi, dfi, dl = np.radians(lat), np.radians(lats - lat), np.radians(longs - long)
+	a = np.sin(dfi/2)**2 + np.cos(fi) * np.cos(np.radians(lats)) * np.sin(dl/2)**2
+	return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.minimum(a, 1)))
+
+class StationTable:
+	"""Design conditions of the weather stations as NumPy columns with a latitude/longitude grid index.
+	The stations of one `_CELL` x `_CELL` cell are contiguous in `_order`, `_start[cell]` is the first."""
+
+	def __init__(self, records: np.ndarray) -> None:
+		self.records = records
+		self.lat = np.asarray(records['Lat'], float)
+		self.long = (np.asarray(records['Long'], float) + 180) % 360 - 180
+		self._rows, self._columns = int(180 / _CELL), int(360 / _CELL)
+		cells = self._cell(self.lat, self.long)
+		self._order = np.argsort(cells, kind='stable')
+		self._start = np.searchsorted(cells[self._order], np.arange(self._rows * self._columns + 1))
+		self._index = None
+
+	def _cell(self, lat, long):
+		row = np.clip(((np.asarray(lat) + 90) // _CELL).astype(int), 0, self._rows - 1)
+		return row * self._columns + ((np.asarray(long) + 180) // _CELL).astype(int) % self._columns
+
+	def __len__(self) -> int:
+		return len(self.records)
+
+	def __getitem__(self, i: int) -> _Location:
+		r = self.records[i]
+		tz = float(r['tz'])
+		return _Location(str(r['Location']), float(r['Lat']), float(r['Long']), int(r['Elev']), str(r['ReferenceDates']),
+						 float(r['T_db_des']), float(r['T_db_rng']), float(r['T_wb_mc']), float(r['taub']), float(r['taud']),
+						 int(tz) if tz.is_integer() else tz)
+
+	@property
+	def names(self) -> list:
+		return self.records['Location'].tolist()
+
+	def index(self, name: str) -> int:
+		"""Row of the first station called `name`, ValueError when there is none"""
+		if self._index is None:
+			self._index = {}
+			for i, n in enumerate(self.names):
+				self._index.setdefault(n, i)
+		return self._index[name] if name in self._index else self.names.index(name)
+
+	def get(self, name: str, default=None):
+		try:
+			return self[self.index(name)]
+		except ValueError:
+			return default
+
+	def _window(self, lat: float, long: float, radius: float) -> np.ndarray:
+		"""Rows of the stations in the grid cells which hold every point within `radius` degrees of arc"""
+		lat0, lat1 = max(lat - radius, -90.0), min(lat + radius, 90.0)
+		c = cos(radians(max(abs(lat0), abs(lat1))))
+		s = sin(radians(min(radius, 180.0)) / 2)
+		# the longitude span which keeps the great circle distance within `radius` on the band's poleward edge
+		span = 180.0 if c <= s else degrees(2 * asin(s / c))
+		columns = self._columns if span >= 180 else min(self._columns, floor((long + span + 180) / _CELL) - floor((long - span + 180) / _CELL) + 1)
+		first = floor((long - span + 180) / _CELL) % self._columns if columns < self._columns else 0
+		rows = []
+		for row in range(int((lat0 + 90) // _CELL), min(int((lat1 + 90) // _CELL), self._rows - 1) + 1):
+			base = row * self._columns
+			end = first + columns
+			for a, b in ((first, min(end, self._columns)), (0, max(end - self._columns, 0))):
+				if b > a:
+					rows.append(self._order[self._start[base + a]:self._start[base + b]])
+		return np.concatenate(rows) if rows else np.empty(0, int)
+
+	def within(self, lat: float, long: float, radius: float) -> tuple:
+		"""(rows, distances km) of the stations within `radius` km, nearest first"""
+		rows = self._window(lat, long, degrees(radius / EARTH_RADIUS))
+		d = _haversine(lat, long, self.lat[rows], self.long[rows])
+		keep = d <= radius
+		rows, d = rows[keep], d[keep]
+		order = np.argsort(d, kind='stable')
+		return rows[order], d[order]
+
+	def nearest(self, lat: float, long: float, k: int = 1) -> tuple:
+		"""(rows, distances km) of the `k` stations nearest to `lat`, `long`. The search window doubles
+		until the k-th candidate is closer than anything outside the window can be."""
+		k = min(k, len(self))
+		radius = _CELL
+		while True:
+			rows = self._window(lat, long, radius)
+			if len(rows) >= k:
+				d = _haversine(lat, long, self.lat[rows], self.long[rows])
+				order = np.argsort(d, kind='stable')[:k]
+				if d[order[-1]] <= radians(radius) * EARTH_RADIUS or radius >= 180:
+					return rows[order], d[order]
+			elif radius >= 180:
+				return rows[:0], np.empty(0)
+			radius *= 2
+
+	def wb_range(self, i: int) -> float:
+		"""Mean coincident wet-bulb range (°C) of a station, `WB_RANGE_RATIO` of its dry-bulb range when unknown"""
+		r = self.records[i]
+		if np.isfinite(r['T_wb_rng']):
+			return float(r['T_wb_rng'])
+		return round(float(r['T_db_rng']) * WB_RANGE_RATIO, 1)
+
+	def monthly(self, i: int) -> dict:
+		"""{'taub': 12 values, 'taud': 12 values} of a station for `lib._sweep.peak_month`,
+		a month without data takes the design month's value"""
+		r = self.records[i]
+		return dict([(k, np.where(np.isnan(r[f'{k}_monthly']), r[k], r[f'{k}_monthly'])) for k in ('taub', 'taud')])
+
+	def design_month(self, i: int, month: str) -> _Location:
+		"""The station's `_Location` on the design day of another month, taub & taud of that month"""
+		m = MONTHS.index(month)
+		monthly = self.monthly(i)
+		return self[i]._replace(ReferenceDates=month, taub=float(monthly['taub'][m]), taud=float(monthly['taud'][m]))
+
+def from_locations(stations) -> np.ndarray:
+	"""Station records of an iterable of `_Location`s, only their design month has optical depths"""
+	records = np.zeros(len(stations), dtype=_STATION_DTYPE)
+	for i, s in enumerate(stations):
+		record = records[i]
+		for k, v in s._asdict().items():
+			record[k] = v
+		record['T_wb_rng'] = record['taub_monthly'] = record['taud_monthly'] = np.nan
+		m = MONTHS.index(s.ReferenceDates)
+		record['taub_monthly'][m], record['taud_monthly'][m] = s.taub, s.taud
+	return records
+
+def _float(value: str) -> float:
+	try:
+		return float(value)
+	except ValueError:
+		return np.nan
+
+def _month(value: str) -> str:
+	"""`MONTHS` item of a month name or number (1-12), None when empty or not a month"""
+	value = value.strip().lower()
+	if value[:1].isdigit():
+		n = _float(value)
+		return MONTHS[int(n) - 1] if 1 <= n < 13 else None
+	return value[:3] if value[:3] in MONTHS else None
+
+def read_csv(filename: str, columns: dict = CSV_COLUMNS, chunksize: int = 4096):
+	"""Yields the station records of an ASHRAE climatic design CSV in chunks of `chunksize`, the file is
+	streamed row by row. `columns` maps the `_STATION_DTYPE` fields to the CSV headers. A station without
+	a hottest month has no design day, it is skipped with a warning."""
+	import csv
+	monthly = [m.capitalize() for m in MONTHS]
+	skipped = 0
+	with open(filename, newline='', encoding='utf-8-sig') as f:
+		chunk = np.zeros(chunksize, dtype=_STATION_DTYPE)
+		n = 0
+		for row in csv.DictReader(f):
+			month = _month(row[columns['ReferenceDates']] or '')
+			if month is None:
+				skipped += 1
+				continue
+			record = chunk[n]
+			record['Location'] = row[columns['Location']].strip()
+			record['ReferenceDates'] = month
+			for k in ('Lat', 'Long', 'T_db_des', 'T_db_rng', 'T_wb_mc', 'tz'):
+				record[k] = _float(row[columns[k]])
+			# not every export has the wet-bulb range
+			record['T_wb_rng'] = _float(row.get(columns.get('T_wb_rng'), '') or '')
+			record['Elev'] = round(_float(row[columns['Elev']]))
+			for k in ('taub', 'taud'):
+				values = [_float(row.get(columns[f'{k}_monthly'].format(m), '')) for m in monthly]
+				record[f'{k}_monthly'] = values
+				record[k] = values[MONTHS.index(record['ReferenceDates'])]
+			n += 1
+			if n == chunksize:
+				yield chunk
+				chunk, n = np.zeros(chunksize, dtype=_STATION_DTYPE), 0
+		if n: yield chunk[:n]
+	if skipped:
+		warnings.warn(f'{filename}: {skipped} station(s) without a hottest month skipped', stacklevel=2)
+
+def import_csv(filenames, columns: dict = CSV_COLUMNS, filename: str = STATIONS_FILE) -> 'StationTable':
+	"""Imports ASHRAE climatic design CSV exports after the built-in `locations` into the station cache,
+	later launches memory-map the cache instead of parsing text"""
+	global _stations
+	if isinstance(filenames, str): filenames = [filenames]
+	chunks = [from_locations(list(locations.values()))]
+	for f in filenames:
+		chunks.extend(read_csv(f, columns))
+	records = np.concatenate(chunks)
+	save_stations(records, filename)
+	_stations = None
+	return stations() if filename == STATIONS_FILE else StationTable(records)
+
+def save_stations(records: np.ndarray, filename: str = STATIONS_FILE) -> None:
+	"""Writes the station records, ship them as `STATIONS_FILE`. The built-in `locations` must stay the first
+	rows in their order, the `.rtsm` files refer to them by row"""
+	names = records['Location'][:len(locations)].tolist()
+	if names != [l.Location for l in locations.values()]:
+		raise ValueError('the built-in locations must be the first station records')
+	np.save(filename, np.asarray(records, dtype=_STATION_DTYPE), allow_pickle=False)
+
+def load_stations(filename: str = STATIONS_FILE) -> np.ndarray:
+	"""Memory-mapped station records, None when the cache holds another `STATIONS_VERSION`"""
+	records = np.load(filename, mmap_mode='r', allow_pickle=False)
+	if records.dtype != _STATION_DTYPE:
+		warnings.warn(f'{filename}: station cache of another version, ignored', stacklevel=2)
+		return None
+	return records
+
+def stations() -> StationTable:
+	"""Process-wide station table, memory-mapped from `STATIONS_FILE` when imported, otherwise the built-in `locations`"""
+	global _stations
+	if _stations is None:
+		records = load_stations() if path.exists(STATIONS_FILE) else None
+		if records is None:
+			records = from_locations(list(locations.values()))
+		_stations = StationTable(records)
+	return _stations
@@ -0,0 +1,115 @@
+import contextlib
+import io
+import numpy as np
+from collections import namedtuple
+from lib._kernel import COLUMNS as LOADS, ZoneInputs, compile_zone, cooling_loads
+from lib._results import COLUMNS, INDEX, summarize
+from lib._solar import day_of_year
+from lib._ZoneSpec import SETTING_LOCK
+
+DAYS = np.arange(1, 366)
+MONTHS = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+# Every function takes a `ZoneSpec` or the `ZoneInputs` of a compiled zone and calculates all days at once
+# with the NumPy kernel, a `ZoneSpec` is compiled first. With `reference=True` a `ZoneSpec` is calculated one
+# design day at a time by the pyMEP `ComfortZone.Calculate` instead, `annual_loads` has no such option.
+# The ClimaticData key of each optional per-day array
+_CLIMATIC = dict([('T_db_des', 'OutsideDB'), ('T_db_rng', 'DBRange'), ('taub', 'taub'), ('taud', 'taud')])
+
+def _variants(spec, count: int, **days) -> list:
+	"""`count` copies of a `ZoneSpec`, copy i takes the i-th value of every per-day array given"""
+	days = dict([(k, np.broadcast_to(np.asarray(v, float), count)) for k, v in days.items() if v is not None])
+	specs = []
+	for i in range(count):
+		copy = spec.copy()
+		for k, v in days.items():
+			setattr(copy.climatic, _CLIMATIC[k], float(v[i]))
+		specs.append(copy)
+	return specs
+
+def _inputs(z) -> ZoneInputs:
+	return z if isinstance(z, ZoneInputs) else compile_zone(z)
+
+def _use_reference(z, reference: bool):
+	if reference and isinstance(z, ZoneInputs):
+		raise TypeError('the pyMEP reference calculation needs a ZoneSpec, not compiled ZoneInputs')
+	return reference
+
+def _reference(specs: list) -> np.ndarray:
+	"""len(specs) x 24 x len(COLUMNS) loads (W) of the pyMEP `Calculate` of every spec on its design day"""
+	hourly = np.zeros((len(specs), 24, len(COLUMNS)))
+	with contextlib.redirect_stdout(io.StringIO()):	# ComfortZone.Calculate reports on stdout
+		for i, spec in enumerate(specs):
+			with SETTING_LOCK:
+				zone = spec.new_zone()
+				zone.Calculate()
+			hourly[i] = zone.results.data
+	return hourly
+
+def annual_loads(z, T_db_des=None, T_db_rng=None, taub=None, taud=None, dtype=np.float64) -> np.ndarray:
+	"""Hourly loads (W) of days 1-365, an 8760 x len(COLUMNS) array in the column order of `ZoneResults`.
+
+	Every day is a steady-periodic day of the RTS method. The solar position, sol-air temperatures and
+	the RTS conversion of all 365 days are evaluated together by the kernel, a `ZoneSpec` is compiled first.
+	Without the optional per-day arrays (365 values each) every day takes the design dry-bulb, range and
+	optical depths of the zone, which gives a clear-sky design year."""
+	data = np.zeros((len(DAYS)*24, len(COLUMNS)), dtype=dtype)
+	loads = cooling_loads(_days(_inputs(z), DAYS, T_db_des, T_db_rng, taub, taud))
+	data[:, :len(LOADS)] = np.swapaxes(loads, -1, -2).reshape(-1, len(LOADS))
+	return summarize(data)
+
+PeakMonth = namedtuple('PeakMonth', ['Month', 'Hour', 'Components', 'Cooling_Load', 'Monthly'])
+
+def _days(z: ZoneInputs, n, T_db_des, T_db_rng, taub, taud) -> ZoneInputs:
+	return z._replace(n=np.asarray(n, float),
+					  T_db_des=z.T_db_des if T_db_des is None else np.asarray(T_db_des, float),
+					  T_db_rng=z.T_db_rng if T_db_rng is None else np.asarray(T_db_rng, float),
+					  taub=z.taub if taub is None else np.asarray(taub, float),
+					  taud=z.taud if taud is None else np.asarray(taud, float))
+
+def monthly_loads(z, T_db_des=None, T_db_rng=None, taub=None, taud=None, reference: bool = False) -> np.ndarray:
+	"""Hourly loads (W) of the twelve monthly design days, a 12 x 24 x len(COLUMNS) array.
+	The optional arrays hold the monthly design conditions (12 values each), the zone's own otherwise."""
+	if _use_reference(z, reference):
+		specs = _variants(z, len(MONTHS), T_db_des=T_db_des, T_db_rng=T_db_rng, taub=taub, taud=taud)
+		for spec, month in zip(specs, MONTHS):
+			spec.climatic.Month = month
+		return _reference(specs)
+	loads = cooling_loads(_days(_inputs(z), [day_of_year(m) for m in MONTHS], T_db_des, T_db_rng, taub, taud))
+	data = np.zeros((len(MONTHS), 24, len(COLUMNS)))
+	data[..., :len(LOADS)] = np.swapaxes(loads, -1, -2)
+	return summarize(data)
+
+def peak_month(z, reference: bool = False, **months) -> PeakMonth:
+	"""Month, hour and component breakdown (W) of the highest load over the twelve monthly design days,
+	`Monthly` keeps the peak of every month for comparison"""
+	data = monthly_loads(z, reference=reference, **months)
+	total_cl = data[..., INDEX['TOTAL_CL']]
+	m, hr = np.unravel_index(total_cl.argmax(), total_cl.shape)
+	components = dict([(c, float(data[m, hr, i])) for i, c in enumerate(COLUMNS)])
+	return PeakMonth(MONTHS[m], int(hr), components, float(total_cl[m, hr]), dict(zip(MONTHS, total_cl.max(axis=1).tolist())))
+
+OrientationSweep = namedtuple('OrientationSweep', ['Compass', 'Peak', 'Peak_Hr', 'Hourly'])
+
+def orientation_sweep(z, compass=np.arange(360), reference: bool = False) -> OrientationSweep:
+	"""Loads (W) of the zone rotated to every `compass` angle (deg from north). The wall azimuths of all
+	angles form one (angles, surfaces) array, so the solar incidence, heat gains and RTS products of the
+	whole sweep are single array operations, with `reference` a `ZoneSpec` takes a pyMEP calculation per
+	angle instead. `Hourly` is angles x 24 x len(COLUMNS), `Peak` and `Peak_Hr` the total load curve."""
+	compass = np.asarray(compass, float)
+	if _use_reference(z, reference):
+		specs = _variants(z, len(compass))
+		for spec, angle in zip(specs, compass.tolist()):
+			spec.architec.Compass = angle
+		hourly = _reference(specs)
+		total_cl = hourly[..., INDEX['TOTAL_CL']]
+		return OrientationSweep(compass, total_cl.max(axis=1), total_cl.argmax(axis=1), hourly)
+	# ASHRAE Fundamentals 2021, Chapter 14, §14.11 surface azimuth, as `wall_azimuths`
+	z = _inputs(z)
+	walls = 180 - ((180 - (np.array([180, 90, 0, -90]) - compass[:, None])) % 360)
+	psi = np.concatenate([np.broadcast_to(z.psi[:3], (len(compass), 3)), walls], axis=-1)
+	loads = cooling_loads(z._replace(psi=psi))
+	hourly = np.zeros((len(compass), 24, len(COLUMNS)))
+	hourly[..., :len(LOADS)] = np.swapaxes(loads, -1, -2)
+	summarize(hourly)
+	total_cl = hourly[..., INDEX['TOTAL_CL']]
+	return OrientationSweep(compass, total_cl.max(axis=1), total_cl.argmax(axis=1), hourly)
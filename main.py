@@ -1,33 +1,41 @@
+from lib._startup import probe
 import sys, json
-import pandas as pd
+from contextlib import contextmanager
+from functools import partial
+import numpy as np
 from os import path
 from time import strftime, localtime
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QIcon
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QGridLayout, QHBoxLayout, QVBoxLayout, QFormLayout, QGroupBox,  QScrollArea, QTabWidget, QDialog, QFileDialog, 
-                             QMessageBox, QWidget, QLabel, QPushButton, QDialogButtonBox, QSpinBox, QDoubleSpinBox, QLineEdit, QComboBox, QCheckBox)
-from pyMEP import Quantity
-from pyMEP.substance import *
-from pyMEP.hvac.climatic import WeatherData, ReferenceDates
-from pyMEP.hvac.coolingload import Setting, RTS
-from pyMEP.hvac.lighting import lpd_df, LightingPowerDensities
-from pyMEP.hvac.equipment import EquipmentPowerDensities
-from pyMEP.hvac.people import human_vrp_df, human_hr_df, HumanHeatRate
-from pyMEP.hvac.external_heat_gains import Wall
-from pyMEP.charts.chart_2D import LineChart
+                             QMessageBox, QWidget, QLabel, QPushButton, QDialogButtonBox, QSpinBox, QDoubleSpinBox, QLineEdit, QComboBox, QCheckBox,
+                             QTableWidget, QTableWidgetItem)
 
 from lib.CollapsibleBox import CollapsibleBox
 from lib.BuildingGraphic import SideView, TopView
 from lib.HourlyTable import numericHourlyTable, checkBoxHourlyTable
-from lib._ThermalComfort import ComfortZone
+from lib.CalcWorker import CalcScheduler
+from lib._ZoneSpec import ZoneSpec, room_types, SETTING_LOCK
+from lib._graph import state as calc_state, dirty_stages, IncrementalZone
+from lib._sweep import orientation_sweep
+from lib._stations import stations
+from lib._constructions import ROOFS, WALLS, FLOORS
+from lib._profile import profiler
 from lib._resource import *
 from lib.utils import *
+probe.mark('imports')
 
 __version__ = '0.1.0'
 
-Q_ = Quantity
 WATT_BTU_HR = 3.41214163
 
+def calculate_zone(incremental, spec, zone_state, full=False):
+    """Worker thread side of `RTSMRequestCalculate`, reruns only the rows the edit made dirty. The GUI
+    gets a copy of the results, the zone itself is never read while the next run changes it."""
+    print('>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> CALCULATING <<<<<<<<<<<<<<<<<<<<<<<<<<<<<<')
+    incremental.update(spec, zone_state)
+    return incremental.calculate(full).copy(), zone_state
+
 class Mainwindow(QMainWindow):
     def __init__(self):
         super(Mainwindow, self).__init__()
@@ -71,7 +79,7 @@ class Mainwindow(QMainWindow):
         outsidelayout.addWidget(QLabel('<b><div style="color: red">Location</div></b>'), 0, 0, Qt.AlignmentFlag.AlignRight)
         self.cmbRTSMLocation = QComboBox()
         self.cmbRTSMLocation.setFixedHeight(22)
-        self.cmbRTSMLocation.addItems(locations.keys())
+        self.cmbRTSMLocation.addItems(stations().names)
         outsidelayout.addWidget(self.cmbRTSMLocation, 0, 1, 1, 3)
 
         outsidelayout.addWidget(QLabel('Latitude'), 1, 0, Qt.AlignmentFlag.AlignRight)
@@ -103,6 +111,9 @@ class Mainwindow(QMainWindow):
         self.tbRTSMDBRange = QDoubleSpinBox()
         outsidelayout.addWidget(self.tbRTSMDBRange, 5, 1)
         outsidelayout.addWidget(QLabel('°C'), 5, 2)
+        self.tbRTSMWBRange = QDoubleSpinBox()
+        self.tbRTSMWBRange.setToolTip("Mean coincident wet-bulb range °C, a location change fills in the station's\nor an estimate from its DB range, 0 keeps the outdoor humidity ratio of the design hour")
+        outsidelayout.addWidget(self.tbRTSMWBRange, 5, 3)
 
         outsidelayout.addWidget(QLabel('Outside WB'), 6, 0, Qt.AlignmentFlag.AlignRight)
         self.tbRTSMOutsideWB = QDoubleSpinBox()
@@ -190,7 +201,13 @@ class Mainwindow(QMainWindow):
         self.tbCompass = QSpinBox()
         self.tbCompass.setRange(-180, 180)
         architecLeftlayout.addWidget(self.tbCompass, 0, 3)
-        architecLeftlayout.addWidget(QLabel('Degree'), 0, 4)
+        compassLayout = QHBoxLayout()
+        compassLayout.addWidget(QLabel('Degree'))
+        self.btnRTSMOrientation = QPushButton('↻')
+        self.btnRTSMOrientation.setFixedSize(30, 22)
+        self.btnRTSMOrientation.setToolTip('Peak cooling load vs orientation')
+        compassLayout.addWidget(self.btnRTSMOrientation)
+        architecLeftlayout.addLayout(compassLayout, 0, 4)
 
         architecLeftlayout.addWidget(QLabel('<div style="color: red">Room Height</div>'), 1, 1, 1, 2, Qt.AlignmentFlag.AlignRight)
         self.tbZoneHeight = QDoubleSpinBox()
@@ -213,8 +230,8 @@ class Mainwindow(QMainWindow):
 		# region Roof & Floor
         architecLeftlayout.addWidget(QLabel('Roof'), 4, 0, Qt.AlignmentFlag.AlignRight)
         self.cmbRTSMRoofType = QComboBox()
-        self.cmbRTSMRoofType.addItems(roofs.keys())
-        self.setRTSMItemToolTip(self.cmbRTSMRoofType, roofs)
+        self.cmbRTSMRoofType.addItems(ROOFS.keys())
+        self.setRTSMItemToolTip(self.cmbRTSMRoofType, ROOFS.builtin)
         architecLeftlayout.addWidget(self.cmbRTSMRoofType, 4, 1)
         architecLeftlayout.addWidget(QLabel('<b>U</>'), 4, 2, Qt.AlignmentFlag.AlignRight)
         self.tbRTSMURoof = QDoubleSpinBox()
@@ -224,8 +241,8 @@ class Mainwindow(QMainWindow):
 
         architecLeftlayout.addWidget(QLabel('Floor'), 5, 0, Qt.AlignmentFlag.AlignRight)
         self.cmbRTSMFloorType = QComboBox()
-        self.cmbRTSMFloorType.addItems(floors.keys())
-        self.setRTSMItemToolTip(self.cmbRTSMFloorType, floors)
+        self.cmbRTSMFloorType.addItems(FLOORS.keys())
+        self.setRTSMItemToolTip(self.cmbRTSMFloorType, FLOORS.builtin)
         architecLeftlayout.addWidget(self.cmbRTSMFloorType, 5, 1)
         architecLeftlayout.addWidget(QLabel('<b>U</>'), 5, 2, Qt.AlignmentFlag.AlignRight)
         self.tbRTSMUFloor = QDoubleSpinBox()
@@ -243,8 +260,8 @@ class Mainwindow(QMainWindow):
 		# region Wall A
         architecLeftlayout.addWidget(QLabel('Wall-A'), 7, 0, Qt.AlignmentFlag.AlignRight)
         self.cmbRTSMWall_A = QComboBox()
-        self.cmbRTSMWall_A.addItems(walls.keys())
-        self.setRTSMItemToolTip(self.cmbRTSMWall_A, walls)
+        self.cmbRTSMWall_A.addItems(WALLS.keys())
+        self.setRTSMItemToolTip(self.cmbRTSMWall_A, WALLS.builtin)
         architecLeftlayout.addWidget(self.cmbRTSMWall_A, 7, 1)
         architecLeftlayout.addWidget(QLabel('<b>U</>'), 7, 2, Qt.AlignmentFlag.AlignRight)
         self.tbRTSMUWall_A = QDoubleSpinBox()
@@ -265,8 +282,8 @@ class Mainwindow(QMainWindow):
 		# region Wall B
         architecLeftlayout.addWidget(QLabel('Wall-B'), 9, 0, Qt.AlignmentFlag.AlignRight)
         self.cmbRTSMWall_B = QComboBox()
-        self.cmbRTSMWall_B.addItems(walls.keys())
-        self.setRTSMItemToolTip(self.cmbRTSMWall_B, walls)
+        self.cmbRTSMWall_B.addItems(WALLS.keys())
+        self.setRTSMItemToolTip(self.cmbRTSMWall_B, WALLS.builtin)
         architecLeftlayout.addWidget(self.cmbRTSMWall_B, 9, 1)
         architecLeftlayout.addWidget(QLabel('<b>U</>'), 9, 2, Qt.AlignmentFlag.AlignRight)
         self.tbRTSMUWall_B = QDoubleSpinBox()
@@ -287,8 +304,8 @@ class Mainwindow(QMainWindow):
 		# region Wall C
         architecLeftlayout.addWidget(QLabel('Wall-C'), 11, 0, Qt.AlignmentFlag.AlignRight)
         self.cmbRTSMWall_C = QComboBox()
-        self.cmbRTSMWall_C.addItems(walls.keys())
-        self.setRTSMItemToolTip(self.cmbRTSMWall_C, walls)
+        self.cmbRTSMWall_C.addItems(WALLS.keys())
+        self.setRTSMItemToolTip(self.cmbRTSMWall_C, WALLS.builtin)
         architecLeftlayout.addWidget(self.cmbRTSMWall_C, 11, 1)
         architecLeftlayout.addWidget(QLabel('<b>U</>'), 11, 2, Qt.AlignmentFlag.AlignRight)
         self.tbRTSMUWall_C = QDoubleSpinBox()
@@ -309,8 +326,8 @@ class Mainwindow(QMainWindow):
 		# region Wall D
         architecLeftlayout.addWidget(QLabel('Wall-D'), 13, 0, Qt.AlignmentFlag.AlignRight)
         self.cmbRTSMWall_D = QComboBox()
-        self.cmbRTSMWall_D.addItems(walls.keys())
-        self.setRTSMItemToolTip(self.cmbRTSMWall_D, walls)
+        self.cmbRTSMWall_D.addItems(WALLS.keys())
+        self.setRTSMItemToolTip(self.cmbRTSMWall_D, WALLS.builtin)
         architecLeftlayout.addWidget(self.cmbRTSMWall_D, 13, 1)
         architecLeftlayout.addWidget(QLabel('<b>U</>'), 13, 2, Qt.AlignmentFlag.AlignRight)
         self.tbRTSMUWall_D = QDoubleSpinBox()
@@ -530,100 +547,9 @@ class Mainwindow(QMainWindow):
 		# endregion
 
         # region Application Design Data
-        applicationBox = CollapsibleBox("Application Design Data")
-        rtsmGrid.addWidget(applicationBox)
-        applicationGrid = QGridLayout()
-
-        applicationGrid.addWidget(QLabel('Application'), 0, 0, Qt.AlignmentFlag.AlignRight)
-        self.cmbRTSMRoomType = QComboBox()
-        self.cmbRTSMRoomType.addItems(set(lpd_df['Space Types']))
-        applicationGrid.addWidget(self.cmbRTSMRoomType, 0, 1)
-        applicationGrid.addWidget(QLabel('Lighting PD (W/m²)'), 0, 2, 1, 2, Qt.AlignmentFlag.AlignRight)
-        self.tbRTSMLPD = QDoubleSpinBox()
-        self.tbRTSMLPD.setToolTip('Lighting Power Densities\nASHRAE Fundamentals 2021 p18.5 Table 2')
-        applicationGrid.addWidget(self.tbRTSMLPD, 0, 4)
-        applicationGrid.addWidget(QLabel('F.Space'), 0, 5, Qt.AlignmentFlag.AlignRight)
-        self.tbRTSMLightF_SPACE = QDoubleSpinBox()
-        self.tbRTSMLightF_SPACE.setToolTip('Space Fraction\nASHRAE Fundamentals 2021 p18.6')
-        applicationGrid.addWidget(self.tbRTSMLightF_SPACE, 0, 6)
-        applicationGrid.addWidget(QLabel('F.Rad'), 0, 7, Qt.AlignmentFlag.AlignRight)
-        self.tbRTSMLightF_RAD = QDoubleSpinBox()
-        self.tbRTSMLightF_RAD.setToolTip('Radiative Fraction\nASHRAE Fundamentals 2021 p18.6')
-        applicationGrid.addWidget(self.tbRTSMLightF_RAD, 0, 8)
-
-        applicationGrid.addWidget(QLabel('Usage'), 1, 0, Qt.AlignmentFlag.AlignRight)
-        self.LightingGrid = checkBoxHourlyTable(24, 20)
-        self.LightingGrid.setFixedHeight(45)
-        applicationGrid.addWidget(self.LightingGrid, 1, 1, 1, 8)
-
-        applicationGrid.addWidget(QLabel('Activity'), 2, 0, Qt.AlignmentFlag.AlignRight)
-        self.cmbRTSMActivity = QComboBox()
-        self.cmbRTSMActivity.addItems(human_hr_df['Degree of Activity'].tolist())
-        applicationGrid.addWidget(self.cmbRTSMActivity, 2, 1, 1, 2)
-        applicationGrid.addWidget(QLabel('SH'), 2, 3, Qt.AlignmentFlag.AlignRight)
-        self.tbRTSMPeopleSH = QSpinBox()
-        self.tbRTSMPeopleSH.setMaximum(500)
-        self.tbRTSMPeopleSH.setToolTip('Sensible Heat (W/Person)\nASHRAE Fundamentals 2021 p18.4')
-        applicationGrid.addWidget(self.tbRTSMPeopleSH, 2, 4)
-        applicationGrid.addWidget(QLabel('LH'), 2, 5, Qt.AlignmentFlag.AlignRight)
-        self.tbRTSMPeopleLH = QSpinBox()
-        self.tbRTSMPeopleLH.setMaximum(500)
-        self.tbRTSMPeopleLH.setToolTip('Latent Heat (W/Person)\nASHRAE Fundamentals 2021 p18.4')
-        applicationGrid.addWidget(self.tbRTSMPeopleLH, 2, 6)
-        applicationGrid.addWidget(QLabel('F.Rad'), 2, 7, Qt.AlignmentFlag.AlignRight)
-        self.tbRTSMPeopleF_RAD = QSpinBox()
-        self.tbRTSMPeopleF_RAD.setToolTip('Radiant Fraction\nASHRAE Fundamentals 2021 p18.4')
-        applicationGrid.addWidget(self.tbRTSMPeopleF_RAD, 2, 8)
-
-        applicationGrid.addWidget(QLabel('Persons'), 3, 0, Qt.AlignmentFlag.AlignRight)
-        self.PeopleGrid = numericHourlyTable(24, 20)
-        self.PeopleGrid.setFixedHeight(45)
-        applicationGrid.addWidget(self.PeopleGrid, 3, 1, 1, 8)
-
-        applicationGrid.addWidget(QLabel('Ventilation'), 4, 0, Qt.AlignmentFlag.AlignRight)
-        self.cmbRTSMVentilation = QComboBox()
-        self.cmbRTSMVentilation.addItems(ventilations.keys())
-        applicationGrid.addWidget(self.cmbRTSMVentilation, 4, 1)
-        self.tbRTSMVentilation = QDoubleSpinBox()
-        self.tbRTSMVentilation.setMaximum(10000)
-        self.tbRTSMVentilation.setFixedHeight(24)
-        applicationGrid.addWidget(self.tbRTSMVentilation, 4, 2)
-        applicationGrid.addWidget(QLabel('Rp'), 4, 3, Qt.AlignmentFlag.AlignRight)
-        self.tbRTSMRp = QDoubleSpinBox()
-        self.tbRTSMRp.setToolTip('People Outdoor Air Rate (cfm/Person)\nASHRAE Standard 62.1-2022 p6.16')
-        applicationGrid.addWidget(self.tbRTSMRp, 4, 4)
-        applicationGrid.addWidget(QLabel('Ra'), 4, 5, Qt.AlignmentFlag.AlignRight)
-        self.tbRTSMRa = QDoubleSpinBox()
-        self.tbRTSMRa.setToolTip('Area Outdoor Air Rate (cfm/Person)\nASHRAE Standard 62.1-2022 p6.16')
-        applicationGrid.addWidget(self.tbRTSMRa, 4, 6)
-        applicationGrid.addWidget(QLabel('Ez'), 4, 7, Qt.AlignmentFlag.AlignRight)
-        self.tbRTSMEz = QDoubleSpinBox()
-        self.tbRTSMEz.setToolTip('Zone Air Distribution Effectiveness\nASHRAE Standard 62.1-2022 p6.21')
-        self.tbRTSMEz.setValue(1)
-        applicationGrid.addWidget(self.tbRTSMEz, 4, 8)
-
-        applicationGrid.addWidget(QLabel('Equipment'), 5, 0, Qt.AlignmentFlag.AlignRight)
-        self.cmbRTSMEquipment = QComboBox()
-        self.cmbRTSMEquipment.addItems(equipments.keys())
-        applicationGrid.addWidget(self.cmbRTSMEquipment, 5, 1, 1, 2)
-        applicationGrid.addWidget(QLabel('SH'), 5, 3, Qt.AlignmentFlag.AlignRight)
-        self.tbRTSMEquipmentSH = QDoubleSpinBox()
-        self.tbRTSMEquipmentSH.setMaximum(50000)
-        self.tbRTSMEquipmentSH.setGroupSeparatorShown(True)
-        self.tbRTSMEquipmentSH.setDecimals(0)
-        applicationGrid.addWidget(self.tbRTSMEquipmentSH, 5, 4)
-        applicationGrid.addWidget(QLabel('LH'), 5, 5, Qt.AlignmentFlag.AlignRight)
-        self.tbRTSMEquipmentLH = QDoubleSpinBox()
-        self.tbRTSMEquipmentLH.setMaximum(50000)
-        self.tbRTSMEquipmentLH.setGroupSeparatorShown(True)
-        self.tbRTSMEquipmentLH.setDecimals(0)
-        applicationGrid.addWidget(self.tbRTSMEquipmentLH, 5, 6)
-        applicationGrid.addWidget(QLabel('No'), 5, 7, Qt.AlignmentFlag.AlignRight)
-        self.tbRTSMEquipmentNo = QSpinBox()
-        self.tbRTSMEquipmentNo.setValue(1)
-        applicationGrid.addWidget(self.tbRTSMEquipmentNo, 5, 8)
-
-        applicationBox.setContentLayout(applicationGrid)
+        self.applicationBox = CollapsibleBox("Application Design Data")
+        self.applicationBox.setContentFactory(self.RTSMApplicationContent)
+        rtsmGrid.addWidget(self.applicationBox)
 		# endregion
 
 		# region Cooling Load Calcualtion
@@ -848,6 +774,7 @@ class Mainwindow(QMainWindow):
         self.btnRTSM_DesignTempProfile.clicked.connect(self.profileChart)
         self.cmbRTSMSpaceType.currentIndexChanged.connect(self.RTSMSpaceType_changed)
         self.tbCompass.valueChanged.connect(self.RTSMCompasse_changed)
+        self.btnRTSMOrientation.clicked.connect(self.orientationChart)
         self.tbZoneLength.valueChanged.connect(self.RTSMLength_changed)
         self.tbZoneWidth.valueChanged.connect(self.RTSMWidth_changed)
         self.cmbRTSMRoofType.currentIndexChanged.connect(self.roofEnvelopment_changed)
@@ -868,15 +795,21 @@ class Mainwindow(QMainWindow):
         self.tbWinCWidth.valueChanged.connect(lambda checked, wall='Wall_C': self.ShowWindow(wall))
         self.tbWinDHigh.valueChanged.connect(lambda checked, wall='Wall_D': self.ShowWindow(wall))
         self.tbWinDWidth.valueChanged.connect(lambda checked, wall='Wall_D': self.ShowWindow(wall))
-        self.tbRTSMSafety.valueChanged.connect(self.RTSMCalculate)
-
-        self.cmbRTSMRoomType.currentIndexChanged.connect(self.cmbRTSMRoomType_changed)
-        self.cmbRTSMActivity.currentIndexChanged.connect(self.cmbRTSMActivity_changed)
-        self.cmbRTSMVentilation.currentIndexChanged.connect(self.cmbRTSMVentilation_changed)
-        self.cmbRTSMEquipment.currentIndexChanged.connect(self.cmbRTSMEquipment_changed)
-        self.cmbRTSMOutUnit.currentIndexChanged.connect(self.RTSMCalculate)
-
-        self.btnRTSMCalculate.clicked.connect(self.RTSMCalculate)
+        self.tbRTSMSafety.valueChanged.connect(self.RTSMPresent)
+
+        self.cmbRTSMOutUnit.currentIndexChanged.connect(self.RTSMPresent)
+
+        self.btnRTSMCalculate.clicked.connect(self.RTSMRequestCalculate)
+        self.calc = CalcScheduler(parent=self)
+        self.calc.finished.connect(self.RTSMCalculated)
+        self.calc.failed.connect(self.RTSMCalculateFailed)
+        # sweeps get their own worker, a zone calculation does not cancel them, `SETTING_LOCK` keeps both apart
+        self.sweeps = CalcScheduler(debounce_ms=0, parent=self)
+        self.sweeps.finished.connect(self.orientationChartReady)
+        self.sweeps.failed.connect(self.orientationChartFailed)
+        self.summaries = CalcScheduler(debounce_ms=0, parent=self)
+        self.summaries.finished.connect(self.RTSMSummaryReady)
+        self.summaries.failed.connect(self.RTSMSummaryFailed)
         self.btnRTSMSolar.clicked.connect(self.RTSMReport)
         self.btnRTSMConfig.clicked.connect(self.RTSMConfig)
         self.btnRTSMOutRoof.clicked.connect(self.RTSMReport)
@@ -904,8 +837,13 @@ class Mainwindow(QMainWindow):
         self.btnAbout.clicked.connect(self.About)
 		# endregion
 
-        self.zone_weather = WeatherData()
-        self.zone = ComfortZone(self.tbRTSMName.text(), weather=self.zone_weather)
+        probe.mark('window widgets')
+        # created by the first calculation
+        self.zone_weather = None
+        self.incremental = IncrementalZone()
+        self.zone = None
+        self.results = None
+        self.zone_state = None
         self.cmbRTSMLocation.currentIndexChanged.emit(0)
         self.cmbRTSMSpaceType.currentIndexChanged.emit(0)
         self.cmbRTSMRoofType.currentIndexChanged.emit(0)
@@ -920,40 +858,144 @@ class Mainwindow(QMainWindow):
         self.cmbRTSMWall_A.currentIndexChanged.emit(0)
         self.cmbRTSMWin_A.setCurrentIndex(1)
 
+        self.setCentralWidget(self.widget)
+        self.setFixedWidth(600)
+        probe.mark('defaults')
+
+    def RTSMApplicationContent(self):
+        """Application Design Data section, built on its first expand or when the form is read or applied"""
+        from pyMEP.hvac.coolingload import Setting
+        from pyMEP.hvac.people import human_hr_df
+        applicationGrid = QGridLayout()
+
+        applicationGrid.addWidget(QLabel('Application'), 0, 0, Qt.AlignmentFlag.AlignRight)
+        self.cmbRTSMRoomType = QComboBox()
+        self.cmbRTSMRoomType.addItems(room_types())
+        applicationGrid.addWidget(self.cmbRTSMRoomType, 0, 1)
+        applicationGrid.addWidget(QLabel('Lighting PD (W/m²)'), 0, 2, 1, 2, Qt.AlignmentFlag.AlignRight)
+        self.tbRTSMLPD = QDoubleSpinBox()
+        self.tbRTSMLPD.setToolTip('Lighting Power Densities\nASHRAE Fundamentals 2021 p18.5 Table 2')
+        applicationGrid.addWidget(self.tbRTSMLPD, 0, 4)
+        applicationGrid.addWidget(QLabel('F.Space'), 0, 5, Qt.AlignmentFlag.AlignRight)
+        self.tbRTSMLightF_SPACE = QDoubleSpinBox()
+        self.tbRTSMLightF_SPACE.setToolTip('Space Fraction\nASHRAE Fundamentals 2021 p18.6')
+        applicationGrid.addWidget(self.tbRTSMLightF_SPACE, 0, 6)
+        applicationGrid.addWidget(QLabel('F.Rad'), 0, 7, Qt.AlignmentFlag.AlignRight)
+        self.tbRTSMLightF_RAD = QDoubleSpinBox()
+        self.tbRTSMLightF_RAD.setToolTip('Radiative Fraction\nASHRAE Fundamentals 2021 p18.6')
+        applicationGrid.addWidget(self.tbRTSMLightF_RAD, 0, 8)
+
+        applicationGrid.addWidget(QLabel('Usage'), 1, 0, Qt.AlignmentFlag.AlignRight)
+        self.LightingGrid = checkBoxHourlyTable(24, 20)
+        self.LightingGrid.setFixedHeight(45)
+        applicationGrid.addWidget(self.LightingGrid, 1, 1, 1, 8)
+
+        applicationGrid.addWidget(QLabel('Activity'), 2, 0, Qt.AlignmentFlag.AlignRight)
+        self.cmbRTSMActivity = QComboBox()
+        self.cmbRTSMActivity.addItems(human_hr_df['Degree of Activity'].tolist())
+        applicationGrid.addWidget(self.cmbRTSMActivity, 2, 1, 1, 2)
+        applicationGrid.addWidget(QLabel('SH'), 2, 3, Qt.AlignmentFlag.AlignRight)
+        self.tbRTSMPeopleSH = QSpinBox()
+        self.tbRTSMPeopleSH.setMaximum(500)
+        self.tbRTSMPeopleSH.setToolTip('Sensible Heat (W/Person)\nASHRAE Fundamentals 2021 p18.4')
+        applicationGrid.addWidget(self.tbRTSMPeopleSH, 2, 4)
+        applicationGrid.addWidget(QLabel('LH'), 2, 5, Qt.AlignmentFlag.AlignRight)
+        self.tbRTSMPeopleLH = QSpinBox()
+        self.tbRTSMPeopleLH.setMaximum(500)
+        self.tbRTSMPeopleLH.setToolTip('Latent Heat (W/Person)\nASHRAE Fundamentals 2021 p18.4')
+        applicationGrid.addWidget(self.tbRTSMPeopleLH, 2, 6)
+        applicationGrid.addWidget(QLabel('F.Rad'), 2, 7, Qt.AlignmentFlag.AlignRight)
+        self.tbRTSMPeopleF_RAD = QSpinBox()
+        self.tbRTSMPeopleF_RAD.setToolTip('Radiant Fraction\nASHRAE Fundamentals 2021 p18.4')
+        applicationGrid.addWidget(self.tbRTSMPeopleF_RAD, 2, 8)
+
+        applicationGrid.addWidget(QLabel('Persons'), 3, 0, Qt.AlignmentFlag.AlignRight)
+        self.PeopleGrid = numericHourlyTable(24, 20)
+        self.PeopleGrid.setFixedHeight(45)
+        applicationGrid.addWidget(self.PeopleGrid, 3, 1, 1, 8)
+
+        applicationGrid.addWidget(QLabel('Ventilation'), 4, 0, Qt.AlignmentFlag.AlignRight)
+        self.cmbRTSMVentilation = QComboBox()
+        self.cmbRTSMVentilation.addItems(ventilations.keys())
+        applicationGrid.addWidget(self.cmbRTSMVentilation, 4, 1)
+        self.tbRTSMVentilation = QDoubleSpinBox()
+        self.tbRTSMVentilation.setMaximum(10000)
+        self.tbRTSMVentilation.setFixedHeight(24)
+        applicationGrid.addWidget(self.tbRTSMVentilation, 4, 2)
+        applicationGrid.addWidget(QLabel('Rp'), 4, 3, Qt.AlignmentFlag.AlignRight)
+        self.tbRTSMRp = QDoubleSpinBox()
+        self.tbRTSMRp.setToolTip('People Outdoor Air Rate (cfm/Person)\nASHRAE Standard 62.1-2022 p6.16')
+        applicationGrid.addWidget(self.tbRTSMRp, 4, 4)
+        applicationGrid.addWidget(QLabel('Ra'), 4, 5, Qt.AlignmentFlag.AlignRight)
+        self.tbRTSMRa = QDoubleSpinBox()
+        self.tbRTSMRa.setToolTip('Area Outdoor Air Rate (cfm/Person)\nASHRAE Standard 62.1-2022 p6.16')
+        applicationGrid.addWidget(self.tbRTSMRa, 4, 6)
+        applicationGrid.addWidget(QLabel('Ez'), 4, 7, Qt.AlignmentFlag.AlignRight)
+        self.tbRTSMEz = QDoubleSpinBox()
+        self.tbRTSMEz.setToolTip('Zone Air Distribution Effectiveness\nASHRAE Standard 62.1-2022 p6.21')
+        self.tbRTSMEz.setValue(1)
+        applicationGrid.addWidget(self.tbRTSMEz, 4, 8)
+
+        applicationGrid.addWidget(QLabel('Equipment'), 5, 0, Qt.AlignmentFlag.AlignRight)
+        self.cmbRTSMEquipment = QComboBox()
+        self.cmbRTSMEquipment.addItems(equipments.keys())
+        applicationGrid.addWidget(self.cmbRTSMEquipment, 5, 1, 1, 2)
+        applicationGrid.addWidget(QLabel('SH'), 5, 3, Qt.AlignmentFlag.AlignRight)
+        self.tbRTSMEquipmentSH = QDoubleSpinBox()
+        self.tbRTSMEquipmentSH.setMaximum(50000)
+        self.tbRTSMEquipmentSH.setGroupSeparatorShown(True)
+        self.tbRTSMEquipmentSH.setDecimals(0)
+        applicationGrid.addWidget(self.tbRTSMEquipmentSH, 5, 4)
+        applicationGrid.addWidget(QLabel('LH'), 5, 5, Qt.AlignmentFlag.AlignRight)
+        self.tbRTSMEquipmentLH = QDoubleSpinBox()
+        self.tbRTSMEquipmentLH.setMaximum(50000)
+        self.tbRTSMEquipmentLH.setGroupSeparatorShown(True)
+        self.tbRTSMEquipmentLH.setDecimals(0)
+        applicationGrid.addWidget(self.tbRTSMEquipmentLH, 5, 6)
+        applicationGrid.addWidget(QLabel('No'), 5, 7, Qt.AlignmentFlag.AlignRight)
+        self.tbRTSMEquipmentNo = QSpinBox()
+        self.tbRTSMEquipmentNo.setValue(1)
+        applicationGrid.addWidget(self.tbRTSMEquipmentNo, 5, 8)
+
+
+        self.cmbRTSMRoomType.currentIndexChanged.connect(self.cmbRTSMRoomType_changed)
+        self.cmbRTSMActivity.currentIndexChanged.connect(self.cmbRTSMActivity_changed)
+        self.cmbRTSMVentilation.currentIndexChanged.connect(self.cmbRTSMVentilation_changed)
+        self.cmbRTSMEquipment.currentIndexChanged.connect(self.cmbRTSMEquipment_changed)
+
         self.cmbRTSMRoomType.setCurrentText('Office')
         self.tbRTSMLightF_SPACE.setValue(Setting.Lighting_F_space)
         self.tbRTSMLightF_RAD.setValue(Setting.Lighting_F_rad)
         self.cmbRTSMActivity.currentIndexChanged.emit(0)
         self.cmbRTSMVentilation.currentIndexChanged.emit(0)
         self.cmbRTSMEquipment.setCurrentText(default_eqp)
-
-        self.setCentralWidget(self.widget)
-        self.setFixedWidth(600)
+        return applicationGrid
 
     def setRTSMItemToolTip(self, combo: QComboBox, toolTipDict):
         for i in range(combo.count()):
-            combo.setItemData(i, toolTipDict.get(combo.itemText(i)).Description, Qt.ItemDataRole.ToolTipRole)
+            item = toolTipDict.get(combo.itemText(i))
+            if item is not None: combo.setItemData(i, item.Description, Qt.ItemDataRole.ToolTipRole)
 
     def RTSMLocation_changed(self):
-        location = locations.get(self.cmbRTSMLocation.currentText())
-        self.zone_weather.ID = location.Location
+        location = stations()[self.cmbRTSMLocation.currentIndex()]
         self.tbRTSMLatitude.setValue(location.Lat)
         self.tbRTSMLongtitude.setValue(location.Long)
         self.tbRTSMAltitude.setValue(location.Elev)
         self.tbRTSMOutsideDB.setValue(location.T_db_des)
         self.tbRTSMDBRange.setValue(location.T_db_rng)
         self.tbRTSMOutsideWB.setValue(location.T_wb_mc)
+        self.tbRTSMWBRange.setValue(stations().wb_range(self.cmbRTSMLocation.currentIndex()))
         self.tbRTSMtaub.setValue(location.taub)
         self.tbRTSMtaud.setValue(location.taud)
         self.tbRTSMtz.setText(('+' if location.tz>0 else '') + str(location.tz))
         self.tbRTSMMonth.setText(location.ReferenceDates)
-        self.zone_weather.altitude = Q_(location.Elev, 'm')
 
     def profileChart(self):
-        if self.tbRTSMOutTotalAll.text() == '0': self.RTSMCalculate()
+        self.RTSMCalculate(full=True)
         """Shows a diagram with the hourly values (in solar time) of the dry-bulb
             and the wet-bulb temperature on the date (the design day) indicated when
             instantiating the `WeatherData` object."""
+        from pyMEP.charts.chart_2D import LineChart
         chart = LineChart(window_title = f'Design Temperature Profile {self.zone_weather.date}')
         if self.zone_weather.T_db_prof is not None:
             x_data = [hr for hr in range(1,25)]
@@ -976,6 +1018,38 @@ class Mainwindow(QMainWindow):
         chart.add_legend(anchor='upper left', position = (0.01, 0.99))
         chart.show()
 
+    def orientationChart(self):
+        """Peak cooling load of the zone rotated through the compass in 15° steps, to pick the building rotation.
+        The sweep and the current angle are both pyMEP calculations, the same engine as the form, run on the
+        sweep worker so the window stays responsive. The chart opens when the sweep finishes."""
+        self.sweepCompass = self.tbCompass.value()
+        angles = np.union1d(np.arange(-180, 181, 15), [self.sweepCompass])
+        self.btnRTSMOrientation.setEnabled(False)
+        self.sweeps.request(partial(orientation_sweep, self.RTSMSpec(), angles, reference=True))
+
+    def orientationChartReady(self, sweep):
+        self.btnRTSMOrientation.setEnabled(True)
+        compass = self.sweepCompass
+        unit = self.cmbRTSMOutUnit.currentText()
+        factor = 1 if unit == 'Watt' else WATT_BTU_HR
+        from pyMEP.charts.chart_2D import LineChart
+        chart = LineChart(window_title = 'Peak Cooling Load vs Orientation')
+        chart.add_xy_data(label=f'Peak Cooling Load ({unit})',
+                          x1_values=sweep.Compass.tolist(),
+                          y1_values=(sweep.Peak * factor).tolist())
+        chart.add_xy_data(label=f'Current ({compass}°)',
+                          x1_values=[compass],
+                          y1_values=[sweep.Peak[np.searchsorted(sweep.Compass, compass)] * factor],
+                          style_props={'marker': 'o', 'color':'r'})
+        chart.x1.add_title('orientation from north, degree')
+        chart.y1.add_title(unit)
+        chart.add_legend(anchor='upper left', position = (0.01, 0.99))
+        chart.show()
+
+    def orientationChartFailed(self, message):
+        self.btnRTSMOrientation.setEnabled(True)
+        QMessageBox.warning(self, 'Peak Cooling Load vs Orientation', message)
+
     def RTSMSpaceType_changed(self):
         self.spaceTypeGraphic.setFloor(self.cmbRTSMSpaceType.currentIndex())
 
@@ -989,17 +1063,18 @@ class Mainwindow(QMainWindow):
         self.architecGraphic.setWidth(self.tbZoneWidth.value())
 
     def roofEnvelopment_changed(self):
-        roof = roofs.get(self.cmbRTSMRoofType.currentText())
+        roof = ROOFS.get(self.cmbRTSMRoofType.currentText())
         self.tbRTSMURoof.setValue(roof.U)
         self.cmbRTSMRoofType.setToolTip(roof.Description)
 
     def floorEnvelopment_changed(self):
-        floor = floors.get(self.cmbRTSMFloorType.currentText())
+        floor = FLOORS.get(self.cmbRTSMFloorType.currentText())
         self.tbRTSMUFloor.setValue(floor.U)
         self.cmbRTSMFloorType.setToolTip(floor.Description)
 
     def wallA_Envelopment_changed(self):
-        wall = walls.get(self.cmbRTSMWall_A.currentText())
+        from pyMEP.hvac.coolingload import Setting
+        wall = WALLS.get(self.cmbRTSMWall_A.currentText())
         self.tbRTSMUWall_A.setValue(wall.U)
         self.windowTab.setTabEnabled(0, wall.isExternal)
         if wall.isExternal: self.windowTab.setCurrentIndex(0)
@@ -1016,7 +1091,8 @@ class Mainwindow(QMainWindow):
         self.cmbRTSMWall_A.setToolTip(wall.Description)
 
     def wallB_Envelopment_changed(self):
-        wall = walls.get(self.cmbRTSMWall_B.currentText())
+        from pyMEP.hvac.coolingload import Setting
+        wall = WALLS.get(self.cmbRTSMWall_B.currentText())
         self.tbRTSMUWall_B.setValue(wall.U)
         self.windowTab.setTabEnabled(1, wall.isExternal)
         if wall.isExternal: self.windowTab.setCurrentIndex(1)
@@ -1033,7 +1109,8 @@ class Mainwindow(QMainWindow):
         self.cmbRTSMWall_B.setToolTip(wall.Description)
 
     def wallC_Envelopment_changed(self):
-        wall = walls.get(self.cmbRTSMWall_C.currentText())
+        from pyMEP.hvac.coolingload import Setting
+        wall = WALLS.get(self.cmbRTSMWall_C.currentText())
         self.tbRTSMUWall_C.setValue(wall.U)
         self.windowTab.setTabEnabled(2, wall.isExternal)
         if wall.isExternal: self.windowTab.setCurrentIndex(2)
@@ -1050,7 +1127,8 @@ class Mainwindow(QMainWindow):
         self.cmbRTSMWall_C.setToolTip(wall.Description)
 
     def wallD_Envelopment_changed(self):
-        wall = walls.get(self.cmbRTSMWall_D.currentText())
+        from pyMEP.hvac.coolingload import Setting
+        wall = WALLS.get(self.cmbRTSMWall_D.currentText())
         self.tbRTSMUWall_D.setValue(wall.U)
         self.windowTab.setTabEnabled(3, wall.isExternal)
         if wall.isExternal: self.windowTab.setCurrentIndex(3)
@@ -1131,31 +1209,34 @@ class Mainwindow(QMainWindow):
         h, w = 0, 0
         match wall:
             case 'Wall_A':
-                wallExternal = walls.get(self.cmbRTSMWall_A.currentText()).isExternal
+                wallExternal = WALLS.get(self.cmbRTSMWall_A.currentText()).isExternal
                 h = self.tbWinAHigh.value()
                 w = self.tbWinAWidth.value()
             case 'Wall_B':
-                wallExternal = walls.get(self.cmbRTSMWall_B.currentText()).isExternal
+                wallExternal = WALLS.get(self.cmbRTSMWall_B.currentText()).isExternal
                 h = self.tbWinBHigh.value()
                 w = self.tbWinBWidth.value()
             case 'Wall_C':
-                wallExternal = walls.get(self.cmbRTSMWall_C.currentText()).isExternal
+                wallExternal = WALLS.get(self.cmbRTSMWall_C.currentText()).isExternal
                 h = self.tbWinCHigh.value()
                 w = self.tbWinCWidth.value()
             case 'Wall_D':
-                wallExternal = walls.get(self.cmbRTSMWall_D.currentText()).isExternal
+                wallExternal = WALLS.get(self.cmbRTSMWall_D.currentText()).isExternal
                 h = self.tbWinDHigh.value()
                 w = self.tbWinDWidth.value()
         isHasWindow = wallExternal and h>0 and w > 0
         self.architecGraphic.setWallWindow(wall= wall, isHasWindow= isHasWindow)
 
     def cmbRTSMRoomType_changed(self):
+        from pyMEP.hvac.lighting import LightingPowerDensities
+        from pyMEP.hvac.people import human_vrp_df
         self.tbRTSMLPD.setValue(LightingPowerDensities(space_type=self.cmbRTSMRoomType.currentText()))
         vrp = human_vrp_df[human_vrp_df['Space Types'].str.match(self.cmbRTSMRoomType.currentText())]
         self.tbRTSMRp.setValue(vrp['Rp'].values[0])
         self.tbRTSMRa.setValue(vrp['Ra'].values[0])
 
     def cmbRTSMActivity_changed(self):
+        from pyMEP.hvac.people import HumanHeatRate
         heatrate = HumanHeatRate(activity=self.cmbRTSMActivity.currentText())
         self.tbRTSMPeopleSH.setValue(heatrate[0])
         self.tbRTSMPeopleLH.setValue(heatrate[1])
@@ -1169,11 +1250,12 @@ class Mainwindow(QMainWindow):
         Rp = float(self.tbRTSMRp.value())
         Pz = max(self.PeopleGrid.value())
         Ra = float(self.tbRTSMRa.value())
-        Az = self.zone.Area.to('foot ** 2').m
+        Az = self.tbZoneWidth.value() * self.tbZoneLength.value() / 0.3048**2
         Ez = float(self.tbRTSMEz.value())
         return (Rp * Pz + Ra * Az)/Ez
 
     def cmbRTSMEquipment_changed(self):
+        from pyMEP.hvac.equipment import EquipmentPowerDensities
         sender = self.cmbRTSMEquipment.currentText()
         if sender == default_eqp:
             self.tbRTSMEquipmentSH.setValue(EquipmentPowerDensities(space_type=self.cmbRTSMRoomType.currentText()))
@@ -1181,228 +1263,128 @@ class Mainwindow(QMainWindow):
             self.tbRTSMEquipmentSH.setValue(equipments.get(sender).SH)
             self.tbRTSMEquipmentLH.setValue(equipments.get(sender).LH)
 
-    def RTSMCalculate(self):
-        self.zone.ID = self.tbRTSMName.text()
-        self.zone_weather.fi = Q_(self.tbRTSMLatitude.value(), 'deg')
-        self.zone_weather.L_loc = Q_(self.tbRTSMLongtitude.value(), 'deg')
-        self.zone_weather.altitude = Q_(self.tbRTSMAltitude.value(), 'm')
-        self.zone_weather.T_db_des = Q_(self.tbRTSMOutsideDB.value(), 'degC')
-        self.zone_weather.T_db_rng = Q_(self.tbRTSMDBRange.value(), 'delta_degC')
-        self.zone_weather.T_wb_mc = Q_(self.tbRTSMOutsideWB.value(), 'degC')
-        self.zone_weather.taub = self.tbRTSMtaub.value()
-        self.zone_weather.taud = self.tbRTSMtaud.value()
-        self.zone_weather.tz = int(self.tbRTSMtz.text())
-        self.zone_weather.date = ReferenceDates.get_date_for(self.tbRTSMMonth.text())
-        self.zone_weather.synthetic_daily_db_profiles()
-
-        Setting.Inside_DB = Q_(self.tbRTSMInsideDB.value(), 'degC')
-        Setting.Inside_RH = self.tbRTSMInsideRH.value()/100
-        self.zone.SpaceType = space_types.index(self.cmbRTSMSpaceType.currentText())
-        self.zone.Oreintation = self.tbCompass.value()
-        self.zone.Width = Q_(self.tbZoneWidth.value(), 'm')
-        self.zone.Length = Q_(self.tbZoneLength.value(), 'm')
-        self.zone.Height = Q_(self.tbZoneHeight.value() , 'm')
-
-        # region Roof & Floor
-        self.zone.Roof.weather_data = self.zone_weather
-        self.zone.Roof.net_area = self.zone.Area
-        self.zone.Roof.U = self.tbRTSMURoof.value()
-        self.zone.Roof.CTS = roofs.get(self.cmbRTSMRoofType.currentText()).CTS
-
-        self.zone.Floor.weather_data = self.zone_weather
-        self.zone.Floor.net_area = self.zone.Area
-        self.zone.Floor.U = self.tbRTSMURoof.value()
-        self.zone.Floor.CTS = floors.get(self.cmbRTSMFloorType.currentText()).CTS
-        self.zone.Floor.delta_T = Q_(self.tbRTSMOptionFloor.value(), 'delta_degC')
-        # endregion
-
-        # region Wall-A
-        self.zone.Wall_A.weather_data = self.zone_weather
-        self.zone.Wall_A.net_area = self.zone.Height * self.zone.Length
-        self.zone.Wall_A.U = self.tbRTSMUWall_A.value()
-        self.zone.Wall_A.CTS = walls.get(self.cmbRTSMWall_A.currentText()).CTS
-        self.zone.Wall_A.wall_type = Wall.WallType.External if walls.get(self.cmbRTSMWall_A.currentText()).isExternal else Wall.WallType.Internal
-        self.zone.Wall_A.clear_window()
-
-        if walls.get(self.cmbRTSMWall_A.currentText()).isExternal:
-            self.zone.Wall_A.surface_absorptance = self.tbRTSMOptionWall_A.value()
-            win_w = Q_(self.tbWinAWidth.value(), 'm')
-            win_h = Q_(self.tbWinAHigh.value(), 'm')
-            if win_w>0 and win_h>0 and self.cmbRTSMWin_A.currentText() != 'None':
-                self.zone.Wall_A.add_window(id='Win-A', width=win_w, height=win_h, U=self.tbRTSMUWin_A.value(), SC=self.tbRTSMSCWin_A.value())
-                window = windows.get(self.cmbRTSMWin_A.currentText())
-                win = self.zone.Wall_A.windows.get('Win-A')
-                win.SHGCd = [window.SHGCd0, window.SHGCd4, window.SHGCd5, window.SHGCd6, window.SHGCd7, window.SHGCd8, 0]
-                win.SHGCh = window.SHGCh
-        else:
-            self.zone.Wall_A.delta_T = Q_(self.tbRTSMOptionWall_A.value(), 'delta_degC')
-        # endregion
-
-        # region Wall-B
-        self.zone.Wall_B.weather_data = self.zone_weather
-        self.zone.Wall_B.net_area = self.zone.Height * self.zone.Width
-        self.zone.Wall_B.U = self.tbRTSMUWall_B.value()
-        self.zone.Wall_B.CTS = walls.get(self.cmbRTSMWall_B.currentText()).CTS
-        self.zone.Wall_B.wall_type = Wall.WallType.External if walls.get(self.cmbRTSMWall_B.currentText()).isExternal else Wall.WallType.Internal
-        self.zone.Wall_B.clear_window()
-
-        if walls.get(self.cmbRTSMWall_B.currentText()).isExternal:
-            self.zone.Wall_B.surface_absorptance = self.tbRTSMOptionWall_B.value()
-            win_w = Q_(self.tbWinBWidth.value(), 'm')
-            win_h = Q_(self.tbWinBHigh.value(), 'm')
-            if win_w>0 and win_h>0 and self.cmbRTSMWin_B.currentText() != 'None':
-                self.zone.Wall_B.add_window(id='Win-B', width=win_w, height=win_h, U=self.tbRTSMUWin_B.value(), SC=self.tbRTSMSCWin_B.value())
-                window = windows.get(self.cmbRTSMWin_B.currentText())
-                win = self.zone.Wall_B.windows.get('Win-B')
-                win.SHGCd = [window.SHGCd0, window.SHGCd4, window.SHGCd5, window.SHGCd6, window.SHGCd7, window.SHGCd8, 0]
-                win.SHGCh = window.SHGCh
-        else:
-            self.zone.Wall_B.delta_T = Q_(self.tbRTSMOptionWall_B.value(), 'delta_degC')
-        # endregion
-
-        # region Wall-C
-        self.zone.Wall_C.weather_data = self.zone_weather
-        self.zone.Wall_C.net_area = self.zone.Height * self.zone.Length
-        self.zone.Wall_C.U = self.tbRTSMUWall_C.value()
-        self.zone.Wall_C.CTS = walls.get(self.cmbRTSMWall_C.currentText()).CTS
-        self.zone.Wall_C.wall_type = Wall.WallType.External if walls.get(self.cmbRTSMWall_C.currentText()).isExternal else Wall.WallType.Internal
-        self.zone.Wall_C.clear_window()
-
-        if walls.get(self.cmbRTSMWall_C.currentText()).isExternal:
-            self.zone.Wall_C.surface_absorptance = self.tbRTSMOptionWall_C.value()
-            win_w = Q_(self.tbWinCWidth.value(), 'm')
-            win_h = Q_(self.tbWinCHigh.value(), 'm')
-            if win_w>0 and win_h>0 and self.cmbRTSMWin_C.currentText() != 'None':
-                self.zone.Wall_C.add_window(id='Win-C', width=win_w, height=win_h, U=self.tbRTSMUWin_C.value(), SC=self.tbRTSMSCWin_C.value())
-                window = windows.get(self.cmbRTSMWin_C.currentText())
-                win = self.zone.Wall_C.windows.get('Win-C')
-                win.SHGCd = [window.SHGCd0, window.SHGCd4, window.SHGCd5, window.SHGCd6, window.SHGCd7, window.SHGCd8, 0]
-                win.SHGCh = window.SHGCh
-        else:
-            self.zone.Wall_C.delta_T = Q_(self.tbRTSMOptionWall_C.value(), 'delta_degC')
-        # endregion
-
-        # region Wall-D
-        self.zone.Wall_D.weather_data = self.zone_weather
-        self.zone.Wall_D.net_area = self.zone.Height * self.zone.Width
-        self.zone.Wall_D.U = self.tbRTSMUWall_D.value()
-        self.zone.Wall_D.CTS = walls.get(self.cmbRTSMWall_D.currentText()).CTS
-        self.zone.Wall_D.wall_type = Wall.WallType.External if walls.get(self.cmbRTSMWall_D.currentText()).isExternal else Wall.WallType.Internal
-        self.zone.Wall_D.clear_window()
-
-        if walls.get(self.cmbRTSMWall_D.currentText()).isExternal:
-            self.zone.Wall_D.surface_absorptance = self.tbRTSMOptionWall_D.value()
-            win_w = Q_(self.tbWinDWidth.value(), 'm')
-            win_h = Q_(self.tbWinDHigh.value(), 'm')
-            if win_w>0 and win_h>0 and self.cmbRTSMWin_D.currentText() != 'None':
-                self.zone.Wall_D.add_window(id='Win-D', width=win_w, height=win_h, U=self.tbRTSMUWin_D.value(), SC=self.tbRTSMSCWin_D.value())
-                window = windows.get(self.cmbRTSMWin_D.currentText())
-                win = self.zone.Wall_D.windows.get('Win-D')
-                win.SHGCd = [window.SHGCd0, window.SHGCd4, window.SHGCd5, window.SHGCd6, window.SHGCd7, window.SHGCd8, 0]
-                win.SHGCh = window.SHGCh
-        else:
-            self.zone.Wall_D.delta_T = Q_(self.tbRTSMOptionWall_D.value(), 'delta_degC')
-        # endregion
-
-        zone_light = self.zone.Light_HeatGain.get_lighting('ls0')
-        zone_light.power_density = Q_(self.tbRTSMLPD.value(), 'W / m ** 2')
-        zone_light.A_floor = self.zone.Area
-        zone_light.F_space = Q_(self.tbRTSMLightF_SPACE.value(),'').to('%')
-        zone_light.F_rad = Q_(self.tbRTSMLightF_RAD.value(),'').to('%')
-        self.zone.Light_HeatGain.UpdateUsageProfile(self.LightingGrid.value())
-
-        self.zone.People_HeatGain.occupants.Q_dot_sen_person = Q_(self.tbRTSMPeopleSH.value(), 'W')
-        self.zone.People_HeatGain.occupants.Q_dot_lat_person = Q_(self.tbRTSMPeopleLH.value(), 'W')
-        self.zone.People_HeatGain.occupants.F_rad = Q_(self.tbRTSMPeopleF_RAD.value(), '%')
-        self.zone.People_HeatGain.UpdateUsageProfile(self.PeopleGrid.value())
-
-        self.tbRTSMVentilation.setVisible(True)
-        match self.cmbRTSMVentilation.currentText():
-            case 'ASHRAE 62.1':
-                Vbz = self.vbzCalculate()
-                self.tbRTSMVentilation.setValue(Vbz)
-                self.zone.Ventilation = Q_(Vbz, 'cubic_foot/minute')
-            case 'cfm/Person':
-                self.zone.Ventilation = Q_(max(self.zone.People_HeatGain.usage_profile) * self.tbRTSMVentilation.value(), 'cubic_foot/minute')
-            case 'cfm/ft²':
-                self.zone.Ventilation = Q_(self.zone.Area.to('foot ** 2').m * self.tbRTSMVentilation.value(), 'cubic_foot/minute')
-            case 'Air Change':
-                self.zone.Ventilation = Q_((self.zone.Area * self.zone.Height).to('cubic_foot').m * self.tbRTSMVentilation.value()/60, 'cubic_foot/minute')
-            case 'cfm':
-                self.zone.Ventilation = Q_(self.tbRTSMVentilation.value(), 'cubic_foot/minute')
-
-        zone_equipment = self.zone.Equipment_HeatGain.get_equipment('eqp0')
-        eqp_sen = self.tbRTSMEquipmentSH.value()
-        eqp_lat = self.tbRTSMEquipmentLH.value()
-        if self.cmbRTSMEquipment.currentText() == default_eqp:
-            eqp_sen = (self.zone.Area * self.tbRTSMEquipmentSH.value()).m
-            eqp_lat = (self.zone.Area * self.tbRTSMEquipmentLH.value()).m
-        zone_equipment.F_rad = Q_(Setting.Equipment_Generic_F_rad * 100, '%')
-        zone_equipment.Q_dot_sen_pcs = Q_(eqp_sen, 'W') * self.tbRTSMEquipmentNo.value()
-        zone_equipment.Q_dot_lat_pcs = Q_(eqp_lat, 'W') * self.tbRTSMEquipmentNo.value()
-        self.zone.Equipment_HeatGain.UpdateUsageProfile(self.LightingGrid.value())
-        self.zone.safety = Q_(self.tbRTSMSafety.value(),'%')
-        Setting.tsm_export = self.cbTSMExport.isChecked()
-
-        print('>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> CALCULATING <<<<<<<<<<<<<<<<<<<<<<<<<<<<<<')
-        self.zone.Calculate()
-
-        i = self.zone.max_hr[0]
+    def RTSMChanged(self, spec):
+        """Calculation state of `spec` when it needs a new calculation, None when only the presentation changed"""
+        from pyMEP.hvac.coolingload import Setting
+        with SETTING_LOCK:
+            Setting.tsm_export = self.cbTSMExport.isChecked()
+        if spec.ventilation_mode == 'ASHRAE 62.1':
+            # the hidden field shows the 62.1 flow, set before the state is taken so the next one matches it
+            with self.RTSMSignalsBlocked():
+                self.tbRTSMVentilation.setValue(spec.ventilation_cfm())
+            spec.application.tbVentilation = self.tbRTSMVentilation.value()
+        zone_state = calc_state(spec)
+        # safety, output unit or name edits only need the presentation redone, the TSM export always recalculates
+        if Setting.tsm_export or self.zone_state is None or dirty_stages(self.zone_state, zone_state) - {'presentation'}:
+            return zone_state
+        return None
+
+    def RTSMCalculate(self, full=False):
+        """Synchronous calculation, for the reports and charts that need the results right away.
+        With `full` every pyMEP surface is recalculated, the per surface reports read them."""
+        from pyMEP.hvac.coolingload import Setting
+        self.calc.cancel()
+        self.calc.pool.waitForDone()
+        self.btnRTSMCalculate.setText('Calculate')
+        spec = self.RTSMSpec()
+        zone_state = self.RTSMChanged(spec)
+        if zone_state is None and full and self.incremental.partial:
+            zone_state = calc_state(spec)
+        if zone_state is not None:
+            self.results, self.zone_state = calculate_zone(self.incremental, spec, zone_state, full or Setting.tsm_export)
+            self.zone = self.incremental.zone
+            self.zone_weather = self.zone.weather_data
+            self.RTSMShowTimings()
+        self.RTSMPresent()
+
+    def RTSMRequestCalculate(self):
+        """Calculates on the worker thread, the latest request within the debounce window wins"""
+        from pyMEP.hvac.coolingload import Setting
+        spec = self.RTSMSpec()
+        zone_state = self.RTSMChanged(spec)
+        if zone_state is None:
+            self.calc.cancel()
+            self.btnRTSMCalculate.setText('Calculate')
+            return self.RTSMPresent()
+        self.btnRTSMCalculate.setText('Calculating...')
+        self.calc.request(partial(calculate_zone, self.incremental, spec, zone_state, Setting.tsm_export))
+
+    def RTSMCalculated(self, result):
+        self.results, self.zone_state = result
+        self.zone = self.incremental.zone
+        self.zone_weather = self.zone.weather_data
+        self.btnRTSMCalculate.setText('Calculate')
+        self.RTSMShowTimings()
+        self.RTSMPresent()
+
+    def RTSMShowTimings(self):
+        """Mean time per calculation stage in the status bar, when profiling with RTSM_PROFILE"""
+        if profiler.enabled: self.statusBar().showMessage(profiler.summary())
+
+    def RTSMCalculateFailed(self, message):
+        self.btnRTSMCalculate.setText('Calculate')
+        print(message)
+
+    def RTSMPresent(self):
+        if self.zone_state is None: return self.RTSMRequestCalculate()
+        i = self.results.max_hr[0]
         _SI_UNIT = True if self.cmbRTSMOutUnit.currentText() == 'Watt' else False
         self.tbLoadComponemt.setText(f'Load Component ({self.cmbRTSMOutUnit.currentText()}) @Hour {i}')
-        cl = self.zone.internal_load_df[i:i+1]['Lighting'].values[0]
+        cl = self.results.frame('internal_load_df')[i:i+1]['Lighting'].values[0]
         self.tbRTSMOutLighting.setText(f'{cl if _SI_UNIT else cl*WATT_BTU_HR:,.0f}')
-        cl = self.zone.internal_load_df[i:i+1]['People'].values[0]
+        cl = self.results.frame('internal_load_df')[i:i+1]['People'].values[0]
         self.tbRTSMOutPeople.setText(f'{cl if _SI_UNIT else cl*WATT_BTU_HR:,.0f}')
-        cl = self.zone.internal_load_df[i:i+1]['Equipment'].values[0]
+        cl = self.results.frame('internal_load_df')[i:i+1]['Equipment'].values[0]
         self.tbRTSMOutEqp.setText(f'{cl if _SI_UNIT else cl*WATT_BTU_HR:,.0f}')
 
-        cl = self.zone.external_load_df[i:i+1]['Roof'].values[0]
+        cl = self.results.frame('external_load_df')[i:i+1]['Roof'].values[0]
         self.tbRTSMOutRoof.setText(f'{cl if _SI_UNIT else cl*WATT_BTU_HR:,.0f}')
-        cl = self.zone.external_load_df[i:i+1]['Floor'].values[0]
+        cl = self.results.frame('external_load_df')[i:i+1]['Floor'].values[0]
         self.tbRTSMOutFloor.setText(f'{cl if _SI_UNIT else cl*WATT_BTU_HR:,.0f}')
-        cl = self.zone.external_load_df[i:i+1]['Ceiling'].values[0]
+        cl = self.results.frame('external_load_df')[i:i+1]['Ceiling'].values[0]
         self.tbRTSMOutCeiling.setText(f'{cl if _SI_UNIT else cl*WATT_BTU_HR:,.0f}')
 
-        cl = self.zone.wall_load_df[i:i+1]['Wall-A'].values[0]
+        cl = self.results.frame('wall_load_df')[i:i+1]['Wall-A'].values[0]
         self.tbRTSMOutWallA.setText(f'{cl if _SI_UNIT else cl*WATT_BTU_HR:,.0f}')
-        cl = self.zone.wall_load_df[i:i+1]['Wall-B'].values[0]
+        cl = self.results.frame('wall_load_df')[i:i+1]['Wall-B'].values[0]
         self.tbRTSMOutWallB.setText(f'{cl if _SI_UNIT else cl*WATT_BTU_HR:,.0f}')
-        cl = self.zone.wall_load_df[i:i+1]['Wall-C'].values[0]
+        cl = self.results.frame('wall_load_df')[i:i+1]['Wall-C'].values[0]
         self.tbRTSMOutWallC.setText(f'{cl if _SI_UNIT else cl*WATT_BTU_HR:,.0f}')
-        cl = self.zone.wall_load_df[i:i+1]['Wall-D'].values[0]
+        cl = self.results.frame('wall_load_df')[i:i+1]['Wall-D'].values[0]
         self.tbRTSMOutWallD.setText(f'{cl if _SI_UNIT else cl*WATT_BTU_HR:,.0f}')
-        cl = self.zone.wall_load_df[i:i+1]['TOTAL_CL'].values[0]
+        cl = self.results.frame('wall_load_df')[i:i+1]['TOTAL_CL'].values[0]
         self.tbRTSMOutWallTotal.setText(f'{cl if _SI_UNIT else cl*WATT_BTU_HR:,.0f}')
 
-        cl = self.zone.window_load_df[i:i+1]['Win-A'].values[0]
+        cl = self.results.frame('window_load_df')[i:i+1]['Win-A'].values[0]
         self.tbRTSMOutWinA.setText(f'{cl if _SI_UNIT else cl*WATT_BTU_HR:,.0f}')
-        cl = self.zone.window_load_df[i:i+1]['Win-B'].values[0]
+        cl = self.results.frame('window_load_df')[i:i+1]['Win-B'].values[0]
         self.tbRTSMOutWinB.setText(f'{cl if _SI_UNIT else cl*WATT_BTU_HR:,.0f}')
-        cl = self.zone.window_load_df[i:i+1]['Win-C'].values[0]
+        cl = self.results.frame('window_load_df')[i:i+1]['Win-C'].values[0]
         self.tbRTSMOutWinC.setText(f'{cl if _SI_UNIT else cl*WATT_BTU_HR:,.0f}')
-        cl = self.zone.window_load_df[i:i+1]['Win-D'].values[0]
+        cl = self.results.frame('window_load_df')[i:i+1]['Win-D'].values[0]
         self.tbRTSMOutWinD.setText(f'{cl if _SI_UNIT else cl*WATT_BTU_HR:,.0f}')
-        cl = self.zone.window_load_df[i:i+1]['TOTAL_CL'].values[0]
+        cl = self.results.frame('window_load_df')[i:i+1]['TOTAL_CL'].values[0]
         self.tbRTSMOutWinTotal.setText(f'{cl if _SI_UNIT else cl*WATT_BTU_HR:,.0f}')
 
-        cl = self.zone.external_load_df[i:i+1]['TOTAL_CL'].values[0]
+        cl = self.results.frame('external_load_df')[i:i+1]['TOTAL_CL'].values[0]
         self.tbRTSMOutExternal.setText(f'{cl if _SI_UNIT else cl*WATT_BTU_HR:,.0f}')
-        cl = self.zone.internal_load_df[i:i+1]['TOTAL_CL'].values[0]
+        cl = self.results.frame('internal_load_df')[i:i+1]['TOTAL_CL'].values[0]
         self.tbRTSMOutInternal.setText(f'{cl if _SI_UNIT else cl*WATT_BTU_HR:,.0f}')
-        cl = self.zone.cooling_load_df[i:i+1]['ventilation'].values[0]
+        cl = self.results.frame('cooling_load_df')[i:i+1]['ventilation'].values[0]
         self.tbRTSMOutOA.setText(f'{cl if _SI_UNIT else cl*WATT_BTU_HR:,.0f}')
 
-        i_total_cl = self.zone.cooling_load_df[i:i+1]['TOTAL_CL'].values[0]
-        i_safety = i_total_cl * self.zone.safety.to('').m
+        i_total_cl = self.results.frame('cooling_load_df')[i:i+1]['TOTAL_CL'].values[0]
+        i_safety = i_total_cl * self.tbRTSMSafety.value()/100
         i_total = i_total_cl + i_safety
         self.tbRTSMOutSafety.setText(f'{i_safety if _SI_UNIT else i_safety*WATT_BTU_HR:,.0f}')
         self.tbRTSMOutTotal.setText(f'{i_total if _SI_UNIT else i_total*WATT_BTU_HR:,.0f}')
         self.tbRTSMOutTotalAll.setText(self.tbRTSMOutTotal.text())
 
     def RTSMReport(self):
+        from pyMEP.hvac.coolingload import Setting
         sender = self.sender()
-        if self.tbRTSMOutTotalAll.text() == '0': self.RTSMCalculate()
+        self.RTSMCalculate(full=True)
+        import pandas as pd
         pd.options.display.float_format = '{:.2f}'.format
         match sender:
             case self.btnRTSMSolar:
@@ -1525,6 +1507,7 @@ class Mainwindow(QMainWindow):
 
     def RTSMChart(self, window_title: str):
         sender = self.sender()
+        from pyMEP.charts.chart_2D import LineChart
         chart = LineChart(window_title = window_title)
         x_data = [hr for hr in range(24)]
         try:
@@ -1569,6 +1552,7 @@ class Mainwindow(QMainWindow):
         chart.show()
 
     def RTSMConfig(self):
+        from pyMEP.hvac.coolingload import Setting, RTS
         dialog = QDialog(self)
         dialog.setWindowTitle("ASHRAE Configuration")
 
@@ -1599,215 +1583,315 @@ class Mainwindow(QMainWindow):
         dialog.setLayout(mainLayout)
 
         if dialog.exec():
-            Setting.NRTS_Room_construction = self.cmbConstruction.currentText()
-            Setting.NRTS_Carpet = self.cmbCarpet.currentText()
-            Setting.NRTS_Glass = self.cmbGlass.currentText()
+            with SETTING_LOCK:
+                Setting.NRTS_Room_construction = self.cmbConstruction.currentText()
+                Setting.NRTS_Carpet = self.cmbCarpet.currentText()
+                Setting.NRTS_Glass = self.cmbGlass.currentText()
+
+    def RTSMSpec(self) -> ZoneSpec:
+        """Current form as a `ZoneSpec`"""
+        self.applicationBox.ensureContent()
+        ClimaticData = dict([
+            ('Location', self.cmbRTSMLocation.currentIndex()),
+            ('Latitude', self.tbRTSMLatitude.value()),
+            ('Longtitude', self.tbRTSMLongtitude.value()),
+            ('Altitude', self.tbRTSMAltitude.value()),
+            ('OutsideDB', self.tbRTSMOutsideDB.value()),
+            ('DBRange', self.tbRTSMDBRange.value()),
+            ('OutsideWB', self.tbRTSMOutsideWB.value()),
+            ('WBRange', self.tbRTSMWBRange.value()),
+            ('taub', self.tbRTSMtaub.value()),
+            ('taud', self.tbRTSMtaud.value()),
+            ('tz', self.tbRTSMtz.text()),
+            ('Month', self.tbRTSMMonth.text()),
+            ('Name', self.tbRTSMName.text()),
+            ('InsideDB', self.tbRTSMInsideDB.value()),
+            ('InsideRH', self.tbRTSMInsideRH.value()),
+            ('SpaceType', self.cmbRTSMSpaceType.currentIndex()),])
+        ArchitecData = dict([
+            ('Compass', self.tbCompass.value()),
+            ('ZoneHeight', self.tbZoneHeight.value()),
+            ('ZoneLength', self.tbZoneLength.value()),
+            ('ZoneWidth', self.tbZoneWidth.value()),
+
+            ('RoofType', self.cmbRTSMRoofType.currentIndex()),
+            ('URoof', self.tbRTSMURoof.value()),
+            ('FloorType', self.cmbRTSMFloorType.currentIndex()),
+            ('UFloor', self.tbRTSMUFloor.value()),
+            ('OptionFloor', self.tbRTSMOptionFloor.value()),
+
+            ('Wall_A', self.cmbRTSMWall_A.currentIndex()),
+            ('UWall_A', self.tbRTSMUWall_A.value()),
+            ('OptionWall_A', self.tbRTSMOptionWall_A.value()),
+            ('Wall_B', self.cmbRTSMWall_B.currentIndex()),
+            ('UWall_B', self.tbRTSMUWall_B.value()),
+            ('OptionWall_B', self.tbRTSMOptionWall_B.value()),
+            ('Wall_C', self.cmbRTSMWall_C.currentIndex()),
+            ('UWall_C', self.tbRTSMUWall_C.value()),
+            ('OptionWall_C', self.tbRTSMOptionWall_C.value()),
+            ('Wall_D', self.cmbRTSMWall_D.currentIndex()),
+            ('UWall_D', self.tbRTSMUWall_D.value()),
+            ('OptionWall_D', self.tbRTSMOptionWall_D.value()),
+
+            ('WinAHigh', self.tbWinAHigh.value()),
+            ('Win_A', self.cmbRTSMWin_A.currentIndex()),
+            ('WinAWidth', self.tbWinAWidth.value()),
+            ('UWin_A', self.tbRTSMUWin_A.value()),
+            ('SCWin_A', self.tbRTSMSCWin_A.value()),
+            ('InShaderWin_A', self.cmbRTSMInShaderWin_A.currentIndex()),
+            ('ExShaderWin_A', self.cmbRTSMExShaderWin_A.currentIndex()),
+            ('WinBHigh', self.tbWinBHigh.value()),
+            ('Win_B', self.cmbRTSMWin_B.currentIndex()),
+            ('WinBWidth', self.tbWinBWidth.value()),
+            ('UWin_B', self.tbRTSMUWin_B.value()),
+            ('SCWin_B', self.tbRTSMSCWin_B.value()),
+            ('InShaderWin_B', self.cmbRTSMInShaderWin_B.currentIndex()),
+            ('ExShaderWin_B', self.cmbRTSMExShaderWin_B.currentIndex()),
+            ('WinCHigh', self.tbWinCHigh.value()),
+            ('Win_C', self.cmbRTSMWin_C.currentIndex()),
+            ('WinCWidth', self.tbWinCWidth.value()),
+            ('UWin_C', self.tbRTSMUWin_C.value()),
+            ('SCWin_C', self.tbRTSMSCWin_C.value()),
+            ('InShaderWin_C', self.cmbRTSMInShaderWin_C.currentIndex()),
+            ('ExShaderWin_C', self.cmbRTSMExShaderWin_C.currentIndex()),
+            ('WinDHigh', self.tbWinDHigh.value()),
+            ('Win_D', self.cmbRTSMWin_D.currentIndex()),
+            ('WinDWidth', self.tbWinDWidth.value()),
+            ('UWin_D', self.tbRTSMUWin_D.value()),
+            ('SCWin_D', self.tbRTSMSCWin_D.value()),
+            ('InShaderWin_D', self.cmbRTSMInShaderWin_D.currentIndex()),
+            ('ExShaderWin_D', self.cmbRTSMExShaderWin_D.currentIndex()),])
+        ApplicationData = dict([
+            ('RoomType', self.cmbRTSMRoomType.currentIndex()),
+            ('LPD', self.tbRTSMLPD.value()),
+            ('LightF_SPACE', self.tbRTSMLightF_SPACE.value()),
+            ('LightF_RAD', self.tbRTSMLightF_RAD.value()),
+            ('LightingGrid', self.LightingGrid.value()),
+            ('Activity', self.cmbRTSMActivity.currentIndex()),
+            ('PeopleSH', self.tbRTSMPeopleSH.value()),
+            ('PeopleLH', self.tbRTSMPeopleLH.value()),
+            ('PeopleF_RAD', self.tbRTSMPeopleF_RAD.value()),
+            ('PeopleGrid', self.PeopleGrid.value()),
+            ('Ventilation', self.cmbRTSMVentilation.currentIndex()),
+            ('tbVentilation', self.tbRTSMVentilation.value()),
+            ('Rp', self.tbRTSMRp.value()),
+            ('Ra', self.tbRTSMRa.value()),
+            ('Ez', self.tbRTSMEz.value()),
+            ('Equipment', self.cmbRTSMEquipment.currentIndex()),
+            ('EquipmentSH', self.tbRTSMEquipmentSH.value()),
+            ('EquipmentLH', self.tbRTSMEquipmentLH.value()),
+            ('EquipmentNo', self.tbRTSMEquipmentNo.value()),])
+        return ZoneSpec.from_dict(dict([
+            ('Climatic', ClimaticData),
+            ('Architec', ArchitecData),
+            ('Application', ApplicationData),
+            ('Safety', self.tbRTSMSafety.value()),
+            ('OutUnit', self.cmbRTSMOutUnit.currentIndex()),
+            ]))
+
+    @contextmanager
+    def RTSMSignalsBlocked(self):
+        """Form edits inside the block fire no change slots and repaint nothing until it ends"""
+        widgets = [w for w in self.findChildren(QWidget) if not w.signalsBlocked()]
+        for w in widgets: w.blockSignals(True)
+        self.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            for w in widgets: w.blockSignals(False)
+            self.setUpdatesEnabled(True)
+
+    def RTSMRefreshView(self):
+        """What the change slots derive from the form, labels, enabled states, tool tips and the graphics,
+        without resetting any of the values they would reset. The top view is drawn once."""
+        self.spaceTypeGraphic.setFloor(self.cmbRTSMSpaceType.currentIndex())
+        self.cmbRTSMRoofType.setToolTip(ROOFS.get(self.cmbRTSMRoofType.currentText()).Description)
+        self.cmbRTSMFloorType.setToolTip(FLOORS.get(self.cmbRTSMFloorType.currentText()).Description)
+        with self.architecGraphic.deferDraw():
+            self.architecGraphic.setRotate(self.tbCompass.value())
+            self.architecGraphic.setLength(self.tbZoneLength.value())
+            self.architecGraphic.setWidth(self.tbZoneWidth.value())
+            for i, side in enumerate('ABCD'):
+                wall = WALLS.get(getattr(self, f'cmbRTSMWall_{side}').currentText())
+                self.windowTab.setTabEnabled(i, wall.isExternal)
+                self.architecGraphic.setWallType(wall=f'Wall_{side}', isExternal=wall.isExternal)
+                getattr(self, f'lbOptionWall_{side}').setText('Solar Absorptance' if wall.isExternal else 'Temp. Diff')
+                getattr(self, f'lbOptionUnitWall_{side}').setVisible(not wall.isExternal)
+                getattr(self, f'cmbRTSMWall_{side}').setToolTip(wall.Description)
+                window = getattr(self, f'cmbRTSMWin_{side}')
+                getattr(self, f'tbWin{side}High').setEnabled(window.currentText() != 'None')
+                getattr(self, f'tbWin{side}Width').setEnabled(window.currentText() != 'None')
+                window.setToolTip(windows.get(window.currentText()).Description)
+                self.ShowWindow(wall=f'Wall_{side}')
+        self.tbRTSMVentilation.setVisible(self.cmbRTSMVentilation.currentText() != 'ASHRAE 62.1')
+
+    def RTSMLoadSpec(self, spec: ZoneSpec):
+        """Applies a whole project as one transaction, the slots stay silent while the form is filled,
+        then the view is refreshed once and at most one calculation is requested"""
+        self.applicationBox.ensureContent()
+        with self.RTSMSignalsBlocked():
+            self.RTSMApplySpec(spec)
+        self.RTSMRefreshView()
+        self.RTSMRequestCalculate()
+
+    def RTSMApplySpec(self, spec: ZoneSpec):
+        climatic, architec, application = spec.climatic, spec.architec, spec.application
+        self.applicationBox.ensureContent()
+        self.cmbRTSMLocation.setCurrentIndex(climatic.Location)
+        self.tbRTSMLatitude.setValue(climatic.Latitude)
+        self.tbRTSMLongtitude.setValue(climatic.Longtitude)
+        self.tbRTSMAltitude.setValue(climatic.Altitude)
+        self.tbRTSMOutsideDB.setValue(climatic.OutsideDB)
+        self.tbRTSMDBRange.setValue(climatic.DBRange)
+        self.tbRTSMOutsideWB.setValue(climatic.OutsideWB)
+        self.tbRTSMWBRange.setValue(climatic.WBRange)
+        self.tbRTSMtaub.setValue(climatic.taub)
+        self.tbRTSMtaud.setValue(climatic.taud)
+        self.tbRTSMtz.setText(climatic.tz)
+        self.tbRTSMMonth.setText(climatic.Month)
+        self.tbRTSMName.setText(climatic.Name)
+        self.tbRTSMInsideDB.setValue(climatic.InsideDB)
+        self.tbRTSMInsideRH.setValue(climatic.InsideRH)
+        self.cmbRTSMSpaceType.setCurrentIndex(climatic.SpaceType)
+
+        self.tbCompass.setValue(architec.Compass)
+        self.tbZoneHeight.setValue(architec.ZoneHeight)
+        self.tbZoneLength.setValue(architec.ZoneLength)
+        self.tbZoneWidth.setValue(architec.ZoneWidth)
+        self.cmbRTSMRoofType.setCurrentIndex(architec.RoofType)
+        self.tbRTSMURoof.setValue(architec.URoof)
+        self.cmbRTSMFloorType.setCurrentIndex(architec.FloorType)
+        self.tbRTSMUFloor.setValue(architec.UFloor)
+        self.tbRTSMOptionFloor.setValue(architec.OptionFloor)
+        for side in 'ABCD':
+            getattr(self, f'cmbRTSMWall_{side}').setCurrentIndex(getattr(architec, f'Wall_{side}'))
+            getattr(self, f'tbRTSMUWall_{side}').setValue(getattr(architec, f'UWall_{side}'))
+            option = getattr(architec, f'OptionWall_{side}')
+            if option is None:
+                # not in the file, the default the wall slot would set, not the previous project's value
+                from pyMEP.hvac.coolingload import Setting
+                external = WALLS.get(getattr(self, f'cmbRTSMWall_{side}').currentText()).isExternal
+                option = Setting.surface_absorptance if external else Setting.delta_T.m
+            getattr(self, f'tbRTSMOptionWall_{side}').setValue(option)
+        self.tbWinAHigh.setValue(architec.WinAHigh)
+        self.cmbRTSMWin_A.setCurrentIndex(architec.Win_A)
+        self.tbWinAWidth.setValue(architec.WinAWidth)
+        self.tbRTSMUWin_A.setValue(architec.UWin_A)
+        self.tbRTSMSCWin_A.setValue(architec.SCWin_A)
+        self.cmbRTSMInShaderWin_A.setCurrentIndex(architec.InShaderWin_A)
+        self.cmbRTSMExShaderWin_A.setCurrentIndex(architec.ExShaderWin_A)
+        self.tbWinBHigh.setValue(architec.WinBHigh)
+        self.cmbRTSMWin_B.setCurrentIndex(architec.Win_B)
+        self.tbWinBWidth.setValue(architec.WinBWidth)
+        self.tbRTSMUWin_B.setValue(architec.UWin_B)
+        self.tbRTSMSCWin_B.setValue(architec.SCWin_B)
+        self.cmbRTSMInShaderWin_B.setCurrentIndex(architec.InShaderWin_B)
+        self.cmbRTSMExShaderWin_B.setCurrentIndex(architec.ExShaderWin_B)
+        self.tbWinCHigh.setValue(architec.WinCHigh)
+        self.cmbRTSMWin_C.setCurrentIndex(architec.Win_C)
+        self.tbWinCWidth.setValue(architec.WinCWidth)
+        self.tbRTSMUWin_C.setValue(architec.UWin_C)
+        self.tbRTSMSCWin_C.setValue(architec.SCWin_C)
+        self.cmbRTSMInShaderWin_C.setCurrentIndex(architec.InShaderWin_C)
+        self.cmbRTSMExShaderWin_C.setCurrentIndex(architec.ExShaderWin_C)
+        self.tbWinDHigh.setValue(architec.WinDHigh)
+        self.cmbRTSMWin_D.setCurrentIndex(architec.Win_D)
+        self.tbWinDWidth.setValue(architec.WinDWidth)
+        self.tbRTSMUWin_D.setValue(architec.UWin_D)
+        self.tbRTSMSCWin_D.setValue(architec.SCWin_D)
+        self.cmbRTSMInShaderWin_D.setCurrentIndex(architec.InShaderWin_D)
+        self.cmbRTSMExShaderWin_D.setCurrentIndex(architec.ExShaderWin_D)
+
+        self.cmbRTSMRoomType.setCurrentIndex(application.RoomType)
+        self.tbRTSMLPD.setValue(application.LPD)
+        self.tbRTSMLightF_SPACE.setValue(application.LightF_SPACE)
+        self.tbRTSMLightF_RAD.setValue(application.LightF_RAD)
+        self.LightingGrid.setValue(application.LightingGrid)
+        self.cmbRTSMActivity.setCurrentIndex(application.Activity)
+        self.tbRTSMPeopleSH.setValue(application.PeopleSH)
+        self.tbRTSMPeopleLH.setValue(application.PeopleLH)
+        self.tbRTSMPeopleF_RAD.setValue(application.PeopleF_RAD)
+        self.PeopleGrid.setValue(application.PeopleGrid)
+        self.cmbRTSMVentilation.setCurrentIndex(application.Ventilation)
+        self.tbRTSMVentilation.setValue(application.tbVentilation)
+        self.tbRTSMRp.setValue(application.Rp)
+        self.tbRTSMRa.setValue(application.Ra)
+        self.tbRTSMEz.setValue(application.Ez)
+        self.cmbRTSMEquipment.setCurrentIndex(application.Equipment)
+        self.tbRTSMEquipmentSH.setValue(application.EquipmentSH)
+        self.tbRTSMEquipmentLH.setValue(application.EquipmentLH)
+        self.tbRTSMEquipmentNo.setValue(application.EquipmentNo)
+
+        self.tbRTSMSafety.setValue(spec.safety)
+        self.cmbRTSMOutUnit.setCurrentIndex(spec.out_unit)
 
     def RTSMOpen(self):
         fnames, filter = QFileDialog.getOpenFileNames(self, 'Open from file', '', 'RTSM (*.rtsm);;All files (*)')
-        if fnames != [] and fnames[0]:
-            with open(fnames[0], "r") as file:
-                raw_data = file.read()
-                try:
-                    data = json.loads(raw_data)
-                    ClimaticData = data['Climatic']
-                    self.cmbRTSMLocation.setCurrentIndex(ClimaticData['Location'])
-                    self.tbRTSMLatitude.setValue(ClimaticData['Latitude'])
-                    self.tbRTSMLongtitude.setValue(ClimaticData['Longtitude'])
-                    self.tbRTSMAltitude.setValue(ClimaticData['Altitude'])
-                    self.tbRTSMOutsideDB.setValue(ClimaticData['OutsideDB'])
-                    self.tbRTSMDBRange.setValue(ClimaticData['DBRange'])
-                    self.tbRTSMOutsideWB.setValue(ClimaticData['OutsideWB'])
-                    self.tbRTSMtaub.setValue(ClimaticData['taub'])
-                    self.tbRTSMtaud.setValue(ClimaticData['taud'])
-                    self.tbRTSMtz.setText(ClimaticData['tz'])
-                    self.tbRTSMMonth.setText(ClimaticData['Month'])
-                    self.tbRTSMName.setText(ClimaticData['Name'])
-                    self.tbRTSMInsideDB.setValue(ClimaticData['InsideDB'])
-                    self.tbRTSMInsideRH.setValue(ClimaticData['InsideRH'])
-                    self.cmbRTSMSpaceType.setCurrentIndex(ClimaticData['SpaceType'])
-
-                    ArchitecData = data['Architec']
-                    self.tbCompass.setValue(ArchitecData['Compass'])
-                    self.tbZoneHeight.setValue(ArchitecData['ZoneHeight'])
-                    self.tbZoneLength.setValue(ArchitecData['ZoneLength'])
-                    self.tbZoneWidth.setValue(ArchitecData['ZoneWidth'])
-                    self.cmbRTSMRoofType.setCurrentIndex(ArchitecData['RoofType'])
-                    self.tbRTSMURoof.setValue(ArchitecData['URoof'])
-                    self.cmbRTSMFloorType.setCurrentIndex(ArchitecData['FloorType'])
-                    self.tbRTSMUFloor.setValue(ArchitecData['UFloor'])
-                    self.tbRTSMOptionFloor.setValue(ArchitecData['OptionFloor'])
-                    self.cmbRTSMWall_A.setCurrentIndex(ArchitecData['Wall_A'])
-                    self.tbRTSMUWall_A.setValue(ArchitecData['UWall_A'])
-                    self.tbRTSMOptionWall_A.setValue(ArchitecData['OptionWall_A'])
-                    self.cmbRTSMWall_B.setCurrentIndex(ArchitecData['Wall_B'])
-                    self.tbRTSMUWall_B.setValue(ArchitecData['UWall_B'])
-                    self.tbRTSMOptionWall_B.setValue(ArchitecData['OptionWall_B'])
-                    self.cmbRTSMWall_C.setCurrentIndex(ArchitecData['Wall_C'])
-                    self.tbRTSMUWall_C.setValue(ArchitecData['UWall_C'])
-                    self.tbRTSMOptionWall_C.setValue(ArchitecData['OptionWall_C'])
-                    self.cmbRTSMWall_D.setCurrentIndex(ArchitecData['Wall_D'])
-                    self.tbRTSMUWall_D.setValue(ArchitecData['UWall_D'])
-                    self.tbRTSMOptionWall_D.setValue(ArchitecData['OptionWall_D'])
-                    self.tbWinAHigh.setValue(ArchitecData['WinAHigh'])
-                    self.cmbRTSMWin_A.setCurrentIndex(ArchitecData['Win_A'])
-                    self.tbWinAWidth.setValue(ArchitecData['WinAWidth'])
-                    self.tbRTSMUWin_A.setValue(ArchitecData['UWin_A'])
-                    self.tbRTSMSCWin_A.setValue(ArchitecData['SCWin_A'])
-                    self.cmbRTSMInShaderWin_A.setCurrentIndex(ArchitecData['InShaderWin_A'])
-                    self.cmbRTSMExShaderWin_A.setCurrentIndex(ArchitecData['ExShaderWin_A'])
-                    self.tbWinBHigh.setValue(ArchitecData['WinBHigh'])
-                    self.cmbRTSMWin_B.setCurrentIndex(ArchitecData['Win_B'])
-                    self.tbWinBWidth.setValue(ArchitecData['WinBWidth'])
-                    self.tbRTSMUWin_B.setValue(ArchitecData['UWin_B'])
-                    self.tbRTSMSCWin_B.setValue(ArchitecData['SCWin_B'])
-                    self.cmbRTSMInShaderWin_B.setCurrentIndex(ArchitecData['InShaderWin_B'])
-                    self.cmbRTSMExShaderWin_B.setCurrentIndex(ArchitecData['ExShaderWin_B'])
-                    self.tbWinCHigh.setValue(ArchitecData['WinCHigh'])
-                    self.cmbRTSMWin_C.setCurrentIndex(ArchitecData['Win_C'])
-                    self.tbWinCWidth.setValue(ArchitecData['WinCWidth'])
-                    self.tbRTSMUWin_C.setValue(ArchitecData['UWin_C'])
-                    self.tbRTSMSCWin_C.setValue(ArchitecData['SCWin_C'])
-                    self.cmbRTSMInShaderWin_C.setCurrentIndex(ArchitecData['InShaderWin_C'])
-                    self.cmbRTSMExShaderWin_C.setCurrentIndex(ArchitecData['ExShaderWin_C'])
-                    self.tbWinDHigh.setValue(ArchitecData['WinDHigh'])
-                    self.cmbRTSMWin_D.setCurrentIndex(ArchitecData['Win_D'])
-                    self.tbWinDWidth.setValue(ArchitecData['WinDWidth'])
-                    self.tbRTSMUWin_D.setValue(ArchitecData['UWin_D'])
-                    self.tbRTSMSCWin_D.setValue(ArchitecData['SCWin_D'])
-                    self.cmbRTSMInShaderWin_D.setCurrentIndex(ArchitecData['InShaderWin_D'])
-                    self.cmbRTSMExShaderWin_D.setCurrentIndex(ArchitecData['ExShaderWin_D'])
-
-                    ApplicationData = data['Application']
-                    self.cmbRTSMRoomType.setCurrentIndex(ApplicationData['RoomType'])
-                    self.tbRTSMLPD.setValue(ApplicationData['LPD'])
-                    self.tbRTSMLightF_SPACE.setValue(ApplicationData['LightF_SPACE'])
-                    self.tbRTSMLightF_RAD.setValue(ApplicationData['LightF_RAD'])
-                    self.LightingGrid.setValue(ApplicationData['LightingGrid'])
-                    self.cmbRTSMActivity.setCurrentIndex(ApplicationData['Activity'])
-                    self.tbRTSMPeopleSH.setValue(ApplicationData['PeopleSH'])
-                    self.tbRTSMPeopleLH.setValue(ApplicationData['PeopleLH'])
-                    self.tbRTSMPeopleF_RAD.setValue(ApplicationData['PeopleF_RAD'])
-                    self.PeopleGrid.setValue(ApplicationData['PeopleGrid'])
-                    self.cmbRTSMVentilation.setCurrentIndex(ApplicationData['Ventilation'])
-                    self.tbRTSMVentilation.setValue(ApplicationData['tbVentilation'])
-                    self.tbRTSMRp.setValue(ApplicationData['Rp'])
-                    self.tbRTSMRa.setValue(ApplicationData['Ra'])
-                    self.tbRTSMEz.setValue(ApplicationData['Ez'])
-                    self.cmbRTSMEquipment.setCurrentIndex(ApplicationData['Equipment'])
-                    self.tbRTSMEquipmentSH.setValue(ApplicationData['EquipmentSH'])
-                    self.tbRTSMEquipmentLH.setValue(ApplicationData['EquipmentLH'])
-                    self.tbRTSMEquipmentNo.setValue(ApplicationData['EquipmentNo'])
-
-                    self.tbRTSMSafety.setValue(data['Safety'])
-                    self.cmbRTSMOutUnit.setCurrentIndex(data['OutUnit'])
-                except json.JSONDecodeError:
-                    print("%s is not a valid JSON file" % os.path.basename(fnames[0]))
-                except Exception as e:
-                    print(e)
+        fnames = [f for f in fnames if f]
+        if fnames == []: return
+        try:
+            self.RTSMLoadSpec(ZoneSpec.load(fnames[0]))
+        except json.JSONDecodeError:
+            QMessageBox.warning(self, 'Open from file', f'{path.basename(fnames[0])} is not a valid JSON file')
+            return
+        except Exception as e:
+            QMessageBox.warning(self, 'Open from file', f'{path.basename(fnames[0])}: {e}')
+            return
+        if len(fnames) > 1: self.RTSMOpenSummary(fnames)
+
+    def RTSMOpenSummary(self, fnames: list):
+        """Peak loads of several opened files in a table, the first one stays in the form. Every zone is
+        calculated by pyMEP like the form on the summary worker, the table opens when all are done."""
+        from lib._batch import calculate_files
+        self.summaries.request(partial(calculate_files, fnames))
+
+    def RTSMSummaryReady(self, results: list):
+        """A file that fails to load or calculate is listed with its error"""
+        from lib._batch import COMPONENTS
+        unit = self.cmbRTSMOutUnit.currentText()
+        factor = 1 if unit == 'Watt' else WATT_BTU_HR
+        headers = ['File', 'Zone', 'Peak Hr'] + list(COMPONENTS) + ['Cooling Load', 'Safety', 'Total']
+        table = QTableWidget(len(results) + 1, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        for row, r in enumerate(results):
+            table.setItem(row, 0, QTableWidgetItem(path.basename(r.File)))
+            if r.Error:
+                table.setItem(row, 1, QTableWidgetItem(r.Error))
+                table.setSpan(row, 1, 1, len(headers) - 1)
+                continue
+            values = [r.Components[c] for c in COMPONENTS] + [r.Cooling_Load, r.Safety, r.Total]
+            table.setItem(row, 1, QTableWidgetItem(r.ID))
+            table.setItem(row, 2, QTableWidgetItem(f'{r.Peak_Hr}:00'))
+            for column, v in enumerate(values, 3):
+                item = QTableWidgetItem(f'{v*factor:,.0f}')
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                table.setItem(row, column, item)
+        table.setItem(len(results), 0, QTableWidgetItem('Sum of peaks'))
+        item = QTableWidgetItem(f'{sum(r.Total for r in results if not r.Error)*factor:,.0f}')
+        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        table.setItem(len(results), len(headers) - 1, item)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        table.resizeColumnsToContents()
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f'Peak Cooling Load ({unit})')
+        buttonBox = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok)
+        buttonBox.accepted.connect(dialog.accept)
+        mainLayout = QVBoxLayout()
+        mainLayout.addWidget(table)
+        mainLayout.addWidget(buttonBox)
+        dialog.setLayout(mainLayout)
+        dialog.resize(900, 300)
+        dialog.exec()
+
+    def RTSMSummaryFailed(self, message):
+        QMessageBox.warning(self, 'Peak Cooling Load', message)
 
     def RTSMSave(self):
         new_name = self.tbRTSMName.text()
         filename, filter = QFileDialog.getSaveFileName(self, 'Save to file', new_name, 'RTSM (*.rtsm);;All files (*)')
         if filename == '': return False
-        with open(filename, "w") as file:
-            ClimaticData = dict([
-                ('Location', self.cmbRTSMLocation.currentIndex()),
-                ('Latitude', self.tbRTSMLatitude.value()),
-                ('Longtitude', self.tbRTSMLongtitude.value()),
-                ('Altitude', self.tbRTSMAltitude.value()),
-                ('OutsideDB', self.tbRTSMOutsideDB.value()),
-                ('DBRange', self.tbRTSMDBRange.value()),
-                ('OutsideWB', self.tbRTSMOutsideWB.value()),
-                ('taub', self.tbRTSMtaub.value()),
-                ('taud', self.tbRTSMtaud.value()),
-                ('tz', self.tbRTSMtz.text()),
-                ('Month', self.tbRTSMMonth.text()),
-                ('Name', self.tbRTSMName.text()),
-                ('InsideDB', self.tbRTSMInsideDB.value()),
-                ('InsideRH', self.tbRTSMInsideRH.value()),
-                ('SpaceType', self.cmbRTSMSpaceType.currentIndex()),])
-            ArchitecData = dict([
-                ('Compass', self.tbCompass.value()),
-                ('ZoneHeight', self.tbZoneHeight.value()),
-                ('ZoneLength', self.tbZoneLength.value()),
-                ('ZoneWidth', self.tbZoneWidth.value()),
-
-                ('RoofType', self.cmbRTSMRoofType.currentIndex()),
-                ('URoof', self.tbRTSMURoof.value()),
-                ('FloorType', self.cmbRTSMFloorType.currentIndex()),
-                ('UFloor', self.tbRTSMUFloor.value()),
-                ('OptionFloor', self.tbRTSMOptionFloor.value()),
-
-                ('Wall_A', self.cmbRTSMWall_A.currentIndex()),
-                ('UWall_A', self.tbRTSMUWall_A.value()),
-                ('OptionWall_A', self.tbRTSMOptionWall_A.value()),
-                ('Wall_B', self.cmbRTSMWall_B.currentIndex()),
-                ('UWall_B', self.tbRTSMUWall_B.value()),
-                ('OptionWall_B', self.tbRTSMOptionWall_B.value()),
-                ('Wall_C', self.cmbRTSMWall_C.currentIndex()),
-                ('UWall_C', self.tbRTSMUWall_C.value()),
-                ('OptionWall_C', self.tbRTSMOptionWall_C.value()),
-                ('Wall_D', self.cmbRTSMWall_D.currentIndex()),
-                ('UWall_D', self.tbRTSMUWall_D.value()),
-                ('OptionWall_D', self.tbRTSMOptionWall_D.value()),
-
-                ('WinAHigh', self.tbWinAHigh.value()),
-                ('Win_A', self.cmbRTSMWin_A.currentIndex()),
-                ('WinAWidth', self.tbWinAWidth.value()),
-                ('UWin_A', self.tbRTSMUWin_A.value()),
-                ('SCWin_A', self.tbRTSMSCWin_A.value()),
-                ('InShaderWin_A', self.cmbRTSMInShaderWin_A.currentIndex()),
-                ('ExShaderWin_A', self.cmbRTSMExShaderWin_A.currentIndex()),
-                ('WinBHigh', self.tbWinBHigh.value()),
-                ('Win_B', self.cmbRTSMWin_B.currentIndex()),
-                ('WinBWidth', self.tbWinBWidth.value()),
-                ('UWin_B', self.tbRTSMUWin_B.value()),
-                ('SCWin_B', self.tbRTSMSCWin_B.value()),
-                ('InShaderWin_B', self.cmbRTSMInShaderWin_B.currentIndex()),
-                ('ExShaderWin_B', self.cmbRTSMExShaderWin_B.currentIndex()),
-                ('WinCHigh', self.tbWinCHigh.value()),
-                ('Win_C', self.cmbRTSMWin_C.currentIndex()),
-                ('WinCWidth', self.tbWinCWidth.value()),
-                ('UWin_C', self.tbRTSMUWin_C.value()),
-                ('SCWin_C', self.tbRTSMSCWin_C.value()),
-                ('InShaderWin_C', self.cmbRTSMInShaderWin_C.currentIndex()),
-                ('ExShaderWin_C', self.cmbRTSMExShaderWin_C.currentIndex()),
-                ('WinDHigh', self.tbWinDHigh.value()),
-                ('Win_D', self.cmbRTSMWin_D.currentIndex()),
-                ('WinDWidth', self.tbWinDWidth.value()),
-                ('UWin_D', self.tbRTSMUWin_D.value()),
-                ('SCWin_D', self.tbRTSMSCWin_D.value()),
-                ('InShaderWin_D', self.cmbRTSMInShaderWin_D.currentIndex()),
-                ('ExShaderWin_D', self.cmbRTSMExShaderWin_D.currentIndex()),])
-            ApplicationData = dict([
-                ('RoomType', self.cmbRTSMRoomType.currentIndex()),
-                ('LPD', self.tbRTSMLPD.value()),
-                ('LightF_SPACE', self.tbRTSMLightF_SPACE.value()),
-                ('LightF_RAD', self.tbRTSMLightF_RAD.value()),
-                ('LightingGrid', self.LightingGrid.value()),
-                ('Activity', self.cmbRTSMActivity.currentIndex()),
-                ('PeopleSH', self.tbRTSMPeopleSH.value()),
-                ('PeopleLH', self.tbRTSMPeopleLH.value()),
-                ('PeopleF_RAD', self.tbRTSMPeopleF_RAD.value()),
-                ('PeopleGrid', self.PeopleGrid.value()),
-                ('Ventilation', self.cmbRTSMVentilation.currentIndex()),
-                ('tbVentilation', self.tbRTSMVentilation.value()),
-                ('Rp', self.tbRTSMRp.value()),
-                ('Ra', self.tbRTSMRa.value()),
-                ('Ez', self.tbRTSMEz.value()),
-                ('Equipment', self.cmbRTSMEquipment.currentIndex()),
-                ('EquipmentSH', self.tbRTSMEquipmentSH.value()),
-                ('EquipmentLH', self.tbRTSMEquipmentLH.value()),
-                ('EquipmentNo', self.tbRTSMEquipmentNo.value()),])
-            data = dict([
-                ('Climatic', ClimaticData),
-                ('Architec', ArchitecData),
-                ('Application', ApplicationData),
-                ('Safety', self.tbRTSMSafety.value()),
-                ('OutUnit', self.cmbRTSMOutUnit.currentIndex()),
-                ])
-            file.write( json.dumps( data, indent=4 ) )
+        self.RTSMSpec().save(filename)
  
     def About(self):
         QMessageBox.about(self, "Radiant Time Series (RTS) method Cooling Load",
@@ -1824,6 +1908,9 @@ class Mainwindow(QMainWindow):
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
+    probe.mark('QApplication')
     wnd = Mainwindow()
     wnd.show()
+    probe.mark('show')
+    QTimer.singleShot(0, lambda: (probe.mark('first paint'), probe.report()))
     sys.exit(app.exec())
@@ -0,0 +1,127 @@
+"""Command line RTSM calculation of `.rtsm` files, without the GUI.
+
+	python -m pyrtsm calc zone.rtsm [--unit Btu/hr]
+	python -m pyrtsm batch *.rtsm [-j 4] [-o results.csv] [--profile timings.json]
+	python -m pyrtsm report zone.rtsm [--frame cooling_load_df] [-o hourly.csv]
+
+The loads come from the pyMEP reference `ComfortZone.Calculate`, PyQt6 and matplotlib are never imported."""
+import argparse
+import contextlib
+import csv
+import sys
+from os import listdir, path
+
+WATT_BTU_HR = 3.41214163
+UNITS = {'Watt': 1.0, 'Btu/hr': WATT_BTU_HR}
+
+def _files(names: list) -> list:
+	"""The `.rtsm` files of the arguments, a directory stands for the files in it"""
+	files = []
+	for name in names:
+		if path.isdir(name):
+			files.extend(sorted(path.join(name, f) for f in listdir(name) if f.endswith('.rtsm')))
+		else:
+			files.append(name)
+	return files
+
+def _writer(output: str):
+	return open(output, 'w', newline='', encoding='utf-8') if output else sys.stdout
+
+def calc(args) -> int:
+	from lib._batch import COMPONENTS, calculate_files
+	factor = UNITS[args.unit]
+	status = 0
+	with contextlib.redirect_stdout(sys.stderr):	# ComfortZone.Calculate reports on stdout, the report goes there
+		results = calculate_files(_files(args.files))
+	for r in results:
+		if r.Error:
+			print(f'{r.File}: {r.Error}', file=sys.stderr)
+			status = 1
+			continue
+		print(f'{r.File}: {r.ID}, peak at {r.Peak_Hr}:00')
+		for c in COMPONENTS:
+			print(f'  {c:<12}{r.Components[c]*factor:>14,.0f}')
+		print(f'  {"Cooling Load":<12}{r.Cooling_Load*factor:>14,.0f} {args.unit}')
+		print(f'  {"Safety":<12}{r.Safety*factor:>14,.0f} {args.unit}')
+		print(f'  {"Total":<12}{r.Total*factor:>14,.0f} {args.unit}')
+	return status
+
+def batch(args) -> int:
+	from lib._batch import COMPONENTS, run_batch
+	factor = UNITS[args.unit]
+	with contextlib.redirect_stdout(sys.stderr):	# in-process with one worker, the CSV may go to stdout
+		results = run_batch(_files(args.files), max_workers=args.jobs)
+	f = _writer(args.output)
+	try:
+		writer = csv.writer(f)
+		writer.writerow(['File', 'ID', 'Peak_Hr'] + list(COMPONENTS) + ['Cooling_Load', 'Safety', 'Total', 'Error'])
+		for r in results:
+			loads = [v*factor if v is not None else '' for v in [r.Components.get(c) for c in COMPONENTS] + [r.Cooling_Load, r.Safety, r.Total]]
+			writer.writerow([r.File, r.ID or '', '' if r.Peak_Hr is None else r.Peak_Hr] + loads + [r.Error or ''])
+	finally:
+		if args.output: f.close()
+	return int(any(r.Error for r in results))
+
+def report(args) -> int:
+	from lib._ZoneSpec import ZoneSpec
+	from lib._results import COLUMNS, FRAMES, INDEX, _FRAME_TOTAL
+	factor = UNITS[args.unit]
+	try:
+		zone = ZoneSpec.load(args.file).new_zone()
+		with contextlib.redirect_stdout(sys.stderr):	# ComfortZone.Calculate reports on stdout, the CSV may go there
+			zone.Calculate()
+		results = zone.results
+	except Exception as e:
+		print(f'{args.file}: {type(e).__name__}: {e}', file=sys.stderr)
+		return 1
+	if args.frame:
+		columns = FRAMES[args.frame]
+		index = [INDEX[_FRAME_TOTAL[args.frame] if c == 'TOTAL_CL' else c] for c in columns]
+	else:
+		columns, index = COLUMNS, list(range(len(COLUMNS)))
+	f = _writer(args.output)
+	try:
+		writer = csv.writer(f)
+		writer.writerow(['Hr'] + list(columns))
+		for hr, row in enumerate(results.data[:, index] * factor):
+			writer.writerow([hr] + [f'{v:.1f}' for v in row])
+	finally:
+		if args.output: f.close()
+	return 0
+
+def parser() -> argparse.ArgumentParser:
+	from lib._results import FRAMES
+	p = argparse.ArgumentParser(prog='python -m pyrtsm', description='ASHRAE RTSM cooling loads of .rtsm files')
+	sub = p.add_subparsers(dest='command', required=True)
+	c = sub.add_parser('calc', help='peak hour and load components of each file')
+	c.add_argument('files', nargs='+', help='.rtsm files or directories')
+	c.set_defaults(run=calc)
+	b = sub.add_parser('batch', help='peak loads of many files as CSV')
+	b.add_argument('files', nargs='+', help='.rtsm files or directories')
+	b.add_argument('-j', '--jobs', type=int, default=None, help='worker processes, all CPUs by default')
+	b.add_argument('-o', '--output', help='CSV file, stdout by default')
+	b.set_defaults(run=batch)
+	r = sub.add_parser('report', help='hourly loads of one file as CSV')
+	r.add_argument('file', help='.rtsm file')
+	r.add_argument('--frame', choices=tuple(FRAMES), help='columns of one report table, all by default')
+	r.add_argument('-o', '--output', help='CSV file, stdout by default')
+	r.set_defaults(run=report)
+	for s in (c, b, r):
+		s.add_argument('--unit', choices=tuple(UNITS), default='Watt')
+	for s in (c, b):
+		s.add_argument('--profile', metavar='JSON', help='write the time spent per calculation stage')
+	return p
+
+def main(argv: list = None) -> int:
+	args = parser().parse_args(argv)
+	profile = getattr(args, 'profile', None)
+	if not profile:
+		return args.run(args)
+	from lib._profile import profiler
+	profiler.enable()
+	status = args.run(args)
+	profiler.dump(profile)
+	return status
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,28 @@
+import pytest
+from lib._building import SITE, Building
+from lib._ZoneSpec import ClimaticData, ZoneSpec
+
+def site() -> ClimaticData:
+	return ClimaticData(Location=3, Latitude=18.78, Longtitude=98.98, Altitude=312, OutsideDB=38.0, DBRange=12.0,
+						OutsideWB=24.5, WBRange=3.0, taub=0.6, taud=1.9, Month='may')
+
+def test_on_site_takes_the_building_climate():
+	building = Building(site())
+	spec = ZoneSpec()
+	spec.climatic.InsideDB, spec.climatic.Name = 24, 'Office'
+	moved = building.on_site(spec)
+	assert all(getattr(moved.climatic, k) == getattr(building.climatic, k) for k in SITE)
+	assert (moved.climatic.InsideDB, moved.climatic.Name) == (24, 'Office')
+	assert spec.climatic.OutsideDB == ClimaticData().OutsideDB
+
+def test_zones_share_one_weather():
+	pytest.importorskip('pyMEP')
+	building = Building(site())
+	a = building.add_spec(ZoneSpec.default())
+	b = building.add_spec(ZoneSpec.default())
+	fast = building.add_spec(ZoneSpec.default(), fast=True)
+	assert a.weather_data is b.weather_data is building.weather_data
+	assert a.weather_data.T_db_des.m == 38.0
+	assert fast.spec.climatic.OutsideDB == 38.0
+	block = building.Calculate()
+	assert block.Peak_Hr == building.max_hr and len(block.Zones) == 3
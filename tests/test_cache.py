@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+from lib import _cache
+
+KEY = dict(room_construction='Medium', carpet='No carpet', glass='50%')
+
+@pytest.fixture
+def table(monkeypatch):
+	"""A one-entry RTS table, so the lookups never reach pyMEP"""
+	values = _cache._readonly(np.linspace(50, 0, 24))
+	table = {_cache._rts_key(True, 'Exterior', *KEY.values()): values}
+	monkeypatch.setattr(_cache, '_rts_table', table)
+	return table
+
+def test_rts_values_are_shared_and_readonly(table):
+	values = _cache.rts_values(nrts=True, zones='Exterior', **KEY)
+	assert values is _cache.rts_values(nrts=True, zones='Exterior', **KEY)
+	assert not values.flags.writeable
+	with pytest.raises(ValueError):
+		values[0] = 0.0
+
+def test_rts_values_copy_is_writable(table):
+	values = _cache.rts_values(nrts=True, zones='Exterior', **KEY)
+	copy = values.copy()
+	copy[0] = 0.0
+	assert values[0] == 50.0
+
+def test_calculate_leaves_rts_table_unchanged():
+	pytest.importorskip('pyMEP')
+	from lib._ZoneSpec import ZoneSpec
+	zone = ZoneSpec.default().new_zone()
+	before = dict([(k, v.copy()) for k, v in _cache.rts_table().items()])
+	zone.Calculate()
+	zone.Calculate()
+	table = _cache.rts_table()
+	assert all(not v.flags.writeable for v in table.values())
+	assert all(np.array_equal(table[k], v) for k, v in before.items())
+	assert zone.ns_rts_zone.flags.writeable and zone.s_rts_zone.flags.writeable
+
+class Weather:
+	"""The `WeatherData` attributes `update_weather` reads and sets"""
+	calculated = 0
+
+	def __init__(self, T_db_des: float = 36.2) -> None:
+		self.fi, self.L_loc, self.tz, self.date = 13.7, 100.5, 7, '2021-04-21'
+		self.taub, self.taud, self.T_db_des, self.T_db_rng, self.altitude = 0.576, 1.984, T_db_des, 7.1, 4.0
+
+	def update_sun_position(self) -> None:
+		Weather.calculated += 1
+		self.position_df = pd.DataFrame({'beta': np.arange(24.0)})
+
+	def synthetic_daily_db_profiles(self) -> None:
+		self.T_db_prof = [self.T_db_des - 0.1*h for h in range(24)]
+
+@pytest.fixture
+def weather_cache():
+	_cache.clear_weather_cache()
+	Weather.calculated = 0
+	yield
+	_cache.clear_weather_cache()
+
+def test_update_weather_calculates_once_per_key(weather_cache):
+	a, b, c = Weather(), Weather(), Weather(T_db_des=35.0)
+	for w in (a, b, c):
+		_cache.update_weather(w)
+	assert Weather.calculated == 2
+	assert b.T_db_prof == a.T_db_prof and b.position_df.equals(a.position_df)
+	assert c.T_db_prof[0] == 35.0
+
+def test_update_weather_does_not_alias(weather_cache):
+	a, b = Weather(), Weather()
+	_cache.update_weather(a)
+	_cache.update_weather(b)
+	assert a.T_db_prof is not b.T_db_prof and a.position_df is not b.position_df
+	a.T_db_prof[0] = 0.0
+	a.position_df.loc[0, 'beta'] = -1.0
+	c = Weather()
+	_cache.update_weather(c)
+	assert b.T_db_prof[0] == c.T_db_prof[0] == 36.2
+	assert b.position_df.loc[0, 'beta'] == c.position_df.loc[0, 'beta'] == 0.0
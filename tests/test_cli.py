@@ -0,0 +1,23 @@
+import csv
+import io
+import pytest
+from lib import _batch
+from lib._batch import COMPONENTS, ZoneResult
+from pyrtsm.__main__ import main
+
+RESULT = ZoneResult('zone.rtsm', 'Z1', 15, dict.fromkeys(COMPONENTS, 1.0), 15.0, 1.5, 16.5, None)
+
+def _noisy(filenames, **kwargs):
+	print('ComfortZone.Calculate chatter')
+	return [RESULT]
+
+@pytest.mark.parametrize('command, name', [('calc', 'calculate_files'), ('batch', 'run_batch')])
+def test_calculation_output_stays_off_stdout(command, name, monkeypatch, capsys):
+	monkeypatch.setattr(_batch, name, _noisy)
+	assert main([command, 'zone.rtsm']) == 0
+	out, err = capsys.readouterr()
+	assert 'chatter' not in out
+	assert 'chatter' in err
+	if command == 'batch':
+		rows = list(csv.reader(io.StringIO(out)))
+		assert rows[1][:3] == ['zone.rtsm', 'Z1', '15']
@@ -0,0 +1,47 @@
+import json
+import numpy as np
+import pytest
+from lib._constructions import CTS_TOLERANCE, ROOFS, WALLS, ConstructionLibrary, validate_cts
+from lib._kernel import circulant
+from lib._resource import _CTS, roofs, walls
+
+CTS = [50.0, 30.0, 20.0] + [0.0]*21
+
+def test_validate_cts():
+	np.testing.assert_array_equal(validate_cts('X', CTS), CTS)
+	validate_cts('X', [50.0 + CTS_TOLERANCE/2] + CTS[1:])
+	with pytest.raises(ValueError, match='24 factors'):
+		validate_cts('X', CTS[:23])
+	with pytest.raises(ValueError, match='24 factors'):
+		validate_cts('X', [CTS, CTS])
+	with pytest.raises(ValueError, match='negative'):
+		validate_cts('X', [60.0, 60.0, -20.0] + [0.0]*21)
+	with pytest.raises(ValueError, match='sums to 99.00%'):
+		validate_cts('X', [49.0] + CTS[1:])
+
+def test_builtin_constructions():
+	assert tuple(ROOFS)[:len(roofs)] == tuple(roofs) and tuple(WALLS)[:len(walls)] == tuple(walls)
+	first = WALLS.at(0)
+	assert first is WALLS[tuple(walls)[0]] and first.U == walls[first.id].U
+	np.testing.assert_array_equal(first.CTS, walls[first.id].CTS)
+	np.testing.assert_allclose(first.matrix, circulant(first.CTS))
+	# shared by every zone, read-only
+	assert not first.CTS.flags.writeable and not first.matrix.flags.writeable
+	with pytest.raises(KeyError):
+		WALLS['no such wall']
+
+def test_user_files(tmp_path):
+	builtin = {'RF.1': _CTS('RF.1', 1.0, CTS, True, 'built-in')}
+	for id, cts in (('B', CTS), ('A', CTS), ('RF.1', CTS[::-1]), ('bad', [10.0]*24)):
+		(tmp_path / f'{id}.json').write_text(json.dumps({'U': 0.5, 'CTS': cts, 'isExternal': False}), encoding='utf-8')
+	library = ConstructionLibrary(builtin, str(tmp_path))
+	# the built-in ones first, then the files sorted, a file never replaces a built-in construction
+	assert tuple(library) == ('RF.1', 'A', 'B', 'bad') and len(library) == 4 and 'A' in library
+	assert library['RF.1'].Description == 'built-in' and library.at(1).id == 'A'
+	assert library['A'].U == 0.5 and library['A'].Description == 'A' and not library['A'].isExternal
+	with pytest.raises(ValueError, match='bad: CTS sums'):
+		library['bad']
+	(tmp_path / 'C.json').write_text(json.dumps({'U': 1.0, 'CTS': CTS, 'isExternal': True}), encoding='utf-8')
+	assert 'C' not in library
+	library.refresh()
+	assert tuple(library) == ('RF.1', 'A', 'B', 'C', 'bad') and library.at(3).id == 'C'
@@ -0,0 +1,48 @@
+import os
+import pytest
+from bench import golden
+
+pytest.importorskip('pyMEP')
+
+@pytest.fixture(scope='module')
+def reference():
+	if not os.path.exists(os.path.join(golden.GOLDEN_DIR, 'golden.npz')):
+		pytest.skip('no golden results, run python -m bench.golden capture')
+	meta, arrays = golden.load_golden()
+	return meta, golden.load_scenarios(), arrays
+
+def test_scenarios_cover_the_resources():
+	from lib import _resource
+	matrix = golden.scenarios()
+	specs = [spec for _, spec in matrix]
+	assert len(set(name for name, _ in matrix)) == len(matrix)
+	assert set(s.climatic.SpaceType for s in specs) == set(range(len(_resource.space_types)))
+	assert set(s.architec.Compass for s in specs) >= set(golden.ORIENTATIONS)
+	assert set(s.architec.RoofType for s in specs) == set(range(len(_resource.roofs)))
+	assert set(s.architec.FloorType for s in specs) == set(range(len(_resource.floors)))
+	for k in ('Wall', 'Win'):
+		used = set(getattr(s.architec, f'{k}_{side}') for s in specs for side in 'ABCD')
+		assert used == set(range(len(_resource.walls if k == 'Wall' else _resource.windows)))
+
+def test_golden_matches_the_scenarios(reference):
+	meta, matrix, arrays = reference
+	assert meta['engine'] == golden.REFERENCE and meta['scenarios'] == len(matrix)
+	assert [name for name, _ in matrix] == sorted(name for name, _ in golden.scenarios())
+	assert set(arrays) == set(f'{name}:{f}' for name, _ in matrix for f in golden.FRAMES)
+
+@pytest.mark.parametrize('engine', ['fast', 'kernel', 'stacked'])
+def test_engine_matches_golden(reference, engine):
+	meta, matrix, arrays = reference
+	r = golden.check(engine, matrix, arrays)
+	assert r['failures'] == [], r['failures'][:10]
+
+def test_check_reports_failures(reference):
+	meta, matrix, arrays = reference
+	name = matrix[0][0]
+	shifted = dict(arrays)
+	shifted[f'{name}:cooling_load_df'] = arrays[f'{name}:cooling_load_df'] + 1000.0
+	r = golden.check('stacked', matrix[:1], shifted)
+	assert [(n, f) for n, f, _ in r['failures']] == [(name, 'cooling_load_df')]
+
+def test_main_check(reference):
+	assert golden.main(['check', 'fast', 'stacked']) == 0
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from lib._graph import ALL, FLOOR, INTERNALS, ROOF, STAGES, VENTILATION, WALLS, DependencyGraph, IncrementalZone, _INDEX, affected, dirty_stages
+from lib._kernel import COLUMNS
+from lib._results import ZoneResults
+
+def test_zone_height_dirties_walls_and_ventilation():
+	stage, rows = affected('Architec', 'ZoneHeight')
+	assert stage == 'gains'
+	assert rows == WALLS | VENTILATION
+
+def test_affected_rows():
+	assert affected('Architec', 'UWall_B') == ('gains', frozenset([_INDEX['Wall-B'], _INDEX['Win-B']]))
+	assert affected('Architec', 'WinCHigh') == ('gains', frozenset([_INDEX['Wall-C'], _INDEX['Win-C']]))
+	assert affected('Architec', 'RoofType') == ('gains', ROOF)
+	assert affected('Climatic', 'SpaceType') == ('gains', ROOF | FLOOR)
+	assert affected('Climatic', 'WBRange') == ('gains', VENTILATION)
+	assert affected('Application', 'LPD') == ('gains', INTERNALS)
+	assert affected('Climatic', 'Latitude') == ('solar', ALL)
+	assert affected('Safety', None) == ('presentation', frozenset())
+
+def test_dirty_stages():
+	old = {('Climatic', 'Name'): 'Room1', ('Safety', None): 10, ('Architec', 'Compass'): 120}
+	assert dirty_stages(old, dict(old)) == set()
+	assert dirty_stages(old, {**old, ('Safety', None): 15}) == {'presentation'}
+	assert dirty_stages(old, {**old, ('Architec', 'Compass'): 90}) == {'solar', 'gains', 'rts', 'summary', 'presentation'}
+
+def test_clean_keeps_rows_until_rts_is_clean():
+	graph = DependencyGraph()
+	graph.clean(*STAGES)
+	assert not graph.dirty and not graph.rows
+	graph.invalidate('gains', ROOF)
+	graph.clean('gains')
+	assert graph.rows == set(ROOF)
+	graph.clean('rts', 'summary', 'presentation')
+	assert not graph.rows
+
+class Zone:
+	"""`ComfortZone` stand-in recording the rows each `Calculate` was asked for"""
+	def __init__(self) -> None:
+		self.results = ZoneResults()
+		self.calls = []
+
+	def Calculate(self, rows=None) -> None:
+		self.calls.append(rows)
+		self.recalculated = COLUMNS if rows is None else tuple(COLUMNS[i] for i in rows)
+
+class Spec:
+	def __init__(self) -> None:
+		self.zone = Zone()
+		self.configured = 0
+
+	def copy(self) -> 'Spec':
+		return self
+
+	def new_zone(self) -> Zone:
+		return self.zone
+
+	def configure(self, zone) -> None:
+		self.configured += 1
+
+STATE = {('Architec', 'UWall_A'): 2.0, ('Architec', 'ZoneHeight'): 3.8, ('Safety', None): 10}
+
+def test_incremental_zone_recalculates_dirty_rows_only():
+	spec, incremental = Spec(), IncrementalZone()
+	incremental.update(spec, STATE)
+	incremental.calculate()
+	assert spec.zone.calls == [None] and not incremental.partial
+	incremental.update(spec, {**STATE, ('Architec', 'UWall_A'): 1.5})
+	incremental.calculate()
+	assert spec.zone.recalculated == ('Wall-A', 'Win-A') and incremental.partial
+	incremental.update(spec, {**STATE, ('Architec', 'UWall_A'): 1.5, ('Architec', 'ZoneHeight'): 4.0})
+	incremental.calculate()
+	assert set(spec.zone.recalculated) == set(COLUMNS[i] for i in WALLS | VENTILATION)
+	assert spec.configured == 2
+
+def test_incremental_zone_skips_presentation_changes():
+	spec, incremental = Spec(), IncrementalZone()
+	incremental.update(spec, STATE)
+	incremental.calculate()
+	incremental.update(spec, {**STATE, ('Safety', None): 15})
+	incremental.calculate()
+	assert spec.zone.calls == [None]
+	incremental.calculate(full=True)
+	assert spec.zone.calls == [None, None] and not incremental.partial
+
+def test_incremental_zone_matches_full_calculation():
+	pytest.importorskip('pyMEP')
+	from lib._ZoneSpec import ZoneSpec
+	spec = ZoneSpec.default()
+	incremental = IncrementalZone()
+	incremental.update(spec)
+	incremental.calculate()
+	spec.architec.UWall_A *= 0.5
+	incremental.update(spec)
+	results = incremental.calculate()
+	assert incremental.zone.recalculated == ('Wall-A', 'Win-A')
+	zone = spec.new_zone()
+	zone.Calculate()
+	np.testing.assert_allclose(results.data, zone.results.data)
@@ -0,0 +1,115 @@
+import contextlib
+import os
+import numpy as np
+import pytest
+from lib._kernel import COLUMNS, ROWS, SURFACES, WINDOWS, ZoneInputs, circulant, cooling_loads, radiant_loads, rts, ventilation
+from lib._psychro import humidity_ratio_from_rel_hum, outdoor_humidity_ratio, pressure
+
+# Relative to the zone's peak total cooling load, plus 1 W, the tolerance of bench.golden
+RTOL, ATOL = 1e-3, 1.0
+
+def _zone(altitude: float, T_wb_rng: float) -> ZoneInputs:
+	P = pressure(altitude)
+	fields = dict([(k, None) for k in ZoneInputs._fields])
+	fields.update(Ti=np.asarray(25.0), T_db_des=np.asarray(35.0), T_db_rng=np.asarray(10.0), T_wb_mc=np.asarray(25.0),
+				  T_wb_rng=np.asarray(T_wb_rng), v_cs=np.asarray(100.0), v_cl=np.asarray(300.0), P=np.asarray(P),
+				  W_i=np.asarray(humidity_ratio_from_rel_hum(25.0, 0.55, P) * 1000), schedule=np.ones(24))
+	return ZoneInputs(**fields)
+
+def _outdoor(T_db) -> np.ndarray:
+	return np.stack([T_db, np.zeros(24)])
+
+def test_ventilation_at_altitude():
+	T_db = 35.0 - 10.0 * (1 + np.cos(np.linspace(0, 2*np.pi, 24))) / 2
+	for altitude, T_wb_rng in ((0, 0.0), (0, 3.0), (1500, 0.0), (1500, 3.0)):
+		z = _zone(altitude, T_wb_rng)
+		shg, lhg = ventilation(z, _outdoor(T_db))
+		W_o = outdoor_humidity_ratio(T_db, 35.0, 10.0, 25.0, T_wb_rng, pressure(altitude)) * 1000
+		np.testing.assert_array_equal(lhg, np.round(300.0 * (W_o - z.W_i), 0))
+		np.testing.assert_array_equal(shg, np.round(100.0 * (T_db - 25.0), 0))
+	# the same wet-bulb and RH give higher humidity ratios at the lower pressure
+	assert ventilation(_zone(1500, 3.0), _outdoor(T_db))[1].sum() > ventilation(_zone(0, 3.0), _outdoor(T_db))[1].sum()
+
+def test_ventilation_stacked():
+	T_db = np.linspace(25, 35, 24)
+	zones = [_zone(0, 0.0), _zone(1500, 3.0), _zone(300, 2.0)]
+	stacked = ZoneInputs(*[None if zones[0][i] is None else np.stack([z[i] for z in zones]) for i in range(len(ZoneInputs._fields))])
+	loads = ventilation(stacked, np.stack([_outdoor(T_db)] * 3))
+	for z, load in zip(zones, loads):
+		np.testing.assert_array_equal(load, ventilation(z, _outdoor(T_db)))
+
+def _factors(rng, shape) -> np.ndarray:
+	f = rng.uniform(0, 1, shape + (24,))
+	return 100 * f / f.sum(axis=-1, keepdims=True)
+
+def _identity(shape=()) -> np.ndarray:
+	f = np.zeros(shape + (24,))
+	f[..., 0] = 100
+	return f
+
+def _synthetic(rng, cts, nrts, srts) -> ZoneInputs:
+	"""A Bangkok zone on its April design day with every surface and window on, random gains"""
+	n, w = len(SURFACES), len(WINDOWS)
+	return ZoneInputs(fi=np.asarray(13.73), L_loc=np.asarray(100.56), tz=np.asarray(7.0), n=np.asarray(105.0),
+					  taub=np.asarray(0.576), taud=np.asarray(1.984), T_db_des=np.asarray(36.2), T_db_rng=np.asarray(7.1),
+					  Ti=np.asarray(25.0), psi=np.array([0., 0., 0., 60., -30., -120., 150.]), sigma=np.array([0., 180., 180., 90., 90., 90., 90.]),
+					  UA=rng.uniform(50, 500, n), external=np.array([True, False, False, True, True, True, False]),
+					  sol=np.array([0.9, 0., 0., 0.7, 0.7, 0.7, 0.]), lw=np.array([3.9, 0., 0., 0., 0., 0., 0.]),
+					  dT=np.array([0., 6.7, 6.7, 0., 0., 0., 3.]), on=np.ones(n, bool), rad=np.array([0.6] + [0.46]*6), ctm=circulant(cts),
+					  w_area=rng.uniform(1, 5, w), w_UA=rng.uniform(5, 30, w), w_SC=np.full(w, 0.9),
+					  w_shgc=np.tile([0.86, 0.84, 0.82, 0.78, 0.67, 0.45, 0.], (w, 1)), w_shgch=np.full(w, 0.78), w_rad=np.full(w, 0.33),
+					  i_sen=rng.uniform(0, 2000, (3, 24)), i_lat=rng.uniform(0, 500, (3, 24)), i_rad=np.array([0.57, 0.6, 0.2]),
+					  v_cs=np.asarray(500.0), v_cl=np.asarray(1200.0), P=np.asarray(pressure(4)),
+					  W_i=np.asarray(humidity_ratio_from_rel_hum(25.0, 0.55) * 1000), T_wb_mc=np.asarray(26.9), T_wb_rng=np.asarray(2.5),
+					  schedule=(np.arange(24) >= 8).astype(float), nrts=nrts, srts=srts)
+
+def test_circulant_is_a_periodic_convolution():
+	rng = np.random.default_rng(0)
+	f, q = _factors(rng, ()), rng.uniform(-100, 100, 24)
+	expected = [sum(f[j] * q[(h - j) % 24] for j in range(24)) / 100 for h in range(24)]
+	np.testing.assert_allclose(circulant(f) @ q, expected, rtol=1e-12)
+	# leading axes are kept, one matrix per row
+	fs = _factors(rng, (3,))
+	np.testing.assert_allclose(circulant(fs)[1], circulant(fs[1]))
+	np.testing.assert_array_equal(circulant(_identity()), np.eye(24))
+
+def test_rts_conserves_the_daily_heat_gain():
+	rng = np.random.default_rng(1)
+	z = ZoneInputs(**dict([(k, None) for k in ZoneInputs._fields] + [('nrts', _factors(rng, ())), ('srts', _factors(rng, ()))]))
+	G = rng.uniform(0, 1000, (2, len(ROWS), 24))
+	loads = radiant_loads(G, rts(z))
+	assert loads.shape == (len(ROWS), 24)
+	np.testing.assert_allclose(loads.sum(axis=-1), G.sum(axis=(0, -1)), rtol=1e-12)
+	# the radiant gain of hour h turns into load at hour h + j with the j-th factor
+	one = np.zeros_like(G)
+	one[1, 0, 5] = 100.0
+	np.testing.assert_allclose(radiant_loads(one, rts(z))[0], np.roll(z.srts, 5))
+
+def test_cooling_loads_conserve_the_daily_heat_gain():
+	rng = np.random.default_rng(2)
+	z = _synthetic(rng, _factors(rng, (len(SURFACES),)), _factors(rng, ()), _factors(rng, ()))
+	instant = z._replace(ctm=circulant(_identity((len(SURFACES),))), nrts=_identity(), srts=_identity())
+	loads, gains = cooling_loads(z), cooling_loads(instant)
+	assert loads.shape == gains.shape == (len(COLUMNS), 24)
+	# CTS & RTS only move heat between hours, every factor series sums to 100%
+	np.testing.assert_allclose(loads.sum(axis=-1), gains.sum(axis=-1), rtol=1e-9, atol=1e-9)
+	# without any delay the internal loads are the heat gains themselves
+	np.testing.assert_allclose(gains[len(SURFACES) + len(WINDOWS):len(ROWS)], z.i_sen + z.i_lat)
+	# an internal surface conducts its fixed temperature difference
+	np.testing.assert_allclose(gains[ROWS.index('Wall-D')], np.full(24, z.UA[6] * 3.0))
+
+@pytest.mark.parametrize('case', ['default', 'glazed'])
+def test_cooling_loads_match_pymep(case):
+	pytest.importorskip('pyMEP')
+	from bench import CASES
+	from lib._kernel import compile_zone
+	from lib._results import ZoneResults
+	spec = CASES[case]()
+	with contextlib.redirect_stdout(open(os.devnull, 'w')):
+		zone = spec.new_zone()
+		zone.Calculate()
+	expected = zone.results
+	results = ZoneResults.from_loads(cooling_loads(compile_zone(spec)))
+	tolerance = ATOL + RTOL * np.abs(expected['TOTAL_CL']).max()
+	for column in COLUMNS:
+		assert np.abs(results[column] - expected[column]).max() <= tolerance, column
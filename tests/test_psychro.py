@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from lib._psychro import (STANDARD_PRESSURE, humidity_ratio_from_rel_hum, humidity_ratio_from_wet_bulb, outdoor_humidity_ratio,
+						  pressure, saturation_pressure)
+
+psychrolib = pytest.importorskip('psychrolib')
+psychrolib.SetUnitSystem(psychrolib.SI)
+
+def test_pressure():
+	for altitude in (-100, 0, 312, 1500, 4000):
+		assert pressure(altitude) == pytest.approx(psychrolib.GetStandardAtmPressure(altitude), rel=1e-12)
+
+def test_saturation_pressure():
+	T = np.linspace(-40, 60, 201)
+	expected = [psychrolib.GetSatVapPres(t) for t in T]
+	np.testing.assert_allclose(saturation_pressure(T), expected, rtol=1e-12)
+
+def test_humidity_ratio_from_wet_bulb():
+	rng = np.random.default_rng(0)
+	T_db = rng.uniform(-20, 50, 500)
+	T_wb = T_db - rng.uniform(0, 15, 500)
+	for P in (STANDARD_PRESSURE, pressure(1500)):
+		expected = [psychrolib.GetHumRatioFromTWetBulb(db, wb, P) for db, wb in zip(T_db, T_wb)]
+		np.testing.assert_allclose(humidity_ratio_from_wet_bulb(T_db, T_wb, P), expected, rtol=1e-10)
+
+def test_humidity_ratio_from_rel_hum():
+	rng = np.random.default_rng(1)
+	T_db, RH = rng.uniform(-20, 50, 500), rng.uniform(0.05, 1, 500)
+	for P in (STANDARD_PRESSURE, pressure(1500)):
+		expected = [psychrolib.GetHumRatioFromRelHum(db, rh, P) for db, rh in zip(T_db, RH)]
+		np.testing.assert_allclose(humidity_ratio_from_rel_hum(T_db, RH, P), expected, rtol=1e-10)
+
+def test_outdoor_humidity_ratio():
+	T_db = 35.0 - 12.0 * np.linspace(0, 1, 24)
+	design = psychrolib.GetHumRatioFromTWetBulb(35.0, 25.0, STANDARD_PRESSURE)
+	# a wet-bulb range of 0 keeps the design hour's humidity ratio
+	np.testing.assert_allclose(outdoor_humidity_ratio(T_db, 35.0, 12.0, 25.0, 0.0), np.full(24, design), rtol=1e-10)
+	expected = [psychrolib.GetHumRatioFromTWetBulb(db, min(25.0 - (35.0 - db) / 12.0 * 4.0, db), STANDARD_PRESSURE) for db in T_db]
+	np.testing.assert_allclose(outdoor_humidity_ratio(T_db, 35.0, 12.0, 25.0, 4.0), expected, rtol=1e-10)
@@ -0,0 +1,50 @@
+import numpy as np
+from lib._kernel import COLUMNS as LOADS
+from lib._results import COLUMNS, FRAMES, INDEX, ZoneResults, summarize
+
+def _results() -> ZoneResults:
+	loads = np.random.default_rng(0).uniform(0, 1000, (len(LOADS), 24))
+	return ZoneResults.from_loads(loads)
+
+def test_summarize():
+	r = _results()
+	d = r.data
+	assert np.allclose(r['Wall'], sum(r[f'Wall-{s}'] for s in 'ABCD'))
+	assert np.allclose(r['Window'], sum(r[f'Win-{s}'] for s in 'ABCD'))
+	assert np.allclose(r['external'], r['Roof'] + r['Floor'] + r['Ceiling'] + r['Wall'] + r['Window'])
+	assert np.allclose(r['internal'], r['Lighting'] + r['People'] + r['Equipment'])
+	assert np.allclose(r['ventilation'], r['SHG'] + r['LHG'])
+	assert np.allclose(r['TOTAL_CL'], r['external'] + r['internal'] + r['ventilation'])
+	stacked = np.zeros((3, 24, len(COLUMNS)))
+	stacked[:] = d
+	stacked[..., len(LOADS):] = 0
+	assert np.array_equal(summarize(stacked)[1], d)
+
+def test_frames():
+	r = _results()
+	for name, columns in FRAMES.items():
+		df = r.frame(name)
+		assert tuple(df.columns) == columns and df.index.name == 'Hr' and len(df) == 24
+		for c in columns[:-1]:
+			assert np.array_equal(df[c].to_numpy(), r[c])
+	assert np.array_equal(r.frame('wall_load_df')['TOTAL_CL'].to_numpy(), r['Wall'])
+	assert np.array_equal(r.frame('cooling_load_df')['TOTAL_CL'].to_numpy(), r['TOTAL_CL'])
+	# kept until the next summarize, which rebuilds it from the new data
+	assert r.frame('external_load_df') is r.frame('external_load_df')
+	r['Roof'] = 0.0
+	r.summarize()
+	assert np.array_equal(r.frame('external_load_df')['Roof'].to_numpy(), np.zeros(24))
+
+def test_max_hr():
+	r = ZoneResults()
+	r['Lighting'] = [1.0]*24
+	r['Lighting'][[9, 15]] = 5.0
+	r.summarize()
+	assert r.max_hr == [9, 15]
+
+def test_copy():
+	r = _results()
+	c = r.copy()
+	assert np.array_equal(c.data, r.data) and c.data is not r.data
+	c['Roof'] = 0.0
+	assert r.data[:, INDEX['Roof']].any()
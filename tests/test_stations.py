@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from lib import _stations
+from lib._stations import CSV_COLUMNS, MONTHS, WB_RANGE_RATIO, StationTable, _haversine, _month, load_stations, read_csv
+
+HEADER = ['Station', 'Lat', 'Long', 'Elev', 'Time zone', 'Hottest month', 'Cooling DB 0.4%', 'Hottest month DB range',
+		  'Cooling MCWB 0.4%'] + [f'{k} {m.capitalize()}' for k in ('taub', 'taud') for m in MONTHS]
+
+def _write(tmp_path, rows) -> str:
+	filename = tmp_path / 'stations.csv'
+	filename.write_text('\n'.join([','.join(HEADER)] + [','.join(map(str, r)) for r in rows]) + '\n', encoding='utf-8')
+	return str(filename)
+
+def _table(n: int, seed: int = 0) -> StationTable:
+	"""`n` stations spread over the globe, with clusters around the poles and the antimeridian"""
+	rng = np.random.default_rng(seed)
+	records = _stations.from_locations(list(_stations.locations.values()) * (n // len(_stations.locations) + 1))[:n]
+	records['Lat'] = np.concatenate([rng.uniform(-90, 90, n - n//2), rng.choice([-1, 1], n//2) * rng.uniform(80, 90, n//2)])
+	records['Long'] = np.concatenate([rng.uniform(-180, 180, n - n//2), rng.uniform(170, 190, n//2)])
+	return StationTable(records)
+
+def _row(name: str, month) -> list:
+	return [name, 18.78, 98.98, 312, 7, month, 38.0, 12.0, 24.5] + [0.5]*12 + [2.0]*12
+
+def test_month():
+	assert _month('Apr') == 'apr' and _month(' april ') == 'apr' and _month('4') == 'apr' and _month('12.0') == 'dec'
+	assert _month('') is None and _month('13') is None and _month('0') is None and _month('n/a') is None
+
+def test_read_csv_skips_stations_without_a_month(tmp_path):
+	filename = _write(tmp_path, [_row('A', 'Apr'), _row('B', ''), _row('C', 5)])
+	with pytest.warns(UserWarning, match='1 station'):
+		records = np.concatenate(list(read_csv(filename, CSV_COLUMNS, chunksize=1)))
+	assert records['Location'].tolist() == ['A', 'C']
+	assert records['ReferenceDates'].tolist() == ['apr', 'may']
+	assert records['taub'].tolist() == [0.5, 0.5]
+
+def test_load_stations_warns_on_another_version(tmp_path):
+	filename = str(tmp_path / 'stations.npy')
+	np.save(filename, np.zeros(2, dtype=[('Location', 'U40')]), allow_pickle=False)
+	with pytest.warns(UserWarning, match='another version'):
+		assert load_stations(filename) is None
+	np.save(filename, _stations.from_locations(list(_stations.locations.values())), allow_pickle=False)
+	assert len(load_stations(filename)) == len(_stations.locations)
+
+def test_nearest_matches_brute_force():
+	table = _table(2000)
+	rng = np.random.default_rng(1)
+	points = list(zip(rng.uniform(-90, 90, 100), rng.uniform(-180, 180, 100))) + [(90, 0), (-89.9, 179.9), (0, -180), (85, 175)]
+	for lat, long in points:
+		d = _haversine(lat, long, table.lat, table.long)
+		for k in (1, 5, 50):
+			rows, distances = table.nearest(lat, long, k)
+			assert len(rows) == k
+			np.testing.assert_allclose(distances, np.sort(d)[:k])
+			np.testing.assert_allclose(d[rows], distances)
+	assert len(table.nearest(0, 0, len(table) + 10)[0]) == len(table)
+
+def test_within_matches_brute_force():
+	table = _table(2000, seed=2)
+	rng = np.random.default_rng(3)
+	for lat, long in list(zip(rng.uniform(-90, 90, 50), rng.uniform(-180, 180, 50))) + [(89.5, 0), (10, 179.5)]:
+		d = _haversine(lat, long, table.lat, table.long)
+		for radius in (50, 500, 3000, 25000):
+			rows, distances = table.within(lat, long, radius)
+			assert sorted(rows.tolist()) == np.flatnonzero(d <= radius).tolist()
+			assert np.all(np.diff(distances) >= 0)
+
+def test_wb_range(tmp_path):
+	filename = _write(tmp_path, [_row('A', 'Apr')])
+	records = np.concatenate(list(read_csv(filename)))
+	assert np.isnan(records['T_wb_rng'][0])
+	columns = dict(CSV_COLUMNS, T_wb_rng='Cooling DB 0.4%')
+	records = np.concatenate([records] + list(read_csv(filename, columns)))
+	table = StationTable(records)
+	assert table.wb_range(0) == round(12.0 * WB_RANGE_RATIO, 1)
+	assert table.wb_range(1) == 38.0
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from lib import _sweep
+from lib._results import COLUMNS, INDEX
+from lib._kernel import SURFACES, cooling_loads
+from test_kernel import _factors, _synthetic
+
+@pytest.fixture
+def zone():
+	rng = np.random.default_rng(0)
+	return _synthetic(rng, _factors(rng, (len(SURFACES),)), _factors(rng, ()), _factors(rng, ()))
+
+def test_annual_loads_run_every_zone_on_the_kernel(zone, monkeypatch):
+	def reference(specs):
+		raise AssertionError('annual_loads must not calculate day by day')
+	monkeypatch.setattr(_sweep, '_reference', reference)
+	monkeypatch.setattr(_sweep, 'compile_zone', lambda spec: zone)
+	data = _sweep.annual_loads(object())
+	assert data.shape == (365*24, len(COLUMNS))
+	# day 105 is the zone's own design day
+	day = data[104*24:105*24]
+	np.testing.assert_allclose(day[:, :len(cooling_loads(zone))], cooling_loads(zone).T)
+	np.testing.assert_allclose(day[:, INDEX['TOTAL_CL']], day[:, [INDEX[c] for c in ('external', 'internal', 'ventilation')]].sum(axis=1))
+
+def test_monthly_loads_run_a_spec_on_the_kernel(zone, monkeypatch):
+	from lib._ZoneSpec import ZoneSpec
+	calls = []
+	monkeypatch.setattr(_sweep, '_reference', lambda specs: calls.append(specs) or np.zeros((len(specs), 24, len(COLUMNS))))
+	monkeypatch.setattr(_sweep, 'compile_zone', lambda spec: zone)
+	monkeypatch.setattr(_sweep, 'day_of_year', lambda month: 15 + 30*_sweep.MONTHS.index(month))
+	peak = _sweep.peak_month(ZoneSpec())
+	assert calls == [] and peak.Cooling_Load > 0 and set(peak.Monthly) == set(_sweep.MONTHS)
+	# the pyMEP month by month calculation only on request, and only of a spec
+	_sweep.peak_month(ZoneSpec(), reference=True)
+	assert [spec.climatic.Month for spec in calls[0]] == list(_sweep.MONTHS)
+	with pytest.raises(TypeError):
+		_sweep.monthly_loads(zone, reference=True)
+
+def test_orientation_sweep(zone, monkeypatch):
+	from lib._ZoneSpec import ZoneSpec
+	calls = []
+	monkeypatch.setattr(_sweep, '_reference', lambda specs: calls.append(specs) or np.ones((len(specs), 24, len(COLUMNS))))
+	monkeypatch.setattr(_sweep, 'compile_zone', lambda spec: zone)
+	sweep = _sweep.orientation_sweep(ZoneSpec(), [0, 90, 180])
+	assert calls == [] and sweep.Hourly.shape == (3, 24, len(COLUMNS))
+	# the internal gains do not turn with the zone
+	np.testing.assert_allclose(sweep.Hourly[0, :, INDEX['internal']], sweep.Hourly[2, :, INDEX['internal']])
+	sweep = _sweep.orientation_sweep(ZoneSpec(), [0, 90, 180], reference=True)
+	assert [spec.architec.Compass for spec in calls[0]] == [0, 90, 180] and sweep.Peak.tolist() == [1.0]*3
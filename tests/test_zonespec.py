@@ -0,0 +1,36 @@
+import contextlib
+import os
+import numpy as np
+import pytest
+from lib._ZoneSpec import ZoneSpec
+
+def test_wb_range_defaults_to_zero():
+	# files saved before WBRange existed keep the constant outdoor humidity ratio they were calculated with
+	data = ZoneSpec().to_dict()
+	del data['Climatic']['WBRange']
+	spec = ZoneSpec.from_dict(data)
+	assert spec.climatic.WBRange == 0.0 == ZoneSpec().climatic.WBRange
+	spec.validate()
+	spec.climatic.WBRange = None
+	with pytest.raises(ValueError, match='WBRange'):
+		spec.validate()
+
+def test_latent_load_at_the_site_pressure():
+	pytest.importorskip('pyMEP')
+	from lib._psychro import STANDARD_PRESSURE, humidity_ratio_from_rel_hum, outdoor_humidity_ratio, pressure
+	spec = ZoneSpec.default()
+	c = spec.climatic
+	c.Altitude, c.WBRange = 1500, 3.0
+	with contextlib.redirect_stdout(open(os.devnull, 'w')):
+		zone = spec.new_zone()
+		zone.Calculate()
+	weather = zone.weather_data
+	T_db = np.array([t.m for t in weather.T_db_prof])
+	usage = np.array(zone.Light_HeatGain.usage_profile)
+	def latent(P):
+		W_o = outdoor_humidity_ratio(T_db, c.OutsideDB, c.DBRange, c.OutsideWB, c.WBRange, P) * 1000
+		W_i = humidity_ratio_from_rel_hum(c.InsideDB, c.InsideRH/100, P) * 1000
+		return np.round(zone._cl * zone._ventilation * (W_o - W_i), 0).m * usage
+	np.testing.assert_allclose(zone.results['LHG'], latent(pressure(1500)))
+	# and not the sea level humidity ratios
+	assert not np.allclose(zone.results['LHG'], latent(STANDARD_PRESSURE))